@@ -0,0 +1,249 @@
+"""
+Benchmarks of building, rendering and saving models as they grow, for
+`asv <https://asv.readthedocs.io>`_. Run them with ``asv run`` and compare
+two commits with ``asv continuous main HEAD``. The results are kept in
+``benchmarks/results``, so that they can be committed and compared over
+time.
+
+"""
+
+import io
+import math
+from functools import partial
+
+import numpy as np
+
+import daft
+import daft.testing
+from daft.testing import grid_positions
+
+# The number of nodes in the models.
+SIZES = [10, 100, 1000, 10000, 100000]
+
+FORMATS = ["png", "pdf", "svg"]
+
+
+def chain(n):
+    """A chain of ``n`` nodes that snakes over a square grid."""
+    width, x, y = grid_positions(n)
+    x = np.where(y % 2, width - 1 - x, x)
+    names = [f"x{i}" for i in range(n)]
+    pgm = daft.PGM(pyplot=False)
+    pgm.add_nodes_from(names, names, x, y)
+    pgm.add_edges_from(zip(names[:-1], names[1:]))
+    return pgm
+
+
+def tree(n):
+    """A binary tree of ``n`` nodes, with edges from parents to children."""
+    _, x, y = grid_positions(n)
+    names = [f"x{i}" for i in range(n)]
+    pgm = daft.PGM(pyplot=False)
+    pgm.add_nodes_from(names, names, x, y)
+    pgm.add_edges_from((names[(i - 1) // 2], names[i]) for i in range(1, n))
+    return pgm
+
+
+def grid(n):
+    """A Markov random field on a square grid of about ``n`` nodes."""
+    width = math.ceil(math.sqrt(n))
+    n = width * width
+    _, x, y = grid_positions(n)
+    names = [f"x{i}" for i in range(n)]
+    pgm = daft.PGM(pyplot=False, directed=False)
+    pgm.add_nodes_from(names, names, x, y, observed=(x + y) % 2 == 0)
+    edges = [(names[i], names[i + 1]) for i in range(n) if x[i] < width - 1]
+    edges += [(names[i], names[i + width]) for i in range(n - width)]
+    pgm.add_edges_from(edges)
+    return pgm
+
+
+def plates(n):
+    """A model with a labelled plate around every pair of nodes."""
+    _, x, y = grid_positions(n)
+    names = [f"x{i}" for i in range(n)]
+    pgm = daft.PGM(pyplot=False)
+    pgm.add_nodes_from(names, names, x, y, scale=0.5)
+    for i in range(0, n - 1, 2):
+        pgm.add_plate(
+            [x[i] - 0.4, y[i] - 0.4, x[i + 1] - x[i] + 0.8, 0.8],
+            label=f"$N_{{{i}}}$",
+            shift=-0.1,
+        )
+    return pgm
+
+
+def labels(n):
+    """A chain with math text on every node and edge."""
+    width, x, y = grid_positions(n)
+    x = np.where(y % 2, width - 1 - x, x)
+    pgm = daft.PGM(pyplot=False)
+    pgm.add_nodes_from(
+        [f"x{i}" for i in range(n)],
+        [rf"$\theta_{{{i}}}$" for i in range(n)],
+        x,
+        y,
+    )
+    for i in range(1, n):
+        pgm.add_edge(f"x{i - 1}", f"x{i}", label=rf"$\beta_{{{i}}}$")
+    return pgm
+
+
+MODELS = {
+    "chain": chain,
+    "tree": tree,
+    "grid": grid,
+    "plates": plates,
+    "labels": labels,
+    "hmm": partial(daft.testing.hmm, pyplot=False),
+    "hierarchical": partial(daft.testing.hierarchical, pyplot=False),
+    "factor_graph": partial(daft.testing.factor_graph, pyplot=False),
+    "random_dag": partial(daft.testing.random_dag, pyplot=False),
+    "observed_and_fixed": partial(
+        daft.testing.observed_and_fixed, pyplot=False
+    ),
+}
+
+
+class Build:
+    """Add the nodes, edges and plates of a model."""
+
+    params = (list(MODELS), SIZES)
+    param_names = ["model", "size"]
+    timeout = 300
+
+    def time_build(self, model, size):
+        MODELS[model](size)
+
+    def time_add_node(self, model, size):
+        # One call per node, as in most scripts.
+        pgm = daft.PGM(pyplot=False)
+        for i in range(size):
+            pgm.add_node(f"x{i}", f"x{i}", i, 0)
+
+
+class AddEdge:
+    """Add the edges of a model one call at a time, as in most scripts."""
+
+    params = (list(MODELS), SIZES)
+    param_names = ["model", "size"]
+    timeout = 300
+    # Every sample adds the edges to a model without edges from setup.
+    number = 1
+    warmup_time = 0
+
+    def setup(self, model, size):
+        data = MODELS[model](size).to_dict()
+        names, edges = data["nodes"]["name"], data["edges"]
+        self.edges = [
+            (names[i], names[j], directed)
+            for i, j, directed in zip(
+                edges["node1"], edges["node2"], edges["directed"]
+            )
+        ]
+        data["edges"] = {column: [] for column in edges}
+        self.pgm = daft.PGM.from_dict(data, pyplot=False)
+
+    def time_add_edge(self, model, size):
+        for name1, name2, directed in self.edges:
+            self.pgm.add_edge(name1, name2, directed=directed)
+
+
+class Render:
+    """Render a model, with the shape and origin found automatically."""
+
+    params = (list(MODELS), SIZES)
+    param_names = ["model", "size"]
+    timeout = 600
+
+    def setup(self, model, size):
+        self.pgm = MODELS[model](size)
+        self.pgm.render()
+
+        # A node in the middle of the model, which moves back and forth
+        # inside the automatic bounds.
+        names = list(self.pgm._nodes)
+        self.node = self.pgm._nodes[names[len(names) // 2]]
+        self.offset = 0.01
+
+    def teardown(self, model, size):
+        self.pgm.__exit__(None, None, None)
+
+    def time_render(self, model, size):
+        self.pgm.render()
+
+    def time_render_incremental(self, model, size):
+        # Nothing changed since the last render, which is the fast path.
+        self.pgm.render(incremental=True)
+
+    def time_render_incremental_node(self, model, size):
+        # Moving one node redraws it and its edges.
+        self.node.x += self.offset
+        self.offset = -self.offset
+        self.pgm.render(incremental=True)
+
+    def peakmem_render(self, model, size):
+        self.pgm.render()
+
+
+class RenderPhases:
+    """
+    Track the time spent in each phase of a render, as measured by
+    :class:`daft.RenderStats`, to show which phase a regression is in.
+
+    """
+
+    params = (list(MODELS), SIZES)
+    param_names = ["model", "size"]
+    timeout = 1800
+    unit = "seconds"
+
+    def setup_cache(self):
+        timings = {}
+        for model in MODELS:
+            for size in SIZES:
+                with MODELS[model](size) as pgm:
+                    pgm.render(profile=True)
+                    timings[model, size] = pgm.last_render_stats.timings
+        return timings
+
+    def track_layout(self, timings, model, size):
+        return timings[model, size]["layout"]
+
+    def track_plates(self, timings, model, size):
+        return timings[model, size]["plates"]
+
+    def track_edges(self, timings, model, size):
+        return timings[model, size]["edges"]
+
+    def track_nodes(self, timings, model, size):
+        return timings[model, size]["nodes"]
+
+    def track_labels(self, timings, model, size):
+        return timings[model, size]["labels"]
+
+
+class Save:
+    """Save a rendered model in each of the formats."""
+
+    params = (list(MODELS), SIZES, FORMATS)
+    param_names = ["model", "size", "format"]
+    # Saving draws every label, which is far slower than rendering.
+    timeout = 3600
+
+    def setup(self, model, size, fmt):
+        self.pgm = MODELS[model](size)
+        self.pgm.render()
+
+    def teardown(self, model, size, fmt):
+        self.pgm.__exit__(None, None, None)
+
+    def time_savefig(self, model, size, fmt):
+        self.pgm.savefig(io.BytesIO(), format=fmt)
+
+    def time_savefig_many(self, model, size, fmt):
+        # The format and a thumbnail from a single render.
+        self.pgm.savefig_many(
+            {io.BytesIO(): {"format": fmt}, io.BytesIO(): {"dpi": 30}},
+            format="png",
+        )
@@ -1,14 +1,43 @@
 """Code for Daft"""
 
-from importlib.metadata import version as get_distribution
-
-from . import _core, _exceptions, _utils
+from . import (
+    _batch,
+    _cache,
+    _core,
+    _exceptions,
+    _labels,
+    _pool,
+    _serialize,
+    _stats,
+    _utils,
+)
+from ._batch import render_many
+from ._cache import RenderCache
 from ._core import PGM, Node, Edge, Plate, Text
-from ._exceptions import SameLocationError
+from ._exceptions import RenderError, SameLocationError
+from ._labels import LabelCache, label_cache
+from ._pool import FigurePool
+from ._stats import RenderStats
 from ._utils import _rendering_context, _pop_multiple
 
-__version__ = get_distribution("daft-pgm")
 __all__ = []
+__all__ += _batch.__all__
+__all__ += _cache.__all__
 __all__ += _core.__all__
 __all__ += _exceptions.__all__
+__all__ += _labels.__all__
+__all__ += _pool.__all__
+__all__ += _serialize.__all__
+__all__ += _stats.__all__
 __all__ += _utils.__all__
+
+
+def __getattr__(name):
+    # The version is looked up on first use, which is slow.
+    if name == "__version__":
+        from importlib.metadata import version
+
+        global __version__  # pylint: disable=global-statement
+        __version__ = version("daft-pgm")
+        return __version__
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
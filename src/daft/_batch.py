@@ -0,0 +1,132 @@
+"""Render many models at once."""
+
+__all__ = ["render_many"]
+
+import io
+import os
+
+from ._exceptions import RenderError
+
+
+def _init_worker():
+    """
+    Get a worker process ready to render: switch to the Agg backend and
+    render a small model once, which loads the fonts and the mathtext
+    parser before the first real model.
+
+    """
+    import matplotlib
+
+    matplotlib.use("agg")
+
+    from ._core import PGM
+
+    with PGM() as pgm:
+        pgm.add_node("x", r"$x$", 0, 0)
+        pgm.render()
+        pgm.figure.savefig(io.BytesIO(), format="png")
+
+
+def _render_one(task):
+    """
+    Render and save a single model.
+
+    :param task:
+        A ``(model, output, format, kwargs)`` tuple. See :func:`render_many`.
+
+    :returns:
+        ``None`` or a :class:`RenderError`.
+
+    """
+    model, output, fmt, kwargs = task
+    try:
+        pgm = model() if callable(model) else model
+        try:
+            pgm.render()
+            if fmt is not None:
+                kwargs = dict(kwargs, format=fmt)
+            if isinstance(output, list):
+                pgm.savefig_many(dict.fromkeys(output), **kwargs)
+            else:
+                pgm.savefig(output, **kwargs)
+        finally:
+            # Keep the memory of the worker bounded.
+            pgm._ctx.close()
+    except Exception as e:  # pylint: disable=broad-except
+        import traceback
+
+        if isinstance(output, list):
+            output = ", ".join(output)
+        error = RenderError(f"Could not render {output}: {e!r}")
+        error.traceback = "".join(
+            traceback.format_exception(type(e), e, e.__traceback__)
+        )
+        return error
+    return None
+
+
+def render_many(models, outputs, formats=None, workers=None, **kwargs):
+    """
+    Render many models and save them to files, spread over a pool of worker
+    processes. An error in one model does not stop the others.
+
+    :param models:
+        The :class:`PGM` objects to render, or functions without arguments
+        that build them, which is faster for large models. They are sent
+        to the workers, so they must be picklable: functions must be
+        defined at the top level of a module.
+
+    :param outputs:
+        The filenames to save the models to, one per model. A list of
+        filenames saves a model to each of them from a single render, see
+        :func:`PGM.savefig_many`.
+
+    :param formats: (optional)
+        The format to save all of the models in, or a list of formats with
+        one per model. By default the format follows from the filename.
+
+    :param workers: (optional)
+        The number of worker processes. Defaults to the number of CPUs.
+        With a single worker the models are rendered in this process.
+
+    :param **kwargs:
+        Passed on to :func:`PGM.savefig`.
+
+    :returns:
+        A list with one entry per model: ``None`` if the model was saved,
+        or the :class:`RenderError` that describes what went wrong.
+
+    """
+    models, outputs = list(models), list(outputs)
+    if len(models) != len(outputs):
+        raise ValueError(
+            f"Expected {len(models)} outputs but got {len(outputs)}."
+        )
+    if formats is None or isinstance(formats, str):
+        formats = [formats] * len(models)
+    elif len(formats) != len(models):
+        raise ValueError(
+            f"Expected {len(models)} formats but got {len(formats)}."
+        )
+
+    tasks = []
+    for model, output, fmt in zip(models, outputs, formats):
+        if isinstance(output, (list, tuple)):
+            output = [os.fspath(o) for o in output]
+        else:
+            output = os.fspath(output)
+        tasks.append((model, output, fmt, kwargs))
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        return [_render_one(task) for task in tasks]
+
+    # The process pool is slow to import, so it is only imported here.
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Send the models in chunks to cut down on the overhead per model.
+    chunksize = max(1, len(tasks) // (4 * workers))
+    with ProcessPoolExecutor(workers, initializer=_init_worker) as executor:
+        return list(executor.map(_render_one, tasks, chunksize=chunksize))
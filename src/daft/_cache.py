@@ -0,0 +1,221 @@
+"""An on-disk cache for the saved output of models."""
+
+__all__ = ["RenderCache"]
+
+import hashlib
+import os
+import tempfile
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+RenderCacheInfo = namedtuple(
+    "RenderCacheInfo", ["hits", "misses", "maxsize", "currsize", "count"]
+)
+
+# The suffix of the files in the cache directory.
+_SUFFIX = ".daft"
+
+
+def _encode(value):
+    """
+    Encode nested dictionaries, lists, tuples, arrays, strings and numbers
+    as a canonical string. Dictionaries are sorted by key and integers are
+    encoded like the equal floats, so values that draw the same way encode
+    the same way.
+    Raises a :class:`TypeError` for any other object, since its ``repr``
+    might not describe it fully.
+
+    """
+    if value is None:
+        return "null"
+    if isinstance(value, (bool, np.bool_)):
+        return "true" if value else "false"
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return repr(float(value))
+    if isinstance(value, str):
+        return repr(value)
+    if isinstance(value, np.ndarray):
+        data = value.tobytes().hex()
+        return f"array({value.dtype.str}, {value.shape}, {data})"
+    if isinstance(value, dict):
+        items = [f"{_encode(k)}: {_encode(v)}" for k, v in value.items()]
+        return "{" + ", ".join(sorted(items)) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ", ".join(_encode(v) for v in value) + "]"
+    raise TypeError(f"Cannot encode {type(value).__name__} objects")
+
+
+def _get_key(*values):
+    """Get the SHA-256 hex digest of the encoded ``values``."""
+    return hashlib.sha256(_encode(values).encode()).hexdigest()
+
+
+class RenderCache:
+    """
+    A bounded on-disk cache of the files saved by :meth:`PGM.savefig`, keyed
+    by :meth:`PGM.content_hash` and the arguments of the call. The least
+    recently used files are removed first. Several processes can share the
+    same directory.
+
+    :param directory:
+        The directory to keep the files in. It is created when the first
+        file is stored.
+
+    :param maxsize: (optional)
+        The largest total size of the files in bytes.
+
+    """
+
+    def __init__(self, directory, maxsize=256 * 2**20):
+        self._directory = os.fspath(directory)
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        # An estimate of the size of the directory. The directory is only
+        # scanned again when the estimate goes over ``maxsize``.
+        self._size = None
+
+    @property
+    def directory(self):
+        """The directory that the files are kept in."""
+        return self._directory
+
+    @property
+    def maxsize(self):
+        """The largest total size of the files in bytes."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def _get_path(self, key):
+        return os.path.join(self._directory, key + _SUFFIX)
+
+    def _get_entries(self):
+        """Get the ``(mtime, size, path)`` of each file in the cache."""
+        try:
+            scan = list(os.scandir(self._directory))
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        for entry in scan:
+            if not entry.name.endswith(_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def get(self, key):
+        """
+        Get the stored bytes of a key.
+
+        :param key:
+            The key of the file.
+
+        :returns:
+            The bytes, or ``None`` if the key is not cached.
+
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Mark the file as recently used.
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._misses += 1
+            return None
+
+        with self._lock:
+            self._hits += 1
+        return data
+
+    def put(self, key, data):
+        """
+        Store the bytes of a key, and remove the least recently used files
+        if the cache is over its size.
+
+        :param key:
+            The key of the file.
+
+        :param data:
+            The bytes to store.
+
+        """
+        os.makedirs(self._directory, exist_ok=True)
+
+        # Write to a temporary file first so that other processes never
+        # read a partial file.
+        fd, tmp = tempfile.mkstemp(suffix=".tmp", dir=self._directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._get_path(key))
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._evict()
+            else:
+                self._size += len(data)
+                if self._size > self._maxsize:
+                    self._evict()
+
+    def _evict(self):
+        entries = sorted(self._get_entries())
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in entries:
+            if size <= max(self._maxsize, 0):
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+        self._size = size
+
+    def cache_info(self):
+        """
+        Get the statistics of the cache.
+
+        :returns:
+            A named tuple with the ``hits`` and ``misses`` of this object, and
+            the ``maxsize``, the ``currsize`` in bytes and the ``count`` of
+            the files in the directory.
+
+        """
+        entries = self._get_entries()
+        with self._lock:
+            return RenderCacheInfo(
+                self._hits,
+                self._misses,
+                self._maxsize,
+                sum(entry[1] for entry in entries),
+                len(entries),
+            )
+
+    def cache_clear(self):
+        """Remove all of the files and reset the statistics."""
+        with self._lock:
+            for _, _, path in self._get_entries():
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+            self._size = 0
+            self._hits = 0
+            self._misses = 0
@@ -0,0 +1,226 @@
+"""The ``daft`` command."""
+
+__all__: list[str] = []
+
+import argparse
+import json
+import os
+import sys
+import time
+from functools import partial
+
+from ._batch import render_many
+from ._core import PGM
+
+# The suffixes of the specs that are found in directories. Specs saved with
+# :func:`PGM.dumps` are read from any other suffix.
+_SPEC_SUFFIXES = (".json", ".daft")
+
+
+def _load_spec(path):
+    """
+    Load a model from a file: the JSON of :func:`PGM.to_dict` if the file
+    ends in ``.json``, and the bytes of :func:`PGM.dumps` otherwise.
+
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if path.lower().endswith(".json"):
+        return PGM.from_dict(json.loads(data), pyplot=False)
+    return PGM.loads(data, pyplot=False)
+
+
+def _find_specs(paths):
+    """List the spec files in ``paths``, looking inside of directories."""
+    specs = []
+    for path in paths:
+        if os.path.isdir(path):
+            specs.extend(
+                sorted(
+                    entry.path
+                    for entry in os.scandir(path)
+                    if entry.is_file()
+                    and entry.name.lower().endswith(_SPEC_SUFFIXES)
+                )
+            )
+        else:
+            specs.append(path)
+    return specs
+
+
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _get_outputs(specs, directory, formats):
+    """
+    Get the output files of each spec.
+    Raises a :class:`ValueError` if two specs would be saved to the same
+    file.
+
+    """
+    outputs, owners = {}, {}
+    for spec in specs:
+        stem = os.path.splitext(os.path.basename(spec))[0]
+        outputs[spec] = []
+        for fmt in formats:
+            output = os.path.join(directory or os.path.dirname(spec), stem)
+            output += "." + fmt
+            if owners.setdefault(output, spec) != spec:
+                raise ValueError(
+                    f"{owners[output]} and {spec} would both be saved to "
+                    f"{output}."
+                )
+            outputs[spec].append(output)
+    return outputs
+
+
+def _render(args, attempts):
+    """
+    Render the specs whose outputs are missing or older than the spec, or
+    that changed since they were last rendered.
+
+    :param args:
+        The parsed arguments of ``daft render``.
+
+    :param attempts:
+        A dictionary from the specs to their modification times when they
+        were last rendered, which is updated. Specs that failed to render
+        are not tried again until they change.
+
+    :returns:
+        The number of specs that could not be rendered.
+
+    """
+    try:
+        specs = _find_specs(args.specs)
+        outputs = _get_outputs(specs, args.output, args.format)
+    except ValueError as e:
+        print(f"daft: {e}", file=sys.stderr)
+        return 1
+
+    errors = 0
+    stale = []
+    for spec in specs:
+        mtime = _get_mtime(spec)
+        if spec in attempts:
+            if mtime is not None and mtime != attempts[spec]:
+                stale.append(spec)
+        elif mtime is None:
+            print(f"daft: {spec} does not exist", file=sys.stderr)
+            errors += 1
+        elif args.force or any(
+            (_get_mtime(output) or -1) < mtime for output in outputs[spec]
+        ):
+            stale.append(spec)
+        attempts[spec] = mtime
+    if not stale:
+        return errors
+
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+    kwargs = {} if args.dpi is None else {"dpi": args.dpi}
+    results = render_many(
+        [partial(_load_spec, spec) for spec in stale],
+        [outputs[spec] for spec in stale],
+        workers=args.jobs,
+        **kwargs,
+    )
+    for spec, error in zip(stale, results):
+        if error is not None:
+            errors += 1
+            print(f"daft: {error}", file=sys.stderr)
+        elif not args.quiet:
+            print(", ".join(outputs[spec]))
+    return errors
+
+
+def _get_parser():
+    parser = argparse.ArgumentParser(
+        prog="daft", description="Render probabilistic graphical models."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    render = commands.add_parser(
+        "render",
+        help="render model specs to files",
+        description=(
+            "Render model specs, saved as JSON with PGM.to_dict or as bytes "
+            "with PGM.dumps, to files named after the specs. Specs whose "
+            "outputs are newer than the spec are skipped."
+        ),
+    )
+    render.add_argument(
+        "specs",
+        nargs="+",
+        help="spec files, or directories of .json and .daft specs",
+    )
+    render.add_argument(
+        "-o",
+        "--output",
+        help="the directory of the outputs (default: next to the specs)",
+    )
+    render.add_argument(
+        "-f",
+        "--format",
+        default="png",
+        type=lambda value: [fmt.strip() for fmt in value.split(",")],
+        help="comma-separated output formats (default: png)",
+    )
+    render.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="the number of worker processes (default: the number of CPUs)",
+    )
+    render.add_argument("--dpi", type=float, help="the DPI of the outputs")
+    render.add_argument(
+        "--force",
+        action="store_true",
+        help="render all of the specs, even if their outputs are newer",
+    )
+    render.add_argument(
+        "-w",
+        "--watch",
+        action="store_true",
+        help="keep running and render the specs again when they change",
+    )
+    render.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="the seconds between checks for changes with --watch",
+    )
+    render.add_argument(
+        "-q", "--quiet", action="store_true", help="only print errors"
+    )
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the ``daft`` command.
+
+    :param argv: (optional)
+        The arguments, without the name of the program. Defaults to
+        ``sys.argv[1:]``.
+
+    :returns:
+        The exit status: the number of specs that could not be rendered,
+        capped at 1.
+
+    """
+    args = _get_parser().parse_args(argv)
+    attempts = {}
+    errors = _render(args, attempts)
+    if not args.watch:
+        return min(errors, 1)
+
+    try:
+        while True:
+            time.sleep(args.interval)
+            _render(args, attempts)
+    except KeyboardInterrupt:
+        return 0
@@ -0,0 +1,274 @@
+"""
+Colors as matplotlib reads them, without importing matplotlib for the
+common forms, so that models can be drawn without it.
+
+"""
+
+__all__: list[str] = []
+
+import re
+from numbers import Real
+
+# pylint: disable=import-outside-toplevel
+
+# The named colors of matplotlib that daft knows itself; the others, e.g.
+# the ``xkcd:`` colors and the ``C0`` colors of the property cycle, are
+# looked up by matplotlib.
+_BASE_COLORS = {
+    "b": (0, 0, 1),
+    "g": (0, 0.5, 0),
+    "r": (1, 0, 0),
+    "c": (0, 0.75, 0.75),
+    "m": (0.75, 0, 0.75),
+    "y": (0.75, 0.75, 0),
+    "k": (0, 0, 0),
+    "w": (1, 1, 1),
+}
+_TABLEAU_COLORS = {
+    "tab:blue": "#1f77b4",
+    "tab:orange": "#ff7f0e",
+    "tab:green": "#2ca02c",
+    "tab:red": "#d62728",
+    "tab:purple": "#9467bd",
+    "tab:brown": "#8c564b",
+    "tab:pink": "#e377c2",
+    "tab:gray": "#7f7f7f",
+    "tab:olive": "#bcbd22",
+    "tab:cyan": "#17becf",
+    "tab:grey": "#7f7f7f",
+}
+_CSS4_COLORS = {
+    "aliceblue": "#F0F8FF",
+    "antiquewhite": "#FAEBD7",
+    "aqua": "#00FFFF",
+    "aquamarine": "#7FFFD4",
+    "azure": "#F0FFFF",
+    "beige": "#F5F5DC",
+    "bisque": "#FFE4C4",
+    "black": "#000000",
+    "blanchedalmond": "#FFEBCD",
+    "blue": "#0000FF",
+    "blueviolet": "#8A2BE2",
+    "brown": "#A52A2A",
+    "burlywood": "#DEB887",
+    "cadetblue": "#5F9EA0",
+    "chartreuse": "#7FFF00",
+    "chocolate": "#D2691E",
+    "coral": "#FF7F50",
+    "cornflowerblue": "#6495ED",
+    "cornsilk": "#FFF8DC",
+    "crimson": "#DC143C",
+    "cyan": "#00FFFF",
+    "darkblue": "#00008B",
+    "darkcyan": "#008B8B",
+    "darkgoldenrod": "#B8860B",
+    "darkgray": "#A9A9A9",
+    "darkgreen": "#006400",
+    "darkgrey": "#A9A9A9",
+    "darkkhaki": "#BDB76B",
+    "darkmagenta": "#8B008B",
+    "darkolivegreen": "#556B2F",
+    "darkorange": "#FF8C00",
+    "darkorchid": "#9932CC",
+    "darkred": "#8B0000",
+    "darksalmon": "#E9967A",
+    "darkseagreen": "#8FBC8F",
+    "darkslateblue": "#483D8B",
+    "darkslategray": "#2F4F4F",
+    "darkslategrey": "#2F4F4F",
+    "darkturquoise": "#00CED1",
+    "darkviolet": "#9400D3",
+    "deeppink": "#FF1493",
+    "deepskyblue": "#00BFFF",
+    "dimgray": "#696969",
+    "dimgrey": "#696969",
+    "dodgerblue": "#1E90FF",
+    "firebrick": "#B22222",
+    "floralwhite": "#FFFAF0",
+    "forestgreen": "#228B22",
+    "fuchsia": "#FF00FF",
+    "gainsboro": "#DCDCDC",
+    "ghostwhite": "#F8F8FF",
+    "gold": "#FFD700",
+    "goldenrod": "#DAA520",
+    "gray": "#808080",
+    "green": "#008000",
+    "greenyellow": "#ADFF2F",
+    "grey": "#808080",
+    "honeydew": "#F0FFF0",
+    "hotpink": "#FF69B4",
+    "indianred": "#CD5C5C",
+    "indigo": "#4B0082",
+    "ivory": "#FFFFF0",
+    "khaki": "#F0E68C",
+    "lavender": "#E6E6FA",
+    "lavenderblush": "#FFF0F5",
+    "lawngreen": "#7CFC00",
+    "lemonchiffon": "#FFFACD",
+    "lightblue": "#ADD8E6",
+    "lightcoral": "#F08080",
+    "lightcyan": "#E0FFFF",
+    "lightgoldenrodyellow": "#FAFAD2",
+    "lightgray": "#D3D3D3",
+    "lightgreen": "#90EE90",
+    "lightgrey": "#D3D3D3",
+    "lightpink": "#FFB6C1",
+    "lightsalmon": "#FFA07A",
+    "lightseagreen": "#20B2AA",
+    "lightskyblue": "#87CEFA",
+    "lightslategray": "#778899",
+    "lightslategrey": "#778899",
+    "lightsteelblue": "#B0C4DE",
+    "lightyellow": "#FFFFE0",
+    "lime": "#00FF00",
+    "limegreen": "#32CD32",
+    "linen": "#FAF0E6",
+    "magenta": "#FF00FF",
+    "maroon": "#800000",
+    "mediumaquamarine": "#66CDAA",
+    "mediumblue": "#0000CD",
+    "mediumorchid": "#BA55D3",
+    "mediumpurple": "#9370DB",
+    "mediumseagreen": "#3CB371",
+    "mediumslateblue": "#7B68EE",
+    "mediumspringgreen": "#00FA9A",
+    "mediumturquoise": "#48D1CC",
+    "mediumvioletred": "#C71585",
+    "midnightblue": "#191970",
+    "mintcream": "#F5FFFA",
+    "mistyrose": "#FFE4E1",
+    "moccasin": "#FFE4B5",
+    "navajowhite": "#FFDEAD",
+    "navy": "#000080",
+    "oldlace": "#FDF5E6",
+    "olive": "#808000",
+    "olivedrab": "#6B8E23",
+    "orange": "#FFA500",
+    "orangered": "#FF4500",
+    "orchid": "#DA70D6",
+    "palegoldenrod": "#EEE8AA",
+    "palegreen": "#98FB98",
+    "paleturquoise": "#AFEEEE",
+    "palevioletred": "#DB7093",
+    "papayawhip": "#FFEFD5",
+    "peachpuff": "#FFDAB9",
+    "peru": "#CD853F",
+    "pink": "#FFC0CB",
+    "plum": "#DDA0DD",
+    "powderblue": "#B0E0E6",
+    "purple": "#800080",
+    "rebeccapurple": "#663399",
+    "red": "#FF0000",
+    "rosybrown": "#BC8F8F",
+    "royalblue": "#4169E1",
+    "saddlebrown": "#8B4513",
+    "salmon": "#FA8072",
+    "sandybrown": "#F4A460",
+    "seagreen": "#2E8B57",
+    "seashell": "#FFF5EE",
+    "sienna": "#A0522D",
+    "silver": "#C0C0C0",
+    "skyblue": "#87CEEB",
+    "slateblue": "#6A5ACD",
+    "slategray": "#708090",
+    "slategrey": "#708090",
+    "snow": "#FFFAFA",
+    "springgreen": "#00FF7F",
+    "steelblue": "#4682B4",
+    "tan": "#D2B48C",
+    "teal": "#008080",
+    "thistle": "#D8BFD8",
+    "tomato": "#FF6347",
+    "turquoise": "#40E0D0",
+    "violet": "#EE82EE",
+    "wheat": "#F5DEB3",
+    "white": "#FFFFFF",
+    "whitesmoke": "#F5F5F5",
+    "yellow": "#FFFF00",
+    "yellowgreen": "#9ACD32",
+}
+_NAMED_COLORS = {**_CSS4_COLORS, **_TABLEAU_COLORS, **_BASE_COLORS}
+
+_HEX = re.compile("#(?:[0-9a-fA-F]{3,4}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
+
+
+def _to_rgba(color, alpha=None):
+    """
+    Convert a color to an RGBA tuple of floats like
+    :func:`matplotlib.colors.to_rgba`, which sets the alpha of the color to
+    ``alpha`` unless it is ``None`` or the color is ``"none"``. Colors that
+    are not names, hex strings, gray levels or RGB(A) tuples are handed to
+    matplotlib.
+
+    """
+    rgba = None
+    if isinstance(color, str):
+        if color.lower() == "none":
+            return (0.0, 0.0, 0.0, 0.0)
+        named = _NAMED_COLORS.get(color)
+        if named is None and len(color) != 1:
+            named = _NAMED_COLORS.get(color.lower())
+        if named is not None:
+            color = named
+    if isinstance(color, str):
+        if _HEX.fullmatch(color):
+            digits = color[1:]
+            if len(digits) <= 4:
+                digits = "".join(2 * digit for digit in digits)
+            rgba = tuple(
+                int(digits[i : i + 2], 16) / 255
+                for i in range(0, len(digits), 2)
+            )
+        else:
+            try:
+                gray = float(color)
+            except ValueError:
+                pass
+            else:
+                if 0 <= gray <= 1:
+                    rgba = (gray, gray, gray)
+    elif (
+        isinstance(color, (tuple, list))
+        and len(color) in (3, 4)
+        and all(isinstance(c, Real) for c in color)
+        and all(0 <= c <= 1 for c in color)
+    ):
+        rgba = tuple(map(float, color))
+
+    if rgba is None:
+        import matplotlib as mpl
+
+        return mpl.colors.to_rgba(color, alpha)
+    if alpha is not None:
+        return rgba[:3] + (alpha,)
+    return rgba if len(rgba) == 4 else rgba + (1.0,)
+
+
+def _to_hex(color):
+    """Get the ``#rrggbb`` hex string of a color, without its alpha."""
+    return "#" + "".join(
+        format(round(value * 255), "02x") for value in _to_rgba(color)[:3]
+    )
+
+
+def _get_patch_style(params):
+    """
+    Get the colors and line of a patch with the given resolved parameters,
+    as :class:`matplotlib.patches.Patch` would draw it.
+
+    :param params:
+        The parameters of the patch, with its ``ec``, ``fc`` and ``lw``.
+
+    :returns:
+        The RGBA ``facecolor`` and ``edgecolor``, the ``linewidth`` and the
+        ``linestyle``.
+
+    """
+    alpha = params.get("alpha")
+    fill = params.get("fill", True)
+    return (
+        _to_rgba(params["fc"], alpha if fill else 0),
+        _to_rgba(params["ec"], alpha),
+        float(params["lw"]),
+        params.get("ls", params.get("linestyle", "solid")),
+    )
@@ -3,18 +3,661 @@
 __all__ = ["PGM", "Node", "Edge", "Plate"]
 # TODO: should Text be added?
 
-import matplotlib as mpl
-import matplotlib.pyplot as plt
-from matplotlib.patches import Ellipse
-from matplotlib.patches import FancyArrow
-from matplotlib.patches import Rectangle
+import io
+import os
+import warnings
+from collections.abc import (
+    Iterable,
+    Mapping,
+    MutableMapping,
+    MutableSequence,
+    Sequence,
+)
+from contextlib import nullcontext
+from functools import cache
 
 import numpy as np
 
+from ._cache import RenderCache, _get_key
 from ._exceptions import SameLocationError
-from ._utils import _rendering_context, _pop_multiple
+from ._labels import label_cache
+from ._serialize import SCHEMA_VERSION, check_version, decode, encode
+from ._stats import RenderStats
+from ._utils import (
+    _draw_lock,
+    _paused_gc,
+    _rendering_context,
+    _pop_multiple,
+)
 
 # pylint: disable=too-many-arguments, protected-access, unused-argument, too-many-lines
+# pylint: disable=import-outside-toplevel
+
+# Matplotlib is imported by the functions that draw, so that models can be
+# built without it.
+
+# The node shapes in the order of their codes.
+_NODE_SHAPES = ("ellipse", "rectangle")
+
+# The patch properties that a PatchCollection can vary from patch to patch.
+_BATCHED_NODE_PARAMS = frozenset(
+    (
+        "alpha",
+        "antialiased",
+        "aa",
+        "color",
+        "ec",
+        "edgecolor",
+        "facecolor",
+        "fc",
+        "fill",
+        "linestyle",
+        "ls",
+        "linewidth",
+        "lw",
+    )
+)
+
+
+# The edge properties that the edge collections can vary from edge to edge.
+_BATCHED_LINE_PARAMS = frozenset(("alpha", "color", "linestyle", "linewidth"))
+_BATCHED_ARROW_PARAMS = frozenset(
+    (
+        "alpha",
+        "ec",
+        "fc",
+        "head_length",
+        "head_width",
+        "linestyle",
+        "linewidth",
+    )
+)
+
+# Line2D draws solid and dashed lines with different cap and join styles.
+_DASHED_LINESTYLES = ("--", "-.", ":", "dashed", "dashdot", "dotted")
+_SOLID_LINESTYLES = ("-", "solid")
+
+# The plates are drawn in the default patch layer, with the arrows and then
+# the nodes just above it and the lines and labels in their default layers.
+# This keeps the artists that an incremental render adds in their layer.
+_ARROW_ZORDER = 1.001
+_NODE_ZORDER = 1.002
+
+# The attributes that decide how edges and plates are drawn.
+_EDGE_ATTRIBUTES = (
+    "node1",
+    "node2",
+    "directed",
+    "label",
+    "xoffset",
+    "yoffset",
+    "plot_params",
+    "label_params",
+)
+_PLATE_ATTRIBUTES = (
+    "rect",
+    "label",
+    "label_offset",
+    "shift",
+    "position",
+    "fontsize",
+    "rect_params",
+    "bbox",
+)
+
+# The formats that matplotlib saves with Agg.
+_AGG_FORMATS = ("png", "jpg", "jpeg", "tif", "tiff", "webp", "raw", "rgba")
+
+# The prefixes of the ``rcParams`` that affect a saved model.
+_HASHED_RCPARAMS = (
+    "agg.",
+    "axes.",
+    "figure.",
+    "font.",
+    "hatch.",
+    "lines.",
+    "mathtext.",
+    "patch.",
+    "path.",
+    "pdf.",
+    "pgf.",
+    "ps.",
+    "savefig.",
+    "svg.",
+    "text.",
+)
+
+
+def _get_hashed_rc_params(rc_params):
+    """Get the ``rcParams`` that affect a saved model, as strings."""
+    # Only the keys are iterated over, since reading the backend would
+    # import pyplot.
+    return {
+        key: repr(rc_params[key])
+        for key in rc_params
+        if key.startswith(_HASHED_RCPARAMS)
+    }
+
+
+def _warn_shapes(shapes):
+    """
+    Warn that nodes with the given shapes, which are not one of
+    ``_NODE_SHAPES``, are drawn as ellipses.
+
+    """
+    shapes = sorted({repr(shape) for shape in shapes})
+    warnings.warn(
+        f"Unknown node shape{'s' if len(shapes) > 1 else ''} "
+        f"{', '.join(shapes)}; drawing ellipses instead.",
+        UserWarning,
+        # Point at the caller of PGM.add_node, PGM.add_nodes_from or Node,
+        # which reach this through the node table.
+        stacklevel=4,
+    )
+
+
+def _add_patch_collection(ax, patches, zorder=_NODE_ZORDER):
+    """
+    Add a list of patches to the axes as a single collection that keeps the
+    colors, line widths and line styles of the individual patches.
+
+    :param ax:
+        The :class:`matplotlib.axes.Axes` to draw in.
+
+    :param patches:
+        The list of patches. Nothing is added if it is empty.
+
+    :param zorder: (optional)
+        The layer to draw the patches in.
+
+    """
+    if not patches:
+        return None
+
+    from matplotlib.collections import PatchCollection
+
+    # Matplotlib draws a collection with a single path as a marker, which
+    # snaps it to whole pixels, so a lone patch is added on its own.
+    if len(patches) == 1:
+        patches[0].set_zorder(zorder)
+        return ax.add_artist(patches[0])
+
+    # Patches join and cap their outlines differently from the collection
+    # defaults.
+    collection = PatchCollection(
+        patches,
+        match_original=True,
+        joinstyle="miter",
+        capstyle="butt",
+        zorder=zorder,
+    )
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+
+def _get_line_cap_and_join(ctx, plot_params):
+    """
+    Get the cap and join styles that :class:`matplotlib.lines.Line2D` would
+    use for an undirected edge, or ``None`` if the edge cannot be drawn as
+    part of a :class:`matplotlib.collections.LineCollection`.
+
+    :param ctx:
+        The :class:`_rendering_context` object.
+
+    :param plot_params:
+        The resolved plotting parameters of the edge.
+
+    """
+    if not _BATCHED_LINE_PARAMS.issuperset(plot_params):
+        return None
+
+    rc_params = ctx.rc_params
+    linestyle = plot_params["linestyle"]
+    if linestyle in _SOLID_LINESTYLES:
+        return (
+            rc_params["lines.solid_capstyle"],
+            rc_params["lines.solid_joinstyle"],
+        )
+    if linestyle in _DASHED_LINESTYLES:
+        return (
+            rc_params["lines.dash_capstyle"],
+            rc_params["lines.dash_joinstyle"],
+        )
+    return None
+
+
+def _add_line_collection(ax, lines, style):
+    """
+    Add undirected edges to the axes as a single line collection.
+
+    :param ax:
+        The :class:`matplotlib.axes.Axes` to draw in.
+
+    :param lines:
+        A list of ``(coords, plot_params)`` pairs. Nothing is added if it is
+        empty, and a single line is plotted on its own as for patches.
+
+    :param style:
+        The ``(capstyle, joinstyle)`` shared by the lines.
+
+    """
+    if not lines:
+        return None
+
+    if len(lines) == 1:
+        (x, y, dx, dy), plot_params = lines[0]
+        return ax.plot([x, x + dx], [y, y + dy], **plot_params)
+
+    import matplotlib as mpl
+    from matplotlib.collections import LineCollection
+
+    coords = np.array([c for c, _ in lines], dtype=np.float64)
+    segments = np.stack([coords[:, :2], coords[:, :2] + coords[:, 2:]], axis=1)
+    collection = LineCollection(
+        segments,
+        colors=[
+            mpl.colors.to_rgba(p["color"], p.get("alpha")) for _, p in lines
+        ],
+        linewidths=[p["linewidth"] for _, p in lines],
+        linestyles=[p["linestyle"] for _, p in lines],
+        capstyle=style[0],
+        joinstyle=style[1],
+        # The same layer as the lines drawn by ``ax.plot``.
+        zorder=2,
+    )
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+
+def _get_arrow_verts(coords, head_width, head_length):
+    """
+    Get the vertices of the polygons drawn by zero width
+    :class:`matplotlib.patches.FancyArrow` patches with
+    ``length_includes_head=True``, for many arrows at once.
+
+    :param coords:
+        An ``(N, 4)`` array of ``x``, ``y``, ``dx`` and ``dy`` for each arrow.
+
+    :param head_width:
+        The width of the arrow heads; a scalar or an array of length ``N``.
+
+    :param head_length:
+        The length of the arrow heads; a scalar or an array of length ``N``.
+
+    :returns:
+        An ``(N, 7, 2)`` array of vertices. Like the polygon of a
+        ``FancyArrow`` the outline is closed back to the tip.
+
+    """
+    x, y, dx, dy = np.asarray(coords, dtype=np.float64).T
+    head_width = np.broadcast_to(head_width, x.shape)
+    head_length = np.broadcast_to(head_length, x.shape)
+    length = np.hypot(dx, dy)
+
+    # Start with horizontal arrows pointing at (0, 0): the tip, one half of
+    # the head, the stem and the other half of the head.
+    verts = np.zeros((len(x), 7, 2), dtype=np.float64)
+    verts[:, [1, 2, 5, 6], 0] = -head_length[:, None]
+    verts[:, [3, 4], 0] = -length[:, None]
+    verts[:, 1, 1] = -0.5 * head_width
+    verts[:, 6, 1] = 0.5 * head_width
+
+    # Then rotate them and move the tips to the end of the edges.
+    cx, sx = (dx / length)[:, None], (dy / length)[:, None]
+    return np.stack(
+        [
+            verts[..., 0] * cx - verts[..., 1] * sx + (x + dx)[:, None],
+            verts[..., 0] * sx + verts[..., 1] * cx + (y + dy)[:, None],
+        ],
+        axis=-1,
+    )
+
+
+def _add_arrow_collection(ax, arrows):
+    """
+    Add directed edges to the axes as a single polygon collection.
+
+    :param ax:
+        The :class:`matplotlib.axes.Axes` to draw in.
+
+    :param arrows:
+        A list of ``(coords, plot_params)`` pairs. Nothing is added if it is
+        empty, and a single arrow is added on its own as for patches.
+
+    """
+    if not arrows:
+        return None
+
+    import matplotlib as mpl
+    from matplotlib.collections import PolyCollection
+    from matplotlib.patches import FancyArrow
+
+    if len(arrows) == 1:
+        coords, plot_params = arrows[0]
+        return ax.add_artist(
+            FancyArrow(
+                *coords,
+                width=0,
+                length_includes_head=True,
+                zorder=_ARROW_ZORDER,
+                **plot_params,
+            )
+        )
+
+    verts = _get_arrow_verts(
+        [c for c, _ in arrows],
+        [p["head_width"] for _, p in arrows],
+        [p["head_length"] for _, p in arrows],
+    )
+    collection = PolyCollection(
+        verts,
+        closed=True,
+        facecolors=[
+            mpl.colors.to_rgba(p["fc"], p.get("alpha")) for _, p in arrows
+        ],
+        edgecolors=[
+            mpl.colors.to_rgba(p["ec"], p.get("alpha")) for _, p in arrows
+        ],
+        linewidths=[p["linewidth"] for _, p in arrows],
+        linestyles=[p["linestyle"] for _, p in arrows],
+        # Patches join and cap their outlines differently from the
+        # collection defaults.
+        joinstyle="miter",
+        capstyle="butt",
+        zorder=_ARROW_ZORDER,
+    )
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+
+def _get_tight_bbox(figure, dpi, pad_inches=None):
+    """
+    Measure the bounding box that ``savefig(bbox_inches="tight")`` would
+    crop a figure to with Agg, without drawing the figure first.
+
+    :param figure:
+        The :class:`matplotlib.figure.Figure` to measure.
+
+    :param dpi:
+        The DPI that the figure will be saved at.
+
+    :param pad_inches: (optional)
+        The padding around the box. Defaults to the ``savefig.pad_inches``
+        of matplotlib.
+
+    :returns:
+        The :class:`matplotlib.transforms.Bbox` in inches.
+
+    """
+    import matplotlib as mpl
+
+    from matplotlib.backends.backend_agg import RendererAgg
+
+    if pad_inches in (None, "layout"):
+        pad_inches = mpl.rcParams["savefig.pad_inches"]
+
+    # Only the DPI of the renderer matters for the text extents, which the
+    # labels take from the label cache.
+    renderer = RendererAgg(1, 1, dpi)
+
+    original_dpi = figure.dpi
+    figure.dpi = dpi
+    try:
+        with _draw_lock:
+            bbox = figure.get_tightbbox(renderer)
+    finally:
+        figure.dpi = original_dpi
+    return bbox.padded(pad_inches)
+
+
+def _get_savefig_dpi(figure, dpi):
+    """Resolve the ``dpi`` argument of ``savefig`` to a number."""
+    import matplotlib as mpl
+
+    if dpi is None:
+        dpi = mpl.rcParams["savefig.dpi"]
+    return figure.dpi if dpi == "figure" else dpi
+
+
+def _timed(stats, phase):
+    """
+    Time a ``with`` block into a phase of the :class:`RenderStats` of a
+    profiled render, or do nothing if ``stats`` is ``None``.
+
+    """
+    if stats is None:
+        return nullcontext()
+    return stats.time(phase)
+
+
+def _counted(stats):
+    """
+    Count the hits and misses of the label cache in a ``with`` block into
+    the :class:`RenderStats` of a profiled render, or do nothing if
+    ``stats`` is ``None``.
+
+    """
+    if stats is None:
+        return nullcontext()
+    return stats.count_cache("label_cache", label_cache)
+
+
+def _annotate(ctx, label):
+    """
+    Add an annotation to the axes of the rendering context like
+    :meth:`matplotlib.axes.Axes.annotate`, timing it if the render is
+    profiled. The annotation lays out its text with the extents from the
+    label cache whenever it is drawn or measured.
+
+    :param ctx:
+        The :class:`_rendering_context` object.
+
+    :param label:
+        The arguments of :meth:`matplotlib.axes.Axes.annotate`.
+
+    """
+    from matplotlib.transforms import IdentityTransform
+
+    from ._text import Annotation
+
+    with _timed(ctx._stats, "labels"):
+        ax = ctx.ax()
+        annotation = Annotation(**label)
+        annotation.set_transform(IdentityTransform())
+        if label.get("clip_on", False) and annotation.get_clip_path() is None:
+            annotation.set_clip_path(ax.patch)
+        ax._add_text(annotation)
+        return annotation
+
+
+def _remove_artist(artist, index=None):
+    """
+    Remove an element drawn by :func:`PGM.render` from the axes.
+
+    :param artist:
+        The artist that draws the element.
+
+    :param index: (optional)
+        The index of the element if ``artist`` is a collection that draws
+        other elements too. Its path is then replaced by an empty one,
+        which keeps the properties of the other elements in line.
+
+    """
+    if index is None:
+        artist.remove()
+        return
+
+    from matplotlib.path import Path
+
+    # An empty path takes the place of the removed element.
+    artist.get_paths()[index] = Path(np.empty((0, 2)))
+    artist.stale = True
+
+
+def _get_signature(obj, attributes):
+    """
+    Get a hashable key of the given attributes of an edge or a plate, or
+    a new object that is not equal to any other key if an attribute is not
+    hashable.
+
+    """
+    try:
+        return _freeze(tuple(getattr(obj, name, None) for name in attributes))
+    except TypeError:
+        return object()
+
+
+def _get_frontier_coords(centers, targets, scales, aspects, shapes, unit):
+    """
+    Get the points where the lines from the centers of many nodes to the
+    given targets cross the outlines of the nodes. This is the vectorized
+    form of :func:`Node.get_frontier_coord`.
+
+    :param centers:
+        An ``(N, 2)`` array with the centers of the nodes in plot
+        coordinates.
+
+    :param targets:
+        An ``(N, 2)`` array with the target points in plot coordinates.
+
+    :param scales:
+        The scales of the nodes; a scalar or an array of length ``N``.
+
+    :param aspects:
+        The resolved aspect ratios of the nodes; a scalar or an array of
+        length ``N``.
+
+    :param shapes:
+        The index of the shape of each node in ``_NODE_SHAPES``; a scalar or
+        an array of length ``N``.
+
+    :param unit:
+        The ``node_unit`` of the rendering context.
+
+    :returns:
+        * ``points``: an ``(N, 2)`` array of intersection points.
+        * ``same``: an ``(N,)`` boolean array that flags the targets that
+          coincide with the centers. Their points are undefined.
+
+    """
+    centers = np.asarray(centers, dtype=np.float64)
+    delta = np.asarray(targets, dtype=np.float64) - centers
+    dx, dy = delta[:, 0], delta[:, 1]
+    scales = np.broadcast_to(np.asarray(scales, dtype=np.float64), dx.shape)
+    aspects = np.broadcast_to(np.asarray(aspects, dtype=np.float64), dx.shape)
+    same = (dx == 0.0) & (dy == 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Ellipses: scale the displacement by the fractional effect of the
+        # radius of the node.
+        dist = np.sqrt(dy * dy + dx * dx / (aspects * aspects))
+        alpha = 0.5 * unit * scales / dist
+        ellipse = centers + alpha[:, None] * delta
+
+        # Rectangles: take the closer of the intersections with the left or
+        # right side and with the top or bottom side.
+        sign_x = np.where(dx == 0.0, 1.0, np.sign(dx))
+        sign_y = np.where(dy == 0.0, 1.0, np.sign(dy))
+        side = np.stack(
+            [
+                scales * aspects / 2.0 * sign_x,
+                scales * aspects / 2.0 * np.abs(dy / dx) * sign_y,
+            ],
+            axis=-1,
+        )
+        top = np.stack(
+            [
+                scales * 0.5 * np.abs(dx / dy) * sign_x,
+                scales * 0.5 * sign_y,
+            ],
+            axis=-1,
+        )
+        closer = np.hypot(*side.T) < np.hypot(*top.T)
+        rectangle = centers + np.where(closer[:, None], side, top)
+
+    is_rectangle = np.broadcast_to(shapes, dx.shape) == 1
+    points = np.where(is_rectangle[:, None], rectangle, ellipse)
+    return points, same
+
+
+def _get_edge_coords(ctx, edges):
+    """
+    Get the coordinates of the lines of many edges at once. This is the
+    vectorized form of :func:`Edge._get_coords`.
+
+    :param ctx:
+        The :class:`_rendering_context` object.
+
+    :param edges:
+        A sequence of :class:`Edge` objects.
+
+    :returns:
+        An ``(N, 4)`` array with the start ``x0``, ``y0`` and displacement
+        ``dx0``, ``dy0`` of each line. Raises a :class:`SameLocationError`
+        that lists every edge between nodes at the same location.
+
+    """
+    nodes = [edge.node1 for edge in edges] + [edge.node2 for edge in edges]
+    if any(node.shape not in _NODE_SHAPES for node in nodes):
+        # Should never append
+        raise ValueError("Wrong shape in object causes an error")
+
+    xy = np.array([(node.x, node.y) for node in nodes], dtype=np.float64)
+    xy = ctx.grid_unit * (xy.reshape(-1, 2) - ctx.origin)
+    points, same = _get_frontier_coords(
+        xy,
+        np.roll(xy, len(edges), axis=0),
+        [node.scale for node in nodes],
+        [ctx.aspect if node.aspect is None else node.aspect for node in nodes],
+        [_NODE_SHAPES.index(node.shape) for node in nodes],
+        ctx.node_unit,
+    )
+
+    if ctx._stats is not None:
+        ctx._stats.counters["frontier_coords"] += len(nodes)
+
+    same = same[: len(edges)] | same[len(edges) :]
+    if np.any(same):
+        raise SameLocationError(*(e for e, s in zip(edges, same) if s))
+
+    start, end = points[: len(edges)], points[len(edges) :]
+    return np.concatenate([start, end - start], axis=1)
+
+
+class _EdgeView(Sequence):
+    """
+    A read-only view of the ordered set of the edges of a :class:`PGM`.
+    Indexing copies the edges, so iterate over the view instead where
+    possible.
+
+    """
+
+    __slots__ = ("_edges",)
+
+    def __init__(self, edges):
+        self._edges = edges
+
+    def __len__(self):
+        return len(self._edges)
+
+    def __iter__(self):
+        return iter(self._edges)
+
+    def __contains__(self, edge):
+        return edge in self._edges
+
+    def __getitem__(self, index):
+        return list(self._edges)[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (_EdgeView, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"_EdgeView({list(self)!r})"
 
 
 class PGM:
@@ -69,6 +712,22 @@ class PGM:
     :param dpi: (optional)
         Set DPI for display and saving files.
 
+    :param pyplot: (optional)
+        Create the figure with :func:`matplotlib.pyplot.figure`. If
+        ``False``, the figure is a plain :class:`matplotlib.figure.Figure`
+        with an Agg canvas that pyplot does not track, so it is freed along
+        with the model, cannot be shown, and models can be rendered from
+        several threads at once, though their figures are drawn one at a
+        time, since matplotlib shares its fonts between threads. The
+        ``rcParams`` that daft reads are then taken from a snapshot made
+        when the model is created, while matplotlib still draws with the
+        global ``rcParams``.
+
+    :param pool: (optional)
+        A :class:`FigurePool` to take the figure from, and to give it back to
+        when the figure is closed, e.g. when the model is rendered again or
+        at the end of a ``with`` block. Needs ``pyplot=False``.
+
     """
 
     def __init__(
@@ -87,12 +746,32 @@ class PGM:
         aspect=1.0,
         label_params=None,
         dpi=None,
+        pyplot=True,
+        pool=None,
     ):
-        self._nodes = {}
-        self._edges = []
+        self._nodes = _NodeTable()
+        # The edges are kept in a dictionary as an ordered set, and indexed
+        # by the rows of the nodes that they start and end at. New edges are
+        # only indexed when the index is next used, which keeps add_edge
+        # cheap.
+        self._edge_set = {}
+        self._out_edges = {}
+        self._in_edges = {}
+        self._unindexed = []
         self._plates = []
         self._dpi = dpi
 
+        # The artists of each node row, edge and plate, and the state of the
+        # model at the last render, for incremental renders.
+        self._artists = {}
+        self._layout = None
+        self._edge_signatures = {}
+        self._plate_signatures = []
+
+        # The stats of the last render, if it was profiled.
+        self.last_render_stats = None
+        self._profile_callback = None
+
         # if shape and origin are not given, pass a default
         # and we will determine at rendering time
         self.shape = shape
@@ -117,11 +796,24 @@ class PGM:
             aspect=aspect,
             label_params=label_params,
             dpi=dpi,
+            pyplot=pyplot,
+            pool=pool,
         )
 
     def __enter__(self):
         return self
 
+    def __getstate__(self):
+        # The artists of the last render stay with its figure.
+        state = self.__dict__.copy()
+        state["_artists"] = {}
+        state["_layout"] = None
+        state["_edge_signatures"] = {}
+        state["_plate_signatures"] = []
+        state["last_render_stats"] = None
+        state["_profile_callback"] = None
+        return state
+
     def __exit__(self, *args):
         self._ctx.close()
 
@@ -199,9 +891,9 @@ class PGM:
 
         """
         if isinstance(node, Node):
-            _node = node
+            self._nodes.add_node(node)
         else:
-            _node = Node(
+            self._nodes.add(
                 node,
                 content,
                 x,
@@ -218,10 +910,100 @@ class PGM:
                 shape,
             )
 
-        self._nodes[_node.name] = _node
-
         return node
 
+    def add_nodes_from(
+        self,
+        names,
+        content="",
+        x=0.0,
+        y=0.0,
+        scale=1.0,
+        aspect=None,
+        observed=False,
+        fixed=False,
+        alternate=False,
+        offset=(0.0, 0.0),
+        fontsize=None,
+        plot_params=None,
+        label_params=None,
+        shape="ellipse",
+    ):
+        """
+        Add many nodes to the model at once. The per-node parameters can be
+        scalars, which are shared by all of the nodes, or arrays with one
+        value per node. They are validated in a single pass and the nodes
+        are added without building a :class:`Node` for each of them.
+
+        :param names:
+            An iterable of plain-text identifiers for the nodes.
+
+        :param content: (optional)
+            The display form of the variables; a string, a number or a
+            sequence of these.
+
+        :param x: (optional)
+            The x-coordinates of the nodes in *model units*.
+
+        :param y: (optional)
+            The y-coordinates of the nodes.
+
+        :param scale: (optional)
+            The diameters (or heights) of the nodes measured in multiples of
+            ``node_unit``.
+
+        :param aspect: (optional)
+            The aspect ratios width/height of the nodes. ``None`` or ``nan``
+            entries use the default of the model.
+
+        :param observed: (optional)
+            Which of the nodes are conditioned variables?
+
+        :param fixed: (optional)
+            Which of the nodes are fixed variables?
+
+        :param alternate: (optional)
+            Which of the nodes use the alternate style?
+
+        :param offset: (optional)
+            The ``(dx, dy)`` offset of the labels (in points), shared by all
+            of the nodes.
+
+        :param fontsize: (optional)
+            The fontsize to use for all of the nodes.
+
+        :param plot_params: (optional)
+            A dictionary of parameters to pass to the
+            :class:`matplotlib.patches.Ellipse` constructor for all of the
+            nodes.
+
+        :param label_params: (optional)
+            A dictionary of parameters to pass to the
+            :class:`matplotlib.text.Annotation` constructor for all of the
+            nodes.
+
+        :param shape: (optional)
+            The shapes of the nodes; ``"ellipse"`` (default) or
+            ``"rectangle"``.
+
+        """
+        self._nodes.extend(
+            names,
+            content,
+            x,
+            y,
+            scale,
+            aspect,
+            observed,
+            fixed,
+            alternate,
+            offset,
+            fontsize,
+            plot_params,
+            label_params,
+            shape,
+        )
+
     def add_edge(
         self,
         name1,
@@ -281,10 +1063,78 @@ class PGM:
             plot_params=plot_params,
             label_params=label_params,
         )
-        self._edges.append(e)
+        self._link(e)
 
         return e
 
+    def add_edges_from(
+        self,
+        edges,
+        directed=None,
+        plot_params=None,
+        label_params=None,
+    ):
+        """
+        Construct :class:`Edge` objects between many pairs of named
+        :class:`Node` objects at once. All of the names are checked before
+        any edge is added.
+
+        :param edges:
+            An ``(N, 2)`` array or an iterable of ``(name1, name2)`` pairs.
+            If an edge is directed, the arrow will point to ``name2``.
+
+        :param directed: (optional)
+            Should the edges be directed? A single value for all of the
+            edges or one value per edge.
+
+        :param plot_params: (optional)
+            A dictionary of parameters to pass to the
+            :class:`matplotlib.patches.FancyArrow` constructor for all of
+            the edges.
+
+        :param label_params: (optional)
+            A dictionary of parameters to pass to the
+            :class:`matplotlib.axes.Axes.annotate` constructor for all of
+            the edges.
+
+        :returns:
+            The list of new :class:`Edge` objects.
+
+        """
+        pairs = np.asarray(
+            edges if isinstance(edges, np.ndarray) else list(edges),
+            dtype=object,
+        )
+        if pairs.size == 0:
+            return []
+        if pairs.ndim != 2 or pairs.shape[1] != 2:
+            raise ValueError("Edges must be given as pairs of node names.")
+
+        names = set(pairs.flat)
+        missing = [name for name in names if name not in self._nodes]
+        if missing:
+            raise KeyError(f"Unknown nodes: {', '.join(map(str, missing))}")
+
+        if directed is None:
+            directed = self._ctx.directed
+        directed = np.broadcast_to(
+            np.asarray(directed, dtype=bool), len(pairs)
+        )
+
+        nodes = {name: self._nodes[name] for name in names}
+        new_edges = [
+            Edge(
+                nodes[name1],
+                nodes[name2],
+                directed=d,
+                plot_params=plot_params,
+                label_params=label_params,
+            )
+            for (name1, name2), d in zip(pairs.tolist(), directed.tolist())
+        ]
+        self._link_many(new_edges)
+        return new_edges
+
     def add_plate(
         self,
         plate,
@@ -366,100 +1216,575 @@ class PGM:
 
         return None
 
-    def render(self, dpi=None):
+    def remove_node(self, name):
         """
-        Render the :class:`Plate`, :class:`Edge` and :class:`Node` objects in
-        the model. This will create a new figure with the correct dimensions
-        and plot the model in this area.
+        Remove a :class:`Node` and all of its edges from the model.
 
-        :param dpi: (optional)
-            The DPI value to use for rendering.
+        :param name:
+            The name identifying the node.
 
         """
+        row = self._nodes._rows[name]
+        edges = self._get_edges(self._out_edges, row)
+        edges += self._get_edges(self._in_edges, row)
+        for edge in dict.fromkeys(edges):
+            self._unlink(edge)
+        self._nodes.remove(name)
+
+    def remove_edge(self, name1, name2):
+        """
+        Remove the edges from one named :class:`Node` to another. Undirected
+        edges are removed in either order.
 
-        if dpi is None:
-            self._ctx.dpi = self._dpi
-        else:
-            self._ctx.dpi = dpi
+        :param name1:
+            The name identifying the first node.
 
-        def get_max(maxsize, artist):
-            if isinstance(artist, Ellipse):
-                maxsize = np.maximum(
-                    maxsize,
-                    artist.center
-                    + np.array([artist.width, artist.height]) / 2,
-                    dtype=np.float64,
-                )
-            elif isinstance(artist, Rectangle):
-                maxsize = np.maximum(
-                    maxsize,
-                    np.array([artist._x0, artist._y0], dtype=np.float64)
-                    + np.array([artist._width, artist._height]),
-                    dtype=np.float64,
-                )
-            return maxsize
-
-        def get_min(minsize, artist):
-            if isinstance(artist, Ellipse):
-                minsize = np.minimum(
-                    minsize,
-                    artist.center
-                    - np.array([artist.width, artist.height]) / 2,
-                    dtype=np.float64,
-                )
-            elif isinstance(artist, Rectangle):
-                minsize = np.minimum(
-                    minsize,
-                    np.array([artist._x0, artist._y0], dtype=np.float64),
-                )
-            return minsize
+        :param name2:
+            The name identifying the second node.
 
-        # Auto-set shape
-        # We pass through each object once to find the maximum coordinates
-        if self.shape is None:
-            maxsize = np.copy(self._ctx.origin)
+        """
+        row1, row2 = self._nodes._rows[name1], self._nodes._rows[name2]
+        edges = [
+            edge
+            for edge in self._get_edges(self._out_edges, row1)
+            if edge.node2._index == row2
+        ] + [
+            edge
+            for edge in self._get_edges(self._in_edges, row1)
+            if edge.node1._index == row2 and not edge.directed
+        ]
+        if not edges:
+            raise KeyError(f"No edge between {name1} and {name2}")
+
+        for edge in dict.fromkeys(edges):
+            self._unlink(edge)
+
+    def neighbors(self, name):
+        """
+        Get the names of the nodes that share an edge with a named
+        :class:`Node`, in either direction.
 
-            for plate in self._plates:
-                artist = plate.render(self._ctx)
-                maxsize = get_max(maxsize, artist)
+        :param name:
+            The name identifying the node.
 
-            for name in self._nodes:
-                if self._nodes[name].fixed:
-                    self._nodes[name].offset[1] -= 12.5
-                artist = self._nodes[name].render(self._ctx)
-                maxsize = get_max(maxsize, artist)
+        """
+        neighbors = {}
+        for edge in self.out_edges(name):
+            neighbors[edge.node2.name] = None
+        for edge in self.in_edges(name):
+            neighbors[edge.node1.name] = None
+        return list(neighbors)
+
+    def in_edges(self, name):
+        """
+        Get the :class:`Edge` objects that end at a named :class:`Node`.
 
-            self._ctx.reset_shape(maxsize)
+        :param name:
+            The name identifying the node.
 
-        # Pass through each object to find the minimum coordinates
-        if self.origin is None:
-            minsize = np.copy(self._ctx.shape * self._ctx.grid_unit)
+        """
+        return self._get_edges(self._in_edges, self._nodes._rows[name])
 
-            for plate in self._plates:
-                artist = plate.render(self._ctx)
-                minsize = get_min(minsize, artist)
+    def out_edges(self, name):
+        """
+        Get the :class:`Edge` objects that start at a named :class:`Node`.
 
-            for name in self._nodes:
-                artist = self._nodes[name].render(self._ctx)
-                minsize = get_min(minsize, artist)
+        :param name:
+            The name identifying the node.
 
-            self._ctx.reset_origin(minsize, self.shape is None)
+        """
+        return self._get_edges(self._out_edges, self._nodes._rows[name])
 
-        # Clear the figure from rendering context
-        self._ctx.reset_figure()
+    @property
+    def _edges(self):
+        """
+        A read-only view of the edges in the model, in the order of
+        addition.
 
-        for plate in self._plates:
-            plate.render(self._ctx)
+        """
+        return _EdgeView(self._edge_set)
+
+    def _get_edges(self, index, row):
+        self._index_edges()
+        return list(index.get(row, ()))
+
+    def _link(self, edge):
+        """Add an edge to the model."""
+        self._edge_set[edge] = None
+        self._unindexed.append(edge)
+
+    def _link_many(self, edges):
+        """Add many edges to the model."""
+        self._edge_set.update(dict.fromkeys(edges))
+        self._unindexed.extend(edges)
+
+    def _index_edges(self):
+        """Index the edges that were added since the index was last used."""
+        if not self._unindexed:
+            return
+        out_edges, in_edges = self._out_edges, self._in_edges
+        for edge in self._unindexed:
+            # An edge that was added twice is only indexed once.
+            out_edges.setdefault(edge.node1._index, {})[edge] = None
+            in_edges.setdefault(edge.node2._index, {})[edge] = None
+        self._unindexed = []
+
+    def _unlink(self, edge):
+        """Remove an edge from the model and from the index of its nodes."""
+        self._index_edges()
+        del self._edge_set[edge]
+        for index, row in (
+            (self._out_edges, edge.node1._index),
+            (self._in_edges, edge.node2._index),
+        ):
+            del index[row][edge]
+            if not index[row]:
+                del index[row]
 
-        for edge in self._edges:
-            edge.render(self._ctx)
+    def render(self, dpi=None, incremental=False, profile=False):
+        """
+        Render the :class:`Plate`, :class:`Edge` and :class:`Node` objects in
+        the model. This will create a new figure with the correct dimensions
+        and plot the model in this area.
 
-        for name in self._nodes:
-            self._nodes[name].render(self._ctx)
+        :param dpi: (optional)
+            The DPI value to use for rendering.
 
-        return self.ax
+        :param incremental: (optional)
+            Only redraw the nodes, edges and plates that changed since the
+            last render, along with the edges of the changed nodes, on the
+            existing figure. A new figure is still rendered if there is none
+            yet, or if the size of the figure or the style of the model
+            changed, e.g. because a node moved out of the automatic bounds.
+            Redrawn nodes and edges are drawn above the others of their
+            kind.
+
+        :param profile: (optional)
+            Time the phases of the render and count what it does into a
+            :class:`RenderStats` object, which is kept as
+            ``last_render_stats`` until the next render. This can also be a
+            function, which is called with the stats at the end of the
+            render and after each :func:`PGM.savefig`.
 
-    @property
+        """
+        stats = RenderStats() if profile else None
+        self._ctx._stats = stats
+        try:
+            with _counted(stats):
+                with _timed(stats, "layout"):
+                    self._update_layout(dpi)
+
+                    layout = _get_signature(
+                        self._ctx,
+                        [
+                            name
+                            for name in vars(self._ctx)
+                            if not name.startswith("_")
+                        ],
+                    )
+                    edge_signatures = {
+                        edge: _get_signature(edge, _EDGE_ATTRIBUTES)
+                        for edge in self._edge_set
+                    }
+                    plate_signatures = [
+                        (plate, _get_signature(plate, _PLATE_ATTRIBUTES))
+                        for plate in self._plates
+                    ]
+                    if (
+                        incremental
+                        and self._ctx._figure is not None
+                        and layout == self._layout
+                    ):
+                        plates, edges, rows = self._get_changes(
+                            edge_signatures, plate_signatures
+                        )
+                    else:
+                        # Clear the figure from rendering context
+                        self._ctx.reset_figure()
+                        self._artists = {}
+                        self._layout = layout
+                        plates, edges = self._plates, self._edges
+                        rows = self._nodes._rows.values()
+
+                if stats is not None:
+                    existing = set(self.ax.get_children())
+
+                with _timed(stats, "plates"):
+                    self._render_plates(plates)
+                with _timed(stats, "edges"):
+                    self._render_edges(edges)
+                with _timed(stats, "nodes"):
+                    self._render_nodes(rows)
+        finally:
+            self._ctx._stats = None
+
+        self._nodes._dirty[:] = False
+        self._edge_signatures = edge_signatures
+        self._plate_signatures = plate_signatures
+
+        self.last_render_stats = stats
+        self._profile_callback = profile if callable(profile) else None
+        if stats is not None:
+            stats.artists.update(
+                type(artist).__name__
+                for artist in self.ax.get_children()
+                if artist not in existing
+            )
+            if self._profile_callback is not None:
+                self._profile_callback(stats)
+
+        return self.ax
+
+    def _update_layout(self, dpi=None):
+        """
+        Set the DPI, shape and origin of the rendering context, working out
+        the shape and origin from the model if they were not given.
+
+        :param dpi: (optional)
+            The DPI value to use for rendering.
+
+        """
+        if dpi is None:
+            self._ctx.dpi = self._dpi
+        else:
+            self._ctx.dpi = dpi
+
+        # Auto-set shape and origin from the extents of the plates and nodes.
+        # The extents are computed from the model geometry directly, so no
+        # artists are created.
+        if self.origin is None:
+            self._ctx.origin = np.zeros(2, dtype=np.float64)
+
+        if self.shape is None or self.origin is None:
+            extents = [plate._get_extents(self._ctx) for plate in self._plates]
+            if self._nodes:
+                bottom_left, top_right = self._nodes._get_extents(self._ctx)
+                extents.append(
+                    (bottom_left.min(axis=0), top_right.max(axis=0))
+                )
+
+        if self.shape is None:
+            maxsize = np.copy(self._ctx.origin)
+            for _, top_right in extents:
+                maxsize = np.maximum(maxsize, top_right, dtype=np.float64)
+
+            self._ctx.reset_shape(maxsize)
+
+        if self.origin is None:
+            minsize = np.copy(self._ctx.shape * self._ctx.grid_unit)
+            for bottom_left, _ in extents:
+                minsize = np.minimum(minsize, bottom_left, dtype=np.float64)
+
+            self._ctx.reset_origin(minsize, self.shape is None)
+
+    def _get_changes(self, edge_signatures, plate_signatures):
+        """
+        Remove the artists of the nodes, edges and plates that changed since
+        the last render from the axes.
+
+        :param edge_signatures:
+            The current signatures of the edges.
+
+        :param plate_signatures:
+            The current ``(plate, signature)`` pairs of the plates.
+
+        :returns:
+            * ``plates``: the plates to redraw. Plates can overlap in any
+              order, so they are all redrawn if one of them changed.
+            * ``edges``: the edges to redraw.
+            * ``rows``: the rows of the nodes to redraw.
+
+        """
+        nodes = self._nodes
+        dirty = np.flatnonzero(nodes._dirty[: len(nodes._names)]).tolist()
+        rows = [
+            row for row in dirty if nodes._rows.get(nodes._names[row]) == row
+        ]
+
+        def moved(node):
+            return node._table._dirty[node._index]
+
+        signatures = self._edge_signatures
+        edges = [
+            edge
+            for edge, signature in edge_signatures.items()
+            if signatures.get(edge) != signature
+            or moved(edge.node1)
+            or moved(edge.node2)
+        ]
+        removed = set(signatures).difference(edge_signatures)
+
+        plates = []
+        if plate_signatures != self._plate_signatures:
+            plates = self._plates
+            removed.update(plate for plate, _ in self._plate_signatures)
+
+        for key in removed.union(dirty, edges, plates):
+            for artist, index in self._artists.pop(key, ()):
+                _remove_artist(artist, index)
+
+        return plates, edges, rows
+
+    def _track(self, key, artist, index=None):
+        """
+        Record that ``artist`` draws the node row, edge or plate ``key``.
+        See :func:`_remove_artist` for ``index``.
+
+        """
+        if artist is not None:
+            self._artists.setdefault(key, []).append((artist, index))
+
+    def _track_batch(self, keys, artist):
+        """Record the artist returned for a batch of elements."""
+        if len(keys) == 1:
+            for line in artist if isinstance(artist, list) else [artist]:
+                self._track(keys[0], line)
+        else:
+            for index, key in enumerate(keys):
+                self._track(key, artist, index)
+
+    def _render_plates(self, plates):
+        """
+        Render the given plates.
+
+        :param plates:
+            The :class:`Plate` objects to render.
+
+        """
+        for plate in plates:
+            for artist in plate._render(self._ctx):
+                self._track(plate, artist)
+
+    def _render_edges(self, edges):
+        """
+        Render the given edges. Undirected edges are drawn as
+        :class:`matplotlib.collections.LineCollection` objects and arrows as
+        :class:`matplotlib.collections.PolyCollection` objects. As for the
+        nodes, a run of edges is only split by an edge whose plot_params
+        cannot be batched, which is then drawn on its own.
+
+        :param edges:
+            The :class:`Edge` objects to render.
+
+        """
+        from matplotlib.patches import FancyArrow
+
+        ctx = self._ctx
+        ax = ctx.ax()
+
+        lines, line_keys, line_style = [], [], None
+        arrows, arrow_keys = [], []
+        all_coords = _get_edge_coords(ctx, edges)
+        for edge, coords in zip(edges, all_coords):
+            coords = tuple(coords)
+            plot_params = edge._get_plot_params(ctx)
+            self._track(edge, edge._render_label(ctx, coords))
+
+            if edge.directed:
+                if coords[2] == 0.0 and coords[3] == 0.0:
+                    continue
+                if _BATCHED_ARROW_PARAMS.issuperset(plot_params):
+                    arrows.append((coords, plot_params))
+                    arrow_keys.append(edge)
+                    continue
+
+                self._track_batch(
+                    arrow_keys, _add_arrow_collection(ax, arrows)
+                )
+                arrows, arrow_keys = [], []
+                plot_params.setdefault("zorder", _ARROW_ZORDER)
+                arrow = FancyArrow(
+                    *coords,
+                    width=0,
+                    length_includes_head=True,
+                    **plot_params,
+                )
+                self._track(edge, ax.add_artist(arrow))
+                continue
+
+            style = _get_line_cap_and_join(ctx, plot_params)
+            if style is not None and style == line_style:
+                lines.append((coords, plot_params))
+                line_keys.append(edge)
+                continue
+
+            self._track_batch(
+                line_keys, _add_line_collection(ax, lines, line_style)
+            )
+            lines, line_keys, line_style = [], [], style
+            if style is not None:
+                lines.append((coords, plot_params))
+                line_keys.append(edge)
+            else:
+                x, y, dx, dy = coords
+                for line in ax.plot([x, x + dx], [y, y + dy], **plot_params):
+                    self._track(edge, line)
+
+        self._track_batch(arrow_keys, _add_arrow_collection(ax, arrows))
+        self._track_batch(
+            line_keys, _add_line_collection(ax, lines, line_style)
+        )
+
+    def _render_nodes(self, rows):
+        """
+        Render the given nodes. Consecutive nodes whose patches only differ
+        in their colors, line widths and line styles are drawn as a single
+        :class:`matplotlib.collections.PatchCollection`, which keeps the
+        drawing order (and so the output) of the per-node patches.
+
+        :param rows:
+            The rows of the nodes in the node table.
+
+        """
+        ax = self._ctx.ax()
+
+        batch, keys = [], []
+        for row in rows:
+            node = Node._view(self._nodes, row)
+            patches = node._get_patches(self._ctx)
+            if _BATCHED_NODE_PARAMS.issuperset(node._style.plot_params):
+                batch += patches
+                keys += [row] * len(patches)
+            else:
+                self._track_batch(keys, _add_patch_collection(ax, batch))
+                batch, keys = [], []
+                for patch in patches:
+                    if "zorder" not in node._style.plot_params:
+                        patch.set_zorder(_NODE_ZORDER)
+                    self._track(row, ax.add_artist(patch))
+
+            self._track(row, node._render_label(self._ctx))
+
+        self._track_batch(keys, _add_patch_collection(ax, batch))
+
+    def to_svg(self, fname=None):
+        """
+        Draw the model as an SVG document straight from its geometry, without
+        a matplotlib figure. Repeated node shapes and arrowheads are only
+        defined once in the document. Only mathtext labels are drawn with
+        the help of matplotlib, which turns them into paths, so matplotlib
+        is not imported for models without mathtext. Until it is imported,
+        its default ``rcParams`` are used. Hatches, label boxes and
+        plot_params other than colors, line widths and line styles are not
+        drawn.
+
+        :param fname: (optional)
+            A filename or a file-like object to write the document to.
+
+        :returns:
+            The SVG document as a string.
+
+        """
+        from ._svg import _SVGWriter
+
+        self._update_layout()
+        ctx = self._ctx
+        writer = _SVGWriter(ctx)
+
+        # Draw in the same layers as ``render``, with all of the labels on
+        # top.
+        labels, lines = [], []
+        for plate in self._plates:
+            x, y, width, height = plate._get_rect(ctx)
+            writer.add_outline(
+                "rectangle",
+                (x + 0.5 * width, y + 0.5 * height),
+                width,
+                height,
+                plate._get_rect_params(ctx),
+            )
+            labels.append(plate._get_label(ctx))
+
+        edges = self._edges
+        for edge, coords in zip(edges, _get_edge_coords(ctx, edges)):
+            coords = tuple(coords)
+            plot_params = edge._get_plot_params(ctx)
+            labels.append(edge._get_label(coords))
+            if edge.directed:
+                writer.add_arrow(coords, plot_params)
+            else:
+                lines.append((coords, plot_params))
+
+        for node in self._nodes.values():
+            center = ctx.convert(node.x, node.y)
+            for width, height, plot_params in node._get_outlines(ctx):
+                writer.add_outline(
+                    node.shape, center, width, height, plot_params
+                )
+            labels.append(node._get_label(ctx))
+
+        for coords, plot_params in lines:
+            writer.add_line(coords, plot_params)
+        for label in labels:
+            if label is not None:
+                writer.add_text(label)
+
+        svg = writer.to_string()
+        if hasattr(fname, "write"):
+            fname.write(svg)
+        elif fname is not None:
+            with open(fname, "w", encoding="utf-8") as f:
+                f.write(svg)
+        return svg
+
+    def to_tikz(self, fname=None):
+        r"""
+        Draw the model as a TikZ picture straight from its geometry, without
+        a matplotlib figure. The labels are passed through as LaTeX, and the
+        ``arrows.meta`` and ``shapes.geometric`` TikZ libraries have to be
+        loaded with ``\usetikzlibrary``. Hatches and plot_params other than
+        colors, line widths and line styles are not drawn. matplotlib is
+        not imported, and its default rcParams are used until it is.
+
+        :param fname: (optional)
+            A filename or a file-like object to write the picture to.
+
+        :returns:
+            The TikZ picture as a string.
+
+        """
+        from ._tikz import _TikZWriter
+
+        self._update_layout()
+        ctx = self._ctx
+        writer = _TikZWriter(ctx)
+
+        # The nodes are drawn before the edges, which refer to them.
+        for plate in self._plates:
+            writer.add_plate(plate._get_rect(ctx), plate._get_rect_params(ctx))
+
+        for row, node in zip(self._nodes._rows.values(), self._nodes.values()):
+            writer.add_node(
+                f"n{row}",
+                node.shape,
+                ctx.convert(node.x, node.y),
+                node._get_outlines(ctx),
+                node._get_label(ctx),
+            )
+
+        edges = self._edges
+        for edge, coords in zip(edges, _get_edge_coords(ctx, edges)):
+            coords = tuple(coords)
+            writer.add_edge(
+                (f"n{edge.node1._index}", f"n{edge.node2._index}"),
+                coords,
+                edge._get_plot_params(ctx),
+                edge.directed,
+            )
+            writer.add_label(edge._get_label(coords))
+
+        for plate in self._plates:
+            writer.add_label(plate._get_label(ctx))
+
+        tikz = writer.to_string()
+        if hasattr(fname, "write"):
+            fname.write(tikz)
+        elif fname is not None:
+            with open(fname, "w", encoding="utf-8") as f:
+                f.write(tikz)
+        return tikz
+
+    @property
     def figure(self):
         """Figure as a property."""
         return self._ctx.figure()
@@ -478,11 +1803,365 @@ class PGM:
             The DPI value to use for rendering.
 
         """
+        import matplotlib.pyplot as plt
 
         self.render(dpi=dpi)
         plt.show(*args, **kwargs)
 
-    def savefig(self, fname, *args, **kwargs):
+    def content_hash(self):
+        """
+        Get a hash of everything that the rendered model depends on: the
+        nodes, edges, plates and their text, the style of the model, and the
+        versions of daft and matplotlib along with the ``rcParams`` that
+        affect the output. The hash is stable between processes, but changes
+        made to the figure directly are not seen.
+        Raises a :class:`TypeError` if a parameter of the model is not a
+        string, number, array, list, tuple or dictionary of these.
+
+        :returns:
+            The SHA-256 hash as a hex string.
+
+        """
+        import matplotlib as mpl
+
+        from . import __version__
+
+        nodes = self._nodes
+        rows = np.fromiter(nodes._rows.values(), np.intp, len(nodes._rows))
+        styles = [nodes._styles[style] for style in nodes._style[rows]]
+        ctx = {
+            name: value
+            for name, value in vars(self._ctx).items()
+            if not name.startswith("_")
+            and name not in ("shape", "origin", "figsize", "dpi", "pyplot")
+        }
+        # Matplotlib draws with the global rcParams, while daft reads its
+        # own from the snapshot of the model if it has one, so both are
+        # hashed if they differ.
+        rc_params = [_get_hashed_rc_params(mpl.rcParams)]
+        if self._ctx._rc_params is not None:
+            snapshot = _get_hashed_rc_params(self._ctx._rc_params)
+            if snapshot != rc_params[0]:
+                rc_params.append(snapshot)
+        return _get_key(
+            __version__,
+            mpl.__version__,
+            rc_params,
+            ctx,
+            [self.shape, self.origin, self._dpi],
+            list(nodes._rows),
+            [nodes._contents[row] for row in rows],
+            [
+                getattr(nodes, column)[rows]
+                for column, _ in nodes._COLUMNS
+                if column not in ("_style", "_dirty")
+            ],
+            [
+                [
+                    style.plot_params,
+                    style.label_params,
+                    style.offset,
+                    style.fontsize,
+                ]
+                for style in styles
+            ],
+            [
+                [edge.node1.name, edge.node2.name]
+                + [getattr(edge, name) for name in _EDGE_ATTRIBUTES[2:]]
+                for edge in self._edge_set
+            ],
+            [
+                [type(plate).__name__]
+                + [getattr(plate, name, None) for name in _PLATE_ATTRIBUTES]
+                for plate in self._plates
+            ],
+        )
+
+    def to_dict(self):
+        """
+        Get the nodes, edges, plates and parameters of the model as a
+        dictionary of lists, strings and numbers, which can be saved as JSON
+        if the parameters of the model can. Matplotlib is not imported.
+
+        :returns:
+            A dictionary with the ``version`` of its layout, the ``model``
+            keyword arguments of :class:`PGM`, the ``nodes`` and ``edges`` as
+            dictionaries of columns, the ``node_styles`` and ``edge_styles``
+            that their ``style`` columns point to, and the ``plates``. The
+            ``node1`` and ``node2`` of an edge are positions in the columns
+            of the nodes.
+
+        """
+        data = self._get_state()
+        for table in ("nodes", "edges"):
+            data[table] = {
+                column: _copy(values) for column, values in data[table].items()
+            }
+        data["nodes"]["aspect"] = [
+            None if aspect != aspect else aspect
+            for aspect in data["nodes"]["aspect"]
+        ]
+        return data
+
+    def _get_state(self):
+        """Get the dictionary of :func:`PGM.to_dict` with array columns."""
+        nodes = self._nodes
+        size = len(nodes._names)
+        rows = np.arange(size)[nodes._get_rows()]
+        position = np.full(size, -1, dtype=np.intp)
+        position[rows] = np.arange(len(rows))
+
+        # Only the node styles that are still in use are kept.
+        used, style = np.unique(nodes._style[rows], return_inverse=True)
+        node_styles = [
+            {
+                "plot_params": dict(nodes._styles[i].plot_params),
+                "label_params": _copy(nodes._styles[i].label_params),
+                "offset": list(nodes._styles[i].offset),
+                "fontsize": nodes._styles[i].fontsize,
+            }
+            for i in used.tolist()
+        ]
+        flags = nodes._flags[rows]
+
+        edges = list(self._edge_set)
+        edge_styles, edge_style_ids = [], {}
+        edge_style = np.empty(len(edges), dtype=np.int32)
+        for i, edge in enumerate(edges):
+            plot_params, label_params = edge.plot_params, edge.label_params
+            try:
+                key = (
+                    _freeze(plot_params) if plot_params else None,
+                    _freeze(label_params) if label_params else None,
+                )
+                edge_style[i] = edge_style_ids[key]
+                continue
+            except KeyError:
+                edge_style_ids[key] = len(edge_styles)
+            except TypeError:
+                pass
+            edge_style[i] = len(edge_styles)
+            edge_styles.append(
+                {
+                    "plot_params": dict(plot_params),
+                    "label_params": dict(label_params),
+                }
+            )
+
+        ctx = self._ctx
+        return {
+            "version": SCHEMA_VERSION,
+            "model": {
+                "shape": _copy(self.shape),
+                "origin": _copy(self.origin),
+                "grid_unit": ctx.grid_unit,
+                "node_unit": ctx.node_unit,
+                "observed_style": ctx.observed_style,
+                "alternate_style": ctx.alternate_style,
+                "line_width": ctx.line_width,
+                "node_ec": _copy(ctx.node_ec),
+                "node_fc": _copy(ctx.node_fc),
+                "plate_fc": _copy(ctx.plate_fc),
+                "directed": ctx.directed,
+                "aspect": ctx.aspect,
+                "label_params": dict(ctx.label_params),
+                "dpi": self._dpi,
+            },
+            "nodes": {
+                "name": [nodes._names[row] for row in rows.tolist()],
+                "content": [nodes._contents[row] for row in rows.tolist()],
+                "x": nodes._x[rows],
+                "y": nodes._y[rows],
+                "scale": nodes._scale[rows],
+                "aspect": nodes._aspect[rows],
+                "observed": (flags & nodes.OBSERVED) > 0,
+                "fixed": (flags & nodes.FIXED) > 0,
+                "alternate": (flags & nodes.ALTERNATE) > 0,
+                "shape": np.array(_NODE_SHAPES)[nodes._shape[rows]],
+                "style": style.astype(np.int32),
+            },
+            "node_styles": node_styles,
+            "edges": {
+                "node1": position[[edge.node1._index for edge in edges]],
+                "node2": position[[edge.node2._index for edge in edges]],
+                "directed": np.array(
+                    [edge.directed for edge in edges], dtype=bool
+                ),
+                "label": [edge.label for edge in edges],
+                "xoffset": np.array(
+                    [edge.xoffset for edge in edges], dtype=np.float64
+                ),
+                "yoffset": np.array(
+                    [edge.yoffset for edge in edges], dtype=np.float64
+                ),
+                "style": edge_style,
+            },
+            "edge_styles": edge_styles,
+            "plates": [
+                {
+                    "type": type(plate).__name__,
+                    **{
+                        name: _copy(getattr(plate, name, None))
+                        for name in _PLATE_ATTRIBUTES
+                        if name != "fontsize"
+                    },
+                    "fontsize": plate._fontsize,
+                }
+                for plate in self._plates
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data, **kwargs):
+        """
+        Build a model from the dictionary of :func:`PGM.to_dict`. The
+        columns of the nodes and edges can be lists or arrays. Matplotlib is
+        not imported, unless ``pyplot=False`` is passed.
+        Raises a :class:`ValueError` if the dictionary has a newer version
+        than this version of daft can load.
+
+        :param data:
+            The dictionary.
+
+        :param **kwargs:
+            Passed on to :class:`PGM`, over the parameters of the model,
+            e.g. ``pyplot`` or ``pool``.
+
+        :returns:
+            The :class:`PGM`.
+
+        """
+        check_version(data)
+        # Most of the time goes to making the edges, which would otherwise
+        # set off the garbage collector over and over.
+        with _paused_gc():
+            return cls._from_dict(data, kwargs)
+
+    @classmethod
+    def _from_dict(cls, data, kwargs):
+        """Build a model from a dictionary, see :func:`PGM.from_dict`."""
+        pgm = cls(**dict(data["model"], **kwargs))
+        table = pgm._nodes
+
+        columns = data["nodes"]
+        names = list(columns["name"])
+        count = len(names)
+        styles = np.array(
+            [
+                table._intern_style(
+                    dict(style["plot_params"] or {}),
+                    _copy(style["label_params"]) or None,
+                    list(style["offset"]),
+                    style["fontsize"] or None,
+                )
+                for style in data["node_styles"]
+            ],
+            dtype=np.int32,
+        )
+        shape = np.asarray(columns["shape"], dtype=object)
+        codes = np.zeros(count, dtype=np.uint8)
+        for code, name in enumerate(_NODE_SHAPES):
+            codes[shape == name] = code
+
+        def column(name, dtype):
+            return np.asarray(columns[name], dtype=dtype).reshape(count)
+
+        index = table._reserve_many(names)
+        for row, value in zip(index.tolist(), columns["content"]):
+            table._contents[row] = value
+        table._x[index] = column("x", np.float64)
+        table._y[index] = column("y", np.float64)
+        table._scale[index] = column("scale", np.float64)
+        table._aspect[index] = column("aspect", np.float64)
+        table._flags[index] = (
+            table.OBSERVED * column("observed", bool)
+            | table.FIXED * column("fixed", bool)
+            | table.ALTERNATE * column("alternate", bool)
+        )
+        table._shape[index] = codes
+        table._style[index] = styles[column("style", np.intp)]
+        table._dirty[index] = True
+
+        nodes = [Node._view(table, row) for row in index.tolist()]
+        edge_styles = data["edge_styles"]
+        columns = data["edges"]
+
+        def values(name):
+            return np.asarray(columns[name]).tolist()
+
+        edges = zip(
+            values("node1"),
+            values("node2"),
+            values("directed"),
+            list(columns["label"]),
+            values("xoffset"),
+            values("yoffset"),
+            values("style"),
+        )
+        pgm._link_many(
+            [
+                Edge(
+                    nodes[n1],
+                    nodes[n2],
+                    directed=directed,
+                    label=label,
+                    xoffset=xoffset,
+                    yoffset=yoffset,
+                    plot_params=edge_styles[style]["plot_params"],
+                    label_params=edge_styles[style]["label_params"],
+                )
+                for n1, n2, directed, label, xoffset, yoffset, style in edges
+            ]
+        )
+
+        types = {"Plate": Plate, "Text": Text}
+        for state in data["plates"]:
+            state = dict(state)
+            kind = state.pop("type")
+            if kind not in types:
+                raise ValueError(f"Unknown plate type: {kind}")
+            plate = object.__new__(types[kind])
+            for name in _PLATE_ATTRIBUTES:
+                setattr(plate, name, _copy(state.get(name)))
+            pgm._plates.append(plate)
+
+        return pgm
+
+    def dumps(self):
+        """
+        Encode the model in a compact binary form: the dictionary of
+        :func:`PGM.to_dict`, with its columns stored as arrays. Matplotlib is
+        not imported. The content of nodes and the labels of edges can be
+        strings, integers or floats.
+        Raises a :class:`TypeError` if a parameter of the model cannot be
+        saved as JSON.
+
+        :returns:
+            The :class:`bytes`. See :func:`PGM.loads`.
+
+        """
+        return encode(self._get_state())
+
+    @classmethod
+    def loads(cls, data, **kwargs):
+        """
+        Build a model from the bytes of :func:`PGM.dumps`.
+        Raises a :class:`ValueError` if the bytes are not a model, or are of
+        a newer version than this version of daft can load.
+
+        :param data:
+            The bytes.
+
+        :param **kwargs:
+            Passed on to :class:`PGM`, e.g. ``pyplot``.
+
+        :returns:
+            The :class:`PGM`.
+
+        """
+        return cls.from_dict(decode(data), **kwargs)
+
+    def savefig(self, fname, *args, cache=None, **kwargs):
         """
         Wrapper on ``matplotlib.Figure.savefig()`` that sets default image
         padding using ``bbox_inchaes = tight``.
@@ -494,12 +2173,219 @@ class PGM:
         :param dpi: (optional)
             The DPI value to use for saving.
 
+        :param cache: (optional)
+            A :class:`RenderCache`, or the directory of one. The bytes of
+            the file are taken from the cache if the model was saved with
+            the same :func:`PGM.content_hash` and arguments before, without
+            rendering it. Otherwise the model is rendered if it has no
+            figure yet, and the file is stored in the cache.
+
         """
+        import matplotlib as mpl
+
         kwargs["bbox_inches"] = kwargs.get("bbox_inches", "tight")
         kwargs["dpi"] = kwargs.get("dpi", self._dpi)
-        if not self.figure:
+        if cache is None:
+            if not self.figure:
+                self.render()
+            self._savefig(fname, args, kwargs)
+            return
+
+        if not isinstance(cache, RenderCache):
+            cache = RenderCache(cache)
+
+        fmt = kwargs.get("format")
+        if fmt is None and not hasattr(fname, "write"):
+            fmt = os.path.splitext(os.fspath(fname))[1][1:].lower()
+        kwargs["format"] = fmt or mpl.rcParams["savefig.format"]
+        try:
+            key = _get_key(self.content_hash(), args, kwargs)
+        except TypeError:
+            # The arguments cannot be hashed, so the output is not cached.
+            key, data = None, None
+        else:
+            data = cache.get(key)
+
+        if data is None:
+            if self._ctx._figure is None:
+                self.render()
+            buffer = io.BytesIO()
+            self._savefig(buffer, args, kwargs)
+            data = buffer.getvalue()
+            if key is not None:
+                cache.put(key, data)
+
+        if hasattr(fname, "write"):
+            fname.write(data)
+        else:
+            with open(fname, "wb") as f:
+                f.write(data)
+
+    def _savefig(self, fname, args, kwargs):
+        """
+        Save the figure. For formats that are saved with Agg, a tight
+        bounding box is measured up front, which saves matplotlib the draw
+        that it does to measure it.
+
+        """
+        import matplotlib as mpl
+
+        figure = self.figure
+        fmt = kwargs.get("format")
+        if fmt is None and isinstance(fname, (str, os.PathLike)):
+            fmt = os.path.splitext(os.fspath(fname))[1][1:]
+        fmt = (fmt or mpl.rcParams["savefig.format"]).lower()
+
+        stats = self.last_render_stats
+        with _timed(stats, "savefig"), _counted(stats):
+            if (
+                fmt in _AGG_FORMATS
+                and kwargs.get("bbox_inches") == "tight"
+                and "bbox_extra_artists" not in kwargs
+                and figure.get_layout_engine() is None
+            ):
+                kwargs = dict(
+                    kwargs,
+                    bbox_inches=_get_tight_bbox(
+                        figure,
+                        _get_savefig_dpi(figure, kwargs.get("dpi")),
+                        kwargs.get("pad_inches"),
+                    ),
+                )
+            with _draw_lock:
+                figure.savefig(fname, *args, **kwargs)
+
+        if self._profile_callback is not None:
+            self._profile_callback(stats)
+
+    def savefig_many(self, outputs, **kwargs):
+        """
+        Save the model to several files at once, e.g. in different formats
+        or at different DPIs. The model is rendered once if it has no
+        figure yet, and its tight bounding box is measured once per DPI
+        without drawing the figure, instead of with an extra draw for every
+        file. For vector formats the box is measured with Agg too, so it
+        can differ from :func:`PGM.savefig` by a fraction of a point.
+
+        :param outputs:
+            A dictionary from the filenames to the keyword arguments of
+            :func:`PGM.savefig` for each file, or ``None``.
+
+        :param **kwargs:
+            The keyword arguments of :func:`PGM.savefig` for all files.
+
+        """
+        if self._ctx._figure is None:
+            self.render()
+        figure = self.figure
+
+        bboxes = {}
+        for fname, options in outputs.items():
+            options = dict(kwargs, **(options or {}))
+            options.setdefault("dpi", self._dpi)
+            if (
+                options.get("bbox_inches", "tight") == "tight"
+                and "bbox_extra_artists" not in options
+                and "cache" not in options
+                and figure.get_layout_engine() is None
+            ):
+                dpi = _get_savefig_dpi(figure, options["dpi"])
+                key = (dpi, options.get("pad_inches"))
+                if key not in bboxes:
+                    bboxes[key] = _get_tight_bbox(figure, *key)
+                options["bbox_inches"] = bboxes[key]
+            self.savefig(fname, **options)
+
+    def to_bytes(self, format="png", **kwargs):
+        """
+        Save the model in memory, rendering it first if it has no figure
+        yet.
+
+        :param format: (optional)
+            The file format, e.g. ``"png"``, ``"pdf"`` or ``"svg"``.
+
+        :param **kwargs:
+            Passed on to :func:`PGM.savefig`, e.g. ``dpi`` or ``cache``.
+
+        :returns:
+            The contents of the file as :class:`bytes`.
+
+        """
+        # pylint: disable=redefined-builtin
+        if self._ctx._figure is None:
+            self.render()
+        buffer = io.BytesIO()
+        self.savefig(buffer, format=format, **kwargs)
+        return buffer.getvalue()
+
+    def to_array(self):
+        """
+        Draw the figure of the model with Agg, rendering the model first if
+        it has no figure yet.
+
+        :returns:
+            The pixels of the whole figure as an ``(height, width, 4)``
+            array of RGBA ``uint8`` values. The array is a view of the
+            buffer of the canvas and is not copied, so it changes when the
+            figure is drawn again.
+
+        """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        if self._ctx._figure is None:
+            self.render()
+        figure = self.figure
+        canvas = figure.canvas
+        with _draw_lock:
+            if isinstance(canvas, FigureCanvasAgg):
+                canvas.draw()
+            else:
+                # Draw with a separate Agg canvas, e.g. with a GUI backend
+                # that does not draw with Agg.
+                agg = FigureCanvasAgg(figure)
+                try:
+                    agg.draw()
+                finally:
+                    figure.set_canvas(canvas)
+                canvas = agg
+        return np.asarray(canvas.buffer_rgba())
+
+    def to_scene(self):
+        """
+        List the primitives drawn by the model, with their geometry and
+        style resolved after layout, rendering the model first if it has no
+        figure yet. Nothing is rasterized and no text is laid out, so the
+        scene is fast to get and does not depend on the installed fonts,
+        which makes it a good snapshot for tests; see
+        :func:`daft.testing.assert_scene_matches`.
+
+        :returns:
+            A dictionary of lists, strings and numbers, which can be saved
+            as JSON, with the ``figsize`` in inches, the ``xlim`` and
+            ``ylim`` of the axes, and the ``primitives`` in the order that
+            they are drawn. Each primitive has a ``type`` and a ``zorder``:
+
+            * ``"path"`` primitives are the outlines of nodes, arrows and
+              plates, with their ``vertices`` in plot coordinates, whether
+              they are ``closed``, their ``facecolor`` and ``edgecolor`` as
+              RGBA, and their ``linewidth`` and ``dashes`` in points.
+            * ``"line"`` primitives are undirected edges, with their
+              ``vertices``, ``closed``, ``color``, ``linewidth`` and
+              ``dashes``.
+            * ``"text"`` primitives are labels, with their ``text``, their
+              anchor ``xy`` in plot coordinates, the ``xytext`` offset in
+              points, and their ``fontsize``, ``color``, ``ha``, ``va`` and
+              ``rotation``.
+
+            Elements drawn as one matplotlib collection are listed as one
+            primitive each.
+
+        """
+        from ._scene import get_scene
+
+        if self._ctx._figure is None:
             self.render()
-        self.figure.savefig(fname, *args, **kwargs)
+        return get_scene(self.figure, self.ax)
 
 
 class Node:
@@ -559,6 +2445,10 @@ class Node:
 
     """
 
+    # Nodes keep a ``__dict__`` so that arbitrary attributes can still be set
+    # on them.
+    __slots__ = ("_table", "_index", "__dict__")
+
     def __init__(
         self,
         name,
@@ -576,51 +2466,207 @@ class Node:
         label_params=None,
         shape="ellipse",
     ):
-        # Check Node style.
-        # Iterable is consumed, so first condition checks if two or more are
-        # true
-        node_style = iter((observed, alternate, fixed))
-        if not (
-            (any(node_style) and not any(node_style))
-            or not any((observed, alternate, fixed))
-        ):
-            msg = "A node cannot be more than one of `observed`, `fixed`, or `alternate`."
-            raise ValueError(msg)
+        # A node that is not part of a model keeps its own one-row table. It
+        # becomes a view into the model's table when it is added to a PGM.
+        self._table = _NodeTable(capacity=1)
+        self._index = self._table.add(
+            name,
+            content,
+            x,
+            y,
+            scale,
+            aspect,
+            observed,
+            fixed,
+            alternate,
+            offset,
+            fontsize,
+            plot_params,
+            label_params,
+            shape,
+        )
 
-        self.observed = observed
-        self.fixed = fixed
-        self.alternate = alternate
+    @classmethod
+    def _view(cls, table, index):
+        """
+        Get a :class:`Node` that reads and writes a row of a node table.
 
-        # Metadata.
-        self.name = name
-        self.content = content
+        :param table:
+            The :class:`_NodeTable` object.
 
-        # Coordinates and dimensions.
-        self.x, self.y = float(x), float(y)
-        self.scale = float(scale)
-        if self.fixed:
-            self.scale /= 6.0
-        if aspect is not None:
-            self.aspect = float(aspect)
-        else:
-            self.aspect = aspect
+        :param index:
+            The row of the node in the table.
 
-        # Set fontsize
-        self.fontsize = fontsize if fontsize else mpl.rcParams["font.size"]
+        """
+        node = cls.__new__(cls)
+        node._table = table
+        node._index = index
+        return node
 
-        # Display parameters.
-        self.plot_params = dict(plot_params) if plot_params else {}
+    def __eq__(self, other):
+        if not isinstance(other, Node):
+            return NotImplemented
+        return self._table is other._table and self._index == other._index
 
-        # Text parameters.
-        self.offset = list(offset)
-        self.label_params = dict(label_params) if label_params else None
+    def __hash__(self):
+        return hash((id(self._table), self._index))
 
-        # Shape
-        if shape in ["ellipse", "rectangle"]:
-            self.shape = shape
-        else:
-            print("Warning: wrong shape value, set to ellipse instead")
-            self.shape = "ellipse"
+    @property
+    def name(self):
+        """The plain-text identifier for the node."""
+        return self._table._names[self._index]
+
+    @name.setter
+    def name(self, value):
+        self._table._names[self._index] = value
+        self._table._dirty[self._index] = True
+
+    @property
+    def content(self):
+        """The display form of the variable."""
+        return self._table._contents[self._index]
+
+    @content.setter
+    def content(self, value):
+        self._table._contents[self._index] = value
+        self._table._dirty[self._index] = True
+
+    @property
+    def x(self):
+        """The x-coordinate of the node in *model units*."""
+        return float(self._table._x[self._index])
+
+    @x.setter
+    def x(self, value):
+        self._table._x[self._index] = value
+        self._table._dirty[self._index] = True
+
+    @property
+    def y(self):
+        """The y-coordinate of the node in *model units*."""
+        return float(self._table._y[self._index])
+
+    @y.setter
+    def y(self, value):
+        self._table._y[self._index] = value
+        self._table._dirty[self._index] = True
+
+    @property
+    def scale(self):
+        """The diameter (or height) of the node in units of ``node_unit``."""
+        return float(self._table._scale[self._index])
+
+    @scale.setter
+    def scale(self, value):
+        self._table._scale[self._index] = value
+        self._table._dirty[self._index] = True
+
+    @property
+    def aspect(self):
+        """The aspect ratio of the node, or ``None`` for the default."""
+        aspect = self._table._aspect[self._index]
+        return None if np.isnan(aspect) else float(aspect)
+
+    @aspect.setter
+    def aspect(self, value):
+        self._table._aspect[self._index] = np.nan if value is None else value
+        self._table._dirty[self._index] = True
+
+    @property
+    def observed(self):
+        """Is this a conditioned variable?"""
+        return self._table._get_flag(self._index, _NodeTable.OBSERVED)
+
+    @observed.setter
+    def observed(self, value):
+        self._table._set_flag(self._index, _NodeTable.OBSERVED, value)
+        self._table._dirty[self._index] = True
+
+    @property
+    def fixed(self):
+        """Is this a fixed (not permitted to vary) variable?"""
+        return self._table._get_flag(self._index, _NodeTable.FIXED)
+
+    @fixed.setter
+    def fixed(self, value):
+        self._table._set_flag(self._index, _NodeTable.FIXED, value)
+        self._table._dirty[self._index] = True
+
+    @property
+    def alternate(self):
+        """Does this node use the alternate style?"""
+        return self._table._get_flag(self._index, _NodeTable.ALTERNATE)
+
+    @alternate.setter
+    def alternate(self, value):
+        self._table._set_flag(self._index, _NodeTable.ALTERNATE, value)
+        self._table._dirty[self._index] = True
+
+    @property
+    def shape(self):
+        """The shape of the node: ``"ellipse"`` or ``"rectangle"``."""
+        return _NODE_SHAPES[self._table._shape[self._index]]
+
+    @shape.setter
+    def shape(self, value):
+        self._table._shape[self._index] = _NODE_SHAPES.index(value)
+        self._table._dirty[self._index] = True
+
+    @property
+    def fontsize(self):
+        """
+        The fontsize of the label. Defaults to the ``font.size`` of
+        matplotlib at the time of rendering.
+
+        """
+        fontsize = self._table._styles[
+            self._table._style[self._index]
+        ].fontsize
+        if fontsize is None:
+            import matplotlib as mpl
+
+            return mpl.rcParams["font.size"]
+        return fontsize
+
+    @fontsize.setter
+    def fontsize(self, value):
+        self._table._own_style(self._index).fontsize = value
+
+    @property
+    def plot_params(self):
+        """The parameters passed to the patch constructor."""
+        return _StyleDict(self._table, self._index, "plot_params")
+
+    @plot_params.setter
+    def plot_params(self, value):
+        self._table._own_style(self._index).plot_params = dict(value)
+
+    @property
+    def label_params(self):
+        """The parameters passed to the annotation, or ``None``."""
+        if self._style.label_params is None:
+            return None
+        return _StyleDict(self._table, self._index, "label_params")
+
+    @label_params.setter
+    def label_params(self, value):
+        self._table._own_style(self._index).label_params = (
+            None if value is None else dict(value)
+        )
+
+    @property
+    def offset(self):
+        """The ``[dx, dy]`` offset of the label in points."""
+        return _StyleList(self._table, self._index, "offset")
+
+    @offset.setter
+    def offset(self, value):
+        self._table._own_style(self._index).offset = list(value)
+
+    @property
+    def _style(self):
+        """The shared :class:`_NodeStyle`, which must not be modified."""
+        return self._table._styles[self._table._style[self._index]]
 
     def render(self, ctx):
         """
@@ -634,8 +2680,48 @@ class Node:
         # context.
         ax = ctx.ax()
 
+        patches = self._get_patches(ctx)
+        for patch in patches:
+            ax.add_artist(patch)
+
+        self._render_label(ctx)
+
+        return patches[-1]
+
+    def _get_patches(self, ctx):
+        """
+        Build the patches that draw the node without adding them to the axes.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
+
+        :returns:
+            A list with the background patch of an observed or alternate node
+            (if any) followed by the foreground patch.
+
+        """
+        return [
+            self._get_patch(ctx, width, height, plot_params)
+            for width, height, plot_params in self._get_outlines(ctx)
+        ]
+
+    def _get_outlines(self, ctx):
+        """
+        Get the outlines that draw the node, centered on the node, without
+        matplotlib.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
+
+        :returns:
+            A list of the ``(width, height, plot_params)`` of the background
+            outline of an observed or alternate node (if any) followed by
+            those of the foreground outline, with the resolved parameters to
+            pass to the patch constructor.
+
+        """
         # Resolve the plotting parameters.
-        plot_params = dict(self.plot_params)
+        plot_params = dict(self._style.plot_params)
 
         plot_params["lw"] = _pop_multiple(
             plot_params, ctx.line_width, "lw", "linewidth"
@@ -651,212 +2737,773 @@ class Node:
         )
         fc = plot_params["fc"]
 
-        plot_params["alpha"] = plot_params.get("alpha", 1)
+        plot_params["alpha"] = plot_params.get("alpha", 1)
+
+        # Deal with ``fixed`` nodes.
+        scale = self.scale
+        if self.fixed and not fc_is_set:
+            plot_params["fc"] = "k"
+
+        diameter = ctx.node_unit * scale
+        if self.aspect is not None:
+            aspect = self.aspect
+        else:
+            aspect = ctx.aspect
+
+        outlines = []
+
+        # Set up an observed node or alternate node. Note the fc INSANITY.
+        style = self._get_style(ctx)
+        if style:
+            # Update the plotting parameters depending on the style of
+            # observed node.
+            h = float(diameter)
+            w = aspect * float(diameter)
+            if style == "shaded":
+                plot_params["fc"] = "0.7"
+            elif style == "outer":
+                h = diameter + 0.1 * diameter
+                w = aspect * diameter + 0.1 * diameter
+            elif style == "inner":
+                h = diameter - 0.1 * diameter
+                w = aspect * diameter - 0.1 * diameter
+                plot_params["fc"] = fc
+
+            # Draw the background ellipse.
+            outlines.append((w, h, dict(plot_params)))
+
+            # Reset the face color.
+            plot_params["fc"] = fc
+
+        # Draw the foreground ellipse.
+        if not fc_is_set and not self.fixed and self.observed:
+            plot_params["fc"] = "none"
+
+        outlines.append((diameter * aspect, diameter, plot_params))
+
+        return outlines
+
+    def _get_patch(self, ctx, width, height, plot_params):
+        """
+        Build a single patch of the node's shape centered on the node.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
+
+        :param width:
+            The width of the patch in plot coordinates.
+
+        :param height:
+            The height of the patch in plot coordinates.
+
+        :param plot_params:
+            The resolved parameters to pass to the patch constructor.
+
+        """
+        from matplotlib.patches import Ellipse, Rectangle
+
+        if self.shape == "ellipse":
+            return Ellipse(
+                xy=ctx.convert(self.x, self.y),
+                width=width,
+                height=height,
+                **plot_params,
+            )
+
+        if self.shape == "rectangle":
+            # Adapt to make Rectangle the same api than ellipse
+            xy = ctx.convert(self.x, self.y)
+            xy[0] = xy[0] - width / 2.0
+            xy[1] = xy[1] - height / 2.0
+
+            return Rectangle(xy=xy, width=width, height=height, **plot_params)
+
+        # Should never append
+        raise ValueError("Wrong shape in object causes an error in render")
+
+    def _render_label(self, ctx):
+        """
+        Annotate the node with its content.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
+
+        """
+        return _annotate(ctx, self._get_label(ctx))
+
+    def _get_label(self, ctx):
+        """
+        Get the arguments of the annotation with the content of the node.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
+
+        """
+        style = self._style
+        if style.label_params is None:
+            label_params = dict(ctx.label_params)
+        else:
+            label_params = dict(style.label_params)
+
+        label_params["va"] = _pop_multiple(
+            label_params, "center", "va", "verticalalignment"
+        )
+
+        label_params["ha"] = _pop_multiple(
+            label_params, "center", "ha", "horizontalalignment"
+        )
+
+        # Deal with ``fixed`` nodes.
+        offset = list(style.offset)
+        if self.fixed:
+            # MAGIC: These magic numbers should depend on the grid/node units.
+            # Daft used to add 6 points on every render and take 12.5 off
+            # before its first auto-size pass, so a model laid out
+            # automatically ended up 5.5 points up. That is the default
+            # layout, so it is kept, now for every layout and every render.
+            offset[1] += 5.5
+
+            label_params["va"] = "baseline"
+            label_params.pop("verticalalignment", None)
+            label_params.pop("ma", None)
+
+        return dict(
+            text=self.content,
+            xy=ctx.convert(self.x, self.y),
+            xycoords="data",
+            xytext=offset,
+            textcoords="offset points",
+            size=(
+                ctx.rc_params["font.size"]
+                if style.fontsize is None
+                else style.fontsize
+            ),
+            **label_params,
+        )
+
+    def _get_style(self, ctx):
+        """
+        Get the style of the node: the observed or alternate style from the
+        rendering context, or ``False`` for a plain or fixed node.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
+
+        """
+        if self.observed and not self.fixed:
+            return ctx.observed_style
+        if self.alternate and not self.fixed:
+            return ctx.alternate_style
+        return False
+
+    def _get_extents(self, ctx):
+        """
+        Get the bounding box of the node in plot coordinates, including the
+        extra outline drawn around ``"outer"`` style nodes.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
+
+        :returns:
+            * ``bottom_left``, ``top_right``: the corners of the bounding box.
+
+        """
+        bottom_left, top_right = self._table._get_extents(ctx, [self._index])
+        return bottom_left[0], top_right[0]
+
+    def get_frontier_coord(self, target_xy, ctx, edge):
+        """
+        Get the coordinates of the point of intersection between the
+        shape of the node and a line starting from the center of the node to an
+        arbitrary point. Will throw a :class:`SameLocationError` if the nodes
+        contain the same `x` and `y` coordinates. See the example of rectangle
+        below:
+
+        .. code-block:: python
+
+            _____________
+            |            |    ____--X (target_node)
+            |        __--X----
+            |     X--    |(return coordinate of this point)
+            |            |
+            |____________|
+
+        :target_xy: (x float, y float)
+            A tuple of coordinate of target node
+
+        """
+
+        # Aspect ratios.
+        if self.aspect is not None:
+            aspect = self.aspect
+        else:
+            aspect = ctx.aspect
+
+        if self.shape not in _NODE_SHAPES:
+            # Should never append
+            raise ValueError("Wrong shape in object causes an error")
+
+        points, same = _get_frontier_coords(
+            [ctx.convert(self.x, self.y)],
+            [target_xy],
+            self.scale,
+            aspect,
+            _NODE_SHAPES.index(self.shape),
+            ctx.node_unit,
+        )
+        if ctx._stats is not None:
+            ctx._stats.counters["frontier_coords"] += 1
+        if same[0]:
+            raise SameLocationError(edge)
+
+        return points[0, 0], points[0, 1]
+
+
+class _NodeStyle:
+    """
+    The display parameters of a node, which are shared between all of the
+    nodes in a :class:`_NodeTable` that were added with equal values.
+
+    """
+
+    __slots__ = ("plot_params", "label_params", "offset", "fontsize")
+
+    def __init__(self, plot_params, label_params, offset, fontsize):
+        self.plot_params = plot_params
+        self.label_params = label_params
+        self.offset = offset
+        self.fontsize = fontsize
+
+    def copy(self):
+        """Return a copy that does not share any mutable state."""
+        return _NodeStyle(
+            dict(self.plot_params),
+            None if self.label_params is None else dict(self.label_params),
+            list(self.offset),
+            self.fontsize,
+        )
+
+
+class _StyleView:
+    """
+    A view of a mutable value of the :class:`_NodeStyle` of a node, e.g.
+    its ``plot_params``. Reading it leaves the shared style alone, and the
+    first change gives the node a style of its own, see
+    :func:`_NodeTable._own_style`.
+
+    """
+
+    __slots__ = ("_table", "_index", "_name")
+
+    def __init__(self, table, index, name):
+        self._table = table
+        self._index = index
+        self._name = name
+
+    def _get(self):
+        table = self._table
+        return getattr(table._styles[table._style[self._index]], self._name)
+
+    def _own(self):
+        return getattr(self._table._own_style(self._index), self._name)
+
+    def __getitem__(self, key):
+        return self._get()[key]
+
+    def __setitem__(self, key, value):
+        self._own()[key] = value
+
+    def __delitem__(self, key):
+        del self._own()[key]
+
+    def __len__(self):
+        return len(self._get())
+
+    def __repr__(self):
+        return repr(self._get())
+
+
+class _StyleDict(_StyleView, MutableMapping):
+    """A view of the ``plot_params`` or ``label_params`` of a node."""
+
+    __slots__ = ()
+
+    def __iter__(self):
+        return iter(self._get())
+
+
+class _StyleList(_StyleView, MutableSequence):
+    """A view of the ``offset`` of a node."""
+
+    __slots__ = ()
+
+    def insert(self, index, value):
+        self._own().insert(index, value)
+
+    def __eq__(self, other):
+        if isinstance(other, _StyleList):
+            other = other._get()
+        return self._get() == other
+
+    __hash__ = None
+
+
+def _copy(value):
+    """
+    Copy nested dictionaries and lists, and turn arrays into lists, so that
+    a model and its :func:`PGM.to_dict` share no mutable state.
+
+    """
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_copy(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return value
+
+
+def _freeze(value):
+    """
+    Convert nested dictionaries, lists, tuples and arrays into a hashable
+    key.
+    Raises a :class:`TypeError` if ``value`` contains unhashable objects.
+
+    """
+    if isinstance(value, dict):
+        return (dict, tuple((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(v) for v in value))
+    if isinstance(value, np.ndarray):
+        return (np.ndarray, value.dtype.str, value.shape, value.tobytes())
+    hash(value)
+    return value
+
+
+class _NodeTable(Mapping):
+    """
+    A structure-of-arrays store for the nodes of a :class:`PGM`. The
+    coordinates, scales, aspect ratios, style flags and shapes of the nodes
+    are kept in NumPy arrays, and their display parameters are interned as
+    :class:`_NodeStyle` objects. The table is a mapping from the node names
+    to :class:`Node` views of its rows.
+
+    :param capacity: (optional)
+        The number of rows to allocate up front.
+
+    """
+
+    __slots__ = (
+        "_rows",
+        "_names",
+        "_contents",
+        "_x",
+        "_y",
+        "_scale",
+        "_aspect",
+        "_flags",
+        "_shape",
+        "_style",
+        "_dirty",
+        "_styles",
+        "_style_ids",
+        "_interned",
+        "_views",
+    )
+
+    # The bits of the ``_flags`` column.
+    OBSERVED = 1
+    FIXED = 2
+    ALTERNATE = 4
+
+    _COLUMNS = (
+        ("_x", np.float64),
+        ("_y", np.float64),
+        ("_scale", np.float64),
+        ("_aspect", np.float64),
+        ("_flags", np.uint8),
+        ("_shape", np.uint8),
+        ("_style", np.int32),
+        # The rows that changed since the last render of the model.
+        ("_dirty", np.bool_),
+    )
+
+    def __init__(self, capacity=16):
+        self._rows = {}
+        self._names = []
+        self._contents = []
+        for column, dtype in self._COLUMNS:
+            setattr(self, column, np.empty(capacity, dtype=dtype))
+
+        self._styles = []
+        self._style_ids = {}
+        self._interned = set()
+        # The views handed out by ``__getitem__``, by name, which are reused
+        # since looking up nodes by name is on the path of every add_edge.
+        self._views = {}
+
+    def __getitem__(self, name):
+        node = self._views.get(name)
+        if node is None:
+            node = self._views[name] = Node._view(self, self._rows[name])
+        return node
+
+    def __contains__(self, name):
+        return name in self._rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(
+        self,
+        name,
+        content,
+        x,
+        y,
+        scale=1.0,
+        aspect=None,
+        observed=False,
+        fixed=False,
+        alternate=False,
+        offset=(0.0, 0.0),
+        fontsize=None,
+        plot_params=None,
+        label_params=None,
+        shape="ellipse",
+    ):
+        """
+        Add a node to the table, or replace the node with the same name. See
+        :class:`Node` for the parameters.
+
+        :returns:
+            The row of the node.
 
-        # And the label parameters.
-        if self.label_params is None:
-            label_params = dict(ctx.label_params)
-        else:
-            label_params = dict(self.label_params)
+        """
+        # Check Node style.
+        # Iterable is consumed, so first condition checks if two or more are
+        # true
+        node_style = iter((observed, alternate, fixed))
+        if not (
+            (any(node_style) and not any(node_style))
+            or not any((observed, alternate, fixed))
+        ):
+            msg = "A node cannot be more than one of `observed`, `fixed`, or `alternate`."
+            raise ValueError(msg)
 
-        label_params["va"] = _pop_multiple(
-            label_params, "center", "va", "verticalalignment"
+        # Coordinates and dimensions.
+        scale = float(scale)
+        if fixed:
+            scale /= 6.0
+
+        # Shape
+        if shape not in _NODE_SHAPES:
+            _warn_shapes([shape])
+            shape = "ellipse"
+
+        style = self._intern_style(
+            dict(plot_params) if plot_params else {},
+            dict(label_params) if label_params else None,
+            list(offset),
+            fontsize if fontsize else None,
         )
 
-        label_params["ha"] = _pop_multiple(
-            label_params, "center", "ha", "horizontalalignment"
+        index = self._reserve(name)
+        self._contents[index] = content
+        self._x[index] = x
+        self._y[index] = y
+        self._scale[index] = scale
+        self._aspect[index] = np.nan if aspect is None else aspect
+        self._flags[index] = (
+            self.OBSERVED * bool(observed)
+            | self.FIXED * bool(fixed)
+            | self.ALTERNATE * bool(alternate)
         )
+        self._shape[index] = _NODE_SHAPES.index(shape)
+        self._style[index] = style
+        self._dirty[index] = True
+        return index
 
-        # Deal with ``fixed`` nodes.
-        scale = self.scale
-        if self.fixed:
-            # MAGIC: These magic numbers should depend on the grid/node units.
-            self.offset[1] += 6
+    def add_node(self, node):
+        """
+        Copy a :class:`Node` into the table, or over the node with the same
+        name, and turn it into a view of its new row.
 
-            label_params["va"] = "baseline"
-            label_params.pop("verticalalignment", None)
-            label_params.pop("ma", None)
+        :param node:
+            The :class:`Node` to add.
 
-            if not fc_is_set:
-                plot_params["fc"] = "k"
+        :returns:
+            The row of the node.
 
-        diameter = ctx.node_unit * scale
-        if self.aspect is not None:
-            aspect = self.aspect
-        else:
-            aspect = ctx.aspect
+        """
+        table, row = node._table, node._index
+        style = table._styles[table._style[row]].copy()
+        self._styles.append(style)
 
-        # Set up an observed node or alternate node. Note the fc INSANITY.
-        if self.observed and not self.fixed:
-            style = ctx.observed_style
-        elif self.alternate and not self.fixed:
-            style = ctx.alternate_style
-        else:
-            style = False
+        index = self._reserve(table._names[row])
+        self._contents[index] = table._contents[row]
+        for column, _ in self._COLUMNS:
+            getattr(self, column)[index] = getattr(table, column)[row]
+        self._style[index] = len(self._styles) - 1
+        self._dirty[index] = True
 
-        if style:
-            # Update the plotting parameters depending on the style of
-            # observed node.
-            h = float(diameter)
-            w = aspect * float(diameter)
-            if style == "shaded":
-                plot_params["fc"] = "0.7"
-            elif style == "outer":
-                h = diameter + 0.1 * diameter
-                w = aspect * diameter + 0.1 * diameter
-            elif style == "inner":
-                h = diameter - 0.1 * diameter
-                w = aspect * diameter - 0.1 * diameter
-                plot_params["fc"] = fc
+        node._table, node._index = self, index
+        return index
 
-            # Draw the background ellipse.
-            if self.shape == "ellipse":
-                bg = Ellipse(
-                    xy=ctx.convert(self.x, self.y),
-                    width=w,
-                    height=h,
-                    **plot_params,
-                )
-            elif self.shape == "rectangle":
-                # Adapt to make Rectangle the same api than ellipse
-                wi = w
-                xy = ctx.convert(self.x, self.y)
-                xy[0] = xy[0] - wi / 2.0
-                xy[1] = xy[1] - h / 2.0
-
-                bg = Rectangle(xy=xy, width=wi, height=h, **plot_params)
-            else:
-                # Should never append
-                raise (
-                    ValueError(
-                        "Wrong shape in object causes an error in render"
-                    )
-                )
+    def extend(
+        self,
+        names,
+        content="",
+        x=0.0,
+        y=0.0,
+        scale=1.0,
+        aspect=None,
+        observed=False,
+        fixed=False,
+        alternate=False,
+        offset=(0.0, 0.0),
+        fontsize=None,
+        plot_params=None,
+        label_params=None,
+        shape="ellipse",
+    ):
+        """
+        Add many nodes to the table at once, replacing any nodes with the
+        same names. See :func:`PGM.add_nodes_from` for the parameters.
 
-            ax.add_artist(bg)
+        :returns:
+            The rows of the nodes.
 
-            # Reset the face color.
-            plot_params["fc"] = fc
+        """
+        names = list(names)
+        count = len(names)
 
-        # Draw the foreground ellipse.
-        if not fc_is_set and not self.fixed and self.observed:
-            plot_params["fc"] = "none"
+        def column(value, dtype):
+            return np.broadcast_to(np.asarray(value, dtype=dtype), (count,))
 
-        if self.shape == "ellipse":
-            el = Ellipse(
-                xy=ctx.convert(self.x, self.y),
-                width=diameter * aspect,
-                height=diameter,
-                **plot_params,
-            )
-        elif self.shape == "rectangle":
-            # Adapt to make Rectangle the same api than ellipse
-            wi = diameter * aspect
-            xy = ctx.convert(self.x, self.y)
-            xy[0] = xy[0] - wi / 2.0
-            xy[1] = xy[1] - diameter / 2.0
+        observed = column(observed, bool)
+        fixed = column(fixed, bool)
+        alternate = column(alternate, bool)
+        if np.any(observed.astype(int) + fixed + alternate > 1):
+            msg = "A node cannot be more than one of `observed`, `fixed`, or `alternate`."
+            raise ValueError(msg)
 
-            el = Rectangle(xy=xy, width=wi, height=diameter, **plot_params)
+        shape = column(shape, object)
+        codes = np.zeros(count, dtype=np.uint8)
+        for code, name in enumerate(_NODE_SHAPES):
+            codes[shape == name] = code
+        wrong = ~np.isin(shape, _NODE_SHAPES)
+        if np.any(wrong):
+            # One warning for the whole batch.
+            _warn_shapes(shape[wrong])
+
+        # A string or a scalar, e.g. a number, is shared by all of the nodes.
+        if isinstance(content, str) or not isinstance(content, Iterable):
+            content = [content] * count
         else:
-            # Should never append
-            raise (
-                ValueError("Wrong shape in object causes an error in render")
-            )
-
-        ax.add_artist(el)
+            content = list(content)
+            if len(content) != count:
+                raise ValueError(
+                    f"Expected {count} contents but got {len(content)}."
+                )
 
-        # Reset the face color.
-        plot_params["fc"] = fc
+        scale = column(scale, np.float64) / np.where(fixed, 6.0, 1.0)
+        aspect = column(np.nan if aspect is None else aspect, np.float64)
+        x, y = column(x, np.float64), column(y, np.float64)
 
-        # Annotate the node.
-        ax.annotate(
-            self.content,
-            ctx.convert(self.x, self.y),
-            xycoords="data",
-            xytext=self.offset,
-            textcoords="offset points",
-            size=self.fontsize,
-            **label_params,
+        style = self._intern_style(
+            dict(plot_params) if plot_params else {},
+            dict(label_params) if label_params else None,
+            list(offset),
+            fontsize if fontsize else None,
         )
 
-        return el
+        index = self._reserve_many(names)
+        for row, value in zip(index, content):
+            self._contents[row] = value
+        self._x[index] = x
+        self._y[index] = y
+        self._scale[index] = scale
+        self._aspect[index] = aspect
+        self._flags[index] = (
+            self.OBSERVED * observed
+            | self.FIXED * fixed
+            | self.ALTERNATE * alternate
+        )
+        self._shape[index] = codes
+        self._style[index] = style
+        self._dirty[index] = True
+        return index
 
-    def get_frontier_coord(self, target_xy, ctx, edge):
+    def remove(self, name):
         """
-        Get the coordinates of the point of intersection between the
-        shape of the node and a line starting from the center of the node to an
-        arbitrary point. Will throw a :class:`SameLocationError` if the nodes
-        contain the same `x` and `y` coordinates. See the example of rectangle
-        below:
+        Remove the node called ``name`` from the table. Its row is left in
+        place, so the rows of the other nodes and their views stay valid.
 
-        .. code-block:: python
+        :returns:
+            The row of the node.
 
-            _____________
-            |            |    ____--X (target_node)
-            |        __--X----
-            |     X--    |(return coordinate of this point)
-            |            |
-            |____________|
+        """
+        index = self._rows.pop(name)
+        self._views.pop(name, None)
+        self._contents[index] = None
+        self._dirty[index] = True
+        return index
+
+    def _get_rows(self):
+        """Get the rows of the nodes in the table, skipping removed rows."""
+        if len(self._rows) == len(self._names):
+            return slice(None)
+        return np.fromiter(self._rows.values(), np.intp, len(self._rows))
+
+    def _reserve(self, name):
+        """
+        Get the row for the node called ``name``, appending a new row if
+        there is no such node yet.
 
-        :target_xy: (x float, y float)
-            A tuple of coordinate of target node
+        """
+        index = self._rows.get(name)
+        if index is not None:
+            return index
+
+        index = len(self._names)
+        self._grow(index + 1)
+        self._rows[name] = index
+        self._names.append(name)
+        self._contents.append(None)
+        return index
+
+    def _reserve_many(self, names):
+        """
+        Get the rows for many nodes at once, appending new rows for the
+        names that are not in the table yet.
 
         """
+        self._grow(len(self._names) + len(names))
+
+        if not self._names:
+            # An empty table takes the names in order, if they are unique.
+            rows = dict(zip(names, range(len(names))))
+            if len(rows) == len(names):
+                self._rows = rows
+                self._names = list(names)
+                self._contents = [None] * len(names)
+                return np.arange(len(names))
+
+        rows = self._rows
+        index = np.empty(len(names), dtype=np.intp)
+        for i, name in enumerate(names):
+            row = rows.get(name)
+            if row is None:
+                row = rows[name] = len(self._names)
+                self._names.append(name)
+                self._contents.append(None)
+            index[i] = row
+        return index
+
+    def _grow(self, size):
+        """Make sure that the columns can hold at least ``size`` rows."""
+        capacity = len(self._x)
+        if size <= capacity:
+            return
+
+        capacity = max(size, 2 * capacity)
+        for column, _ in self._COLUMNS:
+            data = getattr(self, column)
+            grown = np.empty(capacity, dtype=data.dtype)
+            grown[: len(self._names)] = data[: len(self._names)]
+            setattr(self, column, grown)
+
+    def _intern_style(self, plot_params, label_params, offset, fontsize):
+        """
+        Get the id of a :class:`_NodeStyle` with the given parameters,
+        reusing an existing style if the parameters are hashable and equal.
 
-        # Scale the coordinates appropriately.
-        x1, y1 = ctx.convert(self.x, self.y)
-        x2, y2 = target_xy[0], target_xy[1]
+        """
+        style = _NodeStyle(plot_params, label_params, offset, fontsize)
+        try:
+            key = (
+                _freeze(plot_params) if plot_params else None,
+                _freeze(label_params) if label_params else None,
+                tuple(offset),
+                fontsize,
+            )
+            hash(key)
+        except TypeError:
+            self._styles.append(style)
+            return len(self._styles) - 1
+
+        index = self._style_ids.get(key)
+        if index is None:
+            self._styles.append(style)
+            index = self._style_ids[key] = len(self._styles) - 1
+            self._interned.add(index)
+        return index
+
+    def _own_style(self, index):
+        """
+        Give the node in row ``index`` a style of its own before it gets
+        modified, so that the other nodes that share the style keep theirs.
 
-        # Aspect ratios.
-        if self.aspect is not None:
-            aspect = self.aspect
+        """
+        # The style is handed out to be modified, so the node has to be
+        # redrawn by the next incremental render.
+        self._dirty[index] = True
+        style = self._style[index]
+        if style in self._interned:
+            self._styles.append(self._styles[style].copy())
+            style = self._style[index] = len(self._styles) - 1
+        return self._styles[style]
+
+    def _get_flag(self, index, flag):
+        return bool(self._flags[index] & flag)
+
+    def _set_flag(self, index, flag, value):
+        if value:
+            self._flags[index] |= flag
         else:
-            aspect = ctx.aspect
+            self._flags[index] &= ~np.uint8(flag)
 
-        if self.shape == "ellipse":
-            # Compute the distances.
-            dx, dy = x2 - x1, y2 - y1
-            if dx == 0.0 and dy == 0.0:
-                raise SameLocationError(edge)
-            dist1 = np.sqrt(dy * dy + dx * dx / float(aspect * aspect))
-
-            # Compute the fractional effect of the radii of the nodes.
-            alpha1 = 0.5 * ctx.node_unit * self.scale / dist1
-
-            # Get the coordinates of the starting position.
-            x0, y0 = x1 + alpha1 * dx, y1 + alpha1 * dy
-
-            return x0, y0
-
-        elif self.shape == "rectangle":
-            dx, dy = x2 - x1, y2 - y1
-
-            # theta = np.angle(complex(dx, dy))
-            # print(theta)
-            # left or right intersection
-            dxx1 = self.scale * aspect / 2.0 * (np.sign(dx) or 1.0)
-            dyy1 = (
-                self.scale
-                * aspect
-                / 2.0
-                * np.abs(dy / dx)
-                * (np.sign(dy) or 1.0)
-            )
-            val1 = np.abs(complex(dxx1, dyy1))
+    def _get_extents(self, ctx, index=None):
+        """
+        Get the bounding boxes of the nodes in plot coordinates, including
+        the extra outline drawn around ``"outer"`` style nodes.
 
-            # up or bottom intersection
-            dxx2 = self.scale * 0.5 * np.abs(dx / dy) * (np.sign(dx) or 1.0)
-            dyy2 = self.scale * 0.5 * (np.sign(dy) or 1.0)
-            val2 = np.abs(complex(dxx2, dyy2))
+        :param ctx:
+            The :class:`_rendering_context` object.
 
-            if val1 < val2:
-                return x1 + dxx1, y1 + dyy1
-            else:
-                return x1 + dxx2, y1 + dyy2
+        :param index: (optional)
+            The rows to include. All of the nodes in the table by default.
 
-        else:
-            # Should never append
-            raise ValueError("Wrong shape in object causes an error")
+        :returns:
+            * ``bottom_left``, ``top_right``: ``(N, 2)`` arrays with the
+              corners of the bounding boxes.
+
+        """
+        if index is None:
+            index = self._get_rows()
+        size = len(self._names)
+        x, y = self._x[:size][index], self._y[:size][index]
+        aspect = self._aspect[:size][index]
+        aspect = np.where(np.isnan(aspect), ctx.aspect, aspect)
+        flags = self._flags[:size][index]
+
+        diameter = ctx.node_unit * self._scale[:size][index]
+        size = np.stack([diameter * aspect, diameter], axis=-1)
+
+        # Observed takes precedence over alternate, and fixed over both.
+        observed = (flags & self.OBSERVED) > 0
+        alternate = ~observed & ((flags & self.ALTERNATE) > 0)
+        outer = ((flags & self.FIXED) == 0) & (
+            (observed & (ctx.observed_style == "outer"))
+            | (alternate & (ctx.alternate_style == "outer"))
+        )
+        size += np.where(outer, 0.1 * diameter, 0.0)[:, None]
+
+        center = ctx.grid_unit * (np.stack([x, y], axis=-1) - ctx.origin)
+        return center - 0.5 * size, center + 0.5 * size
 
 
 class Edge:
@@ -928,14 +3575,7 @@ class Edge:
             * ``dx0``, ``dy0``: the displacement vector.
 
         """
-        # Scale the coordinates appropriately.
-        x1, y1 = ctx.convert(self.node1.x, self.node1.y)
-        x2, y2 = ctx.convert(self.node2.x, self.node2.y)
-
-        x3, y3 = self.node1.get_frontier_coord((x2, y2), ctx, self)
-        x4, y4 = self.node2.get_frontier_coord((x1, y1), ctx, self)
-
-        return x3, y3, x4 - x3, y4 - y3
+        return tuple(_get_edge_coords(ctx, [self])[0])
 
     def render(self, ctx):
         """
@@ -945,28 +3585,56 @@ class Edge:
             The :class:`_rendering_context` object.
 
         """
+        from matplotlib.patches import FancyArrow
+
         ax = ctx.ax()
 
-        plot_params = self.plot_params
+        coords = self._get_coords(ctx)
+        plot_params = self._get_plot_params(ctx)
+
+        # Add edge annotation.
+        self._render_label(ctx, coords)
+
+        if self.directed:
+            # Zero-length arrows cannot be drawn, and are skipped like in
+            # the batched path.
+            if coords[2] == 0.0 and coords[3] == 0.0:
+                return None
+
+            # Build an arrow.
+            ar = FancyArrow(
+                *coords,
+                width=0,
+                length_includes_head=True,
+                **plot_params,
+            )
+
+            # Add the arrow to the axes.
+            ax.add_artist(ar)
+            return ar
+
+        # Plot the line.
+        x, y, dx, dy = coords
+        line = ax.plot([x, x + dx], [y, y + dy], **plot_params)
+        return line
+
+    def _get_plot_params(self, ctx):
+        """
+        Resolve the plotting parameters of the edge against the defaults
+        from the rendering context.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
+
+        """
+        plot_params = dict(self.plot_params)
         plot_params["linewidth"] = _pop_multiple(
             plot_params, ctx.line_width, "lw", "linewidth"
         )
 
-        plot_params["linestyle"] = plot_params.get("linestyle", "-")
-
-        # Add edge annotation.
-        if self.label is not None:
-            x, y, dx, dy = self._get_coords(ctx)
-            ax.annotate(
-                self.label,
-                [x + 0.5 * dx + self.xoffset, y + 0.5 * dy + self.yoffset],
-                xycoords="data",
-                xytext=[0, 3],
-                textcoords="offset points",
-                ha="center",
-                va="center",
-                **self.label_params,
-            )
+        plot_params["linestyle"] = _pop_multiple(
+            plot_params, "-", "ls", "linestyle"
+        )
 
         if self.directed:
             plot_params["ec"] = _pop_multiple(
@@ -977,35 +3645,50 @@ class Edge:
             )
             plot_params["head_length"] = plot_params.get("head_length", 0.25)
             plot_params["head_width"] = plot_params.get("head_width", 0.1)
+        else:
+            plot_params["color"] = plot_params.get("color", "k")
 
-            # Build an arrow.
-            args = self._get_coords(ctx)
+        return plot_params
 
-            # zero lengh arrow produce error
-            if not (args[2] == 0.0 and args[3] == 0.0):
-                ar = FancyArrow(
-                    *self._get_coords(ctx),
-                    width=0,
-                    length_includes_head=True,
-                    **plot_params,
-                )
+    def _render_label(self, ctx, coords):
+        """
+        Annotate the middle of the edge with its label, if it has one.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
 
-                # Add the arrow to the axes.
-                ax.add_artist(ar)
-                return ar
+        :param coords:
+            The coordinates of the line as returned by ``_get_coords``.
 
-            else:
-                print(args[2], args[3])
+        """
+        label = self._get_label(coords)
+        if label is None:
+            return None
+        return _annotate(ctx, label)
 
-        else:
-            plot_params["color"] = plot_params.get("color", "k")
+    def _get_label(self, coords):
+        """
+        Get the arguments of the annotation with the label of the edge, or
+        ``None`` if it has no label.
+
+        :param coords:
+            The coordinates of the line as returned by ``_get_coords``.
 
-            # Get the right coordinates.
-            x, y, dx, dy = self._get_coords(ctx)
+        """
+        if self.label is None:
+            return None
 
-            # Plot the line.
-            line = ax.plot([x, x + dx], [y, y + dy], **plot_params)
-            return line
+        x, y, dx, dy = coords
+        return dict(
+            text=self.label,
+            xy=[x + 0.5 * dx + self.xoffset, y + 0.5 * dy + self.yoffset],
+            xycoords="data",
+            xytext=[0, 3],
+            textcoords="offset points",
+            ha="center",
+            va="center",
+            **self.label_params,
+        )
 
 
 class Plate:
@@ -1062,10 +3745,7 @@ class Plate:
         self.label_offset = label_offset
         self.shift = shift
 
-        if fontsize is not None:
-            self.fontsize = fontsize
-        else:
-            self.fontsize = mpl.rcParams["font.size"]
+        self.fontsize = fontsize
 
         if rect_params is not None:
             self.rect_params = dict(rect_params)
@@ -1083,6 +3763,23 @@ class Plate:
 
         self.position = position
 
+    @property
+    def fontsize(self):
+        """
+        The fontsize of the label. Defaults to the ``font.size`` of
+        matplotlib at the time of rendering.
+
+        """
+        if self._fontsize is None:
+            import matplotlib as mpl
+
+            return mpl.rcParams["font.size"]
+        return self._fontsize
+
+    @fontsize.setter
+    def fontsize(self, value):
+        self._fontsize = value
+
     def render(self, ctx):
         """
         Render the plate in the given axes.
@@ -1090,17 +3787,60 @@ class Plate:
         :param ctx:
             The :class:`_rendering_context` object.
 
+        """
+        return self._render(ctx)[0]
+
+    def _render(self, ctx):
+        """
+        Render the plate and its label.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
+
+        :returns:
+            * ``rectangle``: the :class:`matplotlib.patches.Rectangle`.
+            * ``label``: the annotation, or ``None`` without a label.
+
         """
         ax = ctx.ax()
 
-        shift = np.array([0, self.shift], dtype=np.float64)
-        rect = np.atleast_1d(self.rect)
-        bottom_left = ctx.convert(*(rect[:2] + shift))
-        top_right = ctx.convert(*(rect[:2] + rect[2:]))
-        rect = np.concatenate([bottom_left, top_right - bottom_left])
+        rectangle = ax.add_artist(self._get_rectangle(ctx))
+
+        label = self._get_label(ctx)
+        if label is not None:
+            label = _annotate(ctx, label)
+
+        return rectangle, label
+
+    def _get_rect(self, ctx):
+        """Get ``[x, y, width, height]`` of the plate in plot coordinates."""
+        bottom_left, top_right = self._get_extents(ctx)
+        return np.concatenate([bottom_left, top_right - bottom_left])
+
+    def _get_rectangle(self, ctx):
+        """
+        Build the patch that draws the plate without adding it to the axes.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
+
+        """
+        from matplotlib.patches import Rectangle
+
+        rect = self._get_rect(ctx)
+        return Rectangle(rect[:2], *rect[2:], **self._get_rect_params(ctx))
+
+    def _get_rect_params(self, ctx):
+        """
+        Resolve the parameters of the rectangle of the plate against the
+        defaults from the rendering context.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
 
+        """
         if self.rect_params is not None:
-            rect_params = self.rect_params
+            rect_params = dict(self.rect_params)
         else:
             rect_params = {}
 
@@ -1111,56 +3851,81 @@ class Plate:
         rect_params["lw"] = _pop_multiple(
             rect_params, ctx.line_width, "lw", "linewidth"
         )
-        rectangle = Rectangle(rect[:2], *rect[2:], **rect_params)
-
-        ax.add_artist(rectangle)
-
-        if self.label is not None:
-            offset = np.array(self.label_offset, dtype=np.float64)
-            if "left" in self.position:
-                position = rect[:2]
-                ha = "left"
-            elif "right" in self.position:
-                position = rect[:2]
-                position[0] += rect[2]
-                ha = "right"
-                offset[0] = -offset[0]
-            elif "center" in self.position:
-                position = rect[:2]
-                position[0] = rect[2] / 2 + rect[0]
-                ha = "center"
-            else:
-                raise RuntimeError(
-                    f"Unknown positioning string: {self.position}"
-                )
+        return rect_params
 
-            if "bottom" in self.position:
-                va = "bottom"
-            elif "top" in self.position:
-                position[1] = rect[1] + rect[3]
-                offset[1] = -offset[1] - 0.1
-                va = "top"
-            elif "middle" in self.position:
-                position[1] += rect[3] / 2
-                va = "center"
-            else:
-                raise RuntimeError(
-                    f"Unknown positioning string: {self.position}"
-                )
+    def _get_label(self, ctx):
+        """
+        Get the arguments of the annotation with the label of the plate, or
+        ``None`` if it has no label.
 
-            ax.annotate(
-                self.label,
-                xy=position,
-                xycoords="data",
-                xytext=offset,
-                textcoords="offset points",
-                size=self.fontsize,
-                bbox=self.bbox,
-                horizontalalignment=ha,
-                verticalalignment=va,
-            )
+        :param ctx:
+            The :class:`_rendering_context` object.
+
+        """
+        if self.label is None:
+            return None
+
+        rect = self._get_rect(ctx)
+        offset = np.array(self.label_offset, dtype=np.float64)
+        if "left" in self.position:
+            position = rect[:2]
+            ha = "left"
+        elif "right" in self.position:
+            position = rect[:2]
+            position[0] += rect[2]
+            ha = "right"
+            offset[0] = -offset[0]
+        elif "center" in self.position:
+            position = rect[:2]
+            position[0] = rect[2] / 2 + rect[0]
+            ha = "center"
+        else:
+            raise RuntimeError(f"Unknown positioning string: {self.position}")
+
+        if "bottom" in self.position:
+            va = "bottom"
+        elif "top" in self.position:
+            position[1] = rect[1] + rect[3]
+            offset[1] = -offset[1] - 0.1
+            va = "top"
+        elif "middle" in self.position:
+            position[1] += rect[3] / 2
+            va = "center"
+        else:
+            raise RuntimeError(f"Unknown positioning string: {self.position}")
+
+        return dict(
+            text=self.label,
+            xy=position,
+            xycoords="data",
+            xytext=offset,
+            textcoords="offset points",
+            size=(
+                ctx.rc_params["font.size"]
+                if self._fontsize is None
+                else self._fontsize
+            ),
+            bbox=self.bbox,
+            horizontalalignment=ha,
+            verticalalignment=va,
+        )
+
+    def _get_extents(self, ctx):
+        """
+        Get the bounding box of the plate in plot coordinates.
+
+        :param ctx:
+            The :class:`_rendering_context` object.
+
+        :returns:
+            * ``bottom_left``, ``top_right``: the corners of the plate.
 
-        return rectangle
+        """
+        shift = np.array([0, self.shift], dtype=np.float64)
+        rect = np.atleast_1d(self.rect)
+        bottom_left = ctx.convert(*(rect[:2] + shift))
+        top_right = ctx.convert(*(rect[:2] + rect[2:]))
+        return bottom_left, top_right
 
 
 class Text(Plate):
@@ -1194,7 +3959,7 @@ class Text(Plate):
             rect=self.rect,
             label=self.label,
             label_offset=self.label_offset,
-            fontsize=self.fontsize,
+            fontsize=fontsize,
             rect_params=self.rect_params,
             bbox=self.bbox,
         )
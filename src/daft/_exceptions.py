@@ -9,11 +9,29 @@ class SameLocationError(Exception):
 
     :param edge:
         The Edge object whose nodes are being added.
+
+    :param *edges: (optional)
+        Any other Edge objects whose nodes share a location. All of the
+        edges are listed in ``edges``.
     """
 
-    def __init__(self, edge):
+    def __init__(self, edge, *edges):
+        self.edges = [edge, *edges]
         self.message = (
-            "Attempted to add edge between `{}` and `{}` but they "
+            "Attempted to add {} between {} but they "
             + "share the same location."
-        ).format(edge.node1.name, edge.node2.name)
+        ).format(
+            "edges" if edges else "edge",
+            ", ".join(
+                f"`{e.node1.name}` and `{e.node2.name}`" for e in self.edges
+            ),
+        )
         super().__init__(self.message)
+
+
+class RenderError(Exception):
+    """
+    Exception to report a model that :func:`render_many` could not render
+    or save. The message names the output, and the ``traceback`` attribute
+    holds the formatted traceback of the original error.
+    """
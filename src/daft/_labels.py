@@ -0,0 +1,192 @@
+"""A cache for the layout of labels."""
+
+__all__ = ["LabelCache", "label_cache"]
+
+import threading
+from collections import OrderedDict, namedtuple
+
+from ._utils import _draw_lock
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# The ``rcParams`` that change how text is laid out and measured.
+_TEXT_RCPARAMS = (
+    "mathtext.fontset",
+    "mathtext.fallback",
+    "mathtext.default",
+    "mathtext.rm",
+    "mathtext.it",
+    "mathtext.bf",
+    "mathtext.sf",
+    "mathtext.tt",
+    "mathtext.cal",
+    "text.usetex",
+    "text.hinting",
+    "text.hinting_factor",
+    "text.kerning_factor",
+)
+
+
+def _get_rc_key():
+    """Get the values of the ``rcParams`` that change the layout of text."""
+    import matplotlib as mpl
+
+    return tuple(mpl.rcParams[key] for key in _TEXT_RCPARAMS)
+
+
+class _LabelLayout:
+    """
+    The layout of a label: its glyphs as a :class:`matplotlib.path.Path`
+    and their extents, in points with the baseline at ``y = 0``.
+
+    """
+
+    __slots__ = ("path", "extents", "svg")
+
+    def __init__(self, path):
+        self.path = path
+        self.extents = tuple(path.get_extents().extents)
+
+        # The SVG path data, filled in by the SVG writer.
+        self.svg = None
+
+
+class LabelCache:
+    """
+    A bounded cache of label layouts that evicts the least recently used
+    layouts first. Labels are laid out by
+    :class:`matplotlib.textpath.TextPath`, which parses mathtext. The
+    layouts are in points, so they do not depend on the DPI. The cache also
+    keeps the extents that renderers measure labels at when figures are
+    drawn or their bounding boxes are measured, per type of renderer and
+    DPI.
+
+    :param maxsize: (optional)
+        The largest number of layouts to keep.
+
+    """
+
+    def __init__(self, maxsize=4096):
+        self._maxsize = maxsize
+        self._layouts = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def maxsize(self):
+        """The largest number of layouts to keep."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        with self._lock:
+            self._maxsize = value
+            self._evict()
+
+    def get(self, text, size, prop=None):
+        """
+        Get the layout of a label, laying it out if it is not cached.
+
+        :param text:
+            The text of the label, which can contain mathtext.
+
+        :param size:
+            The font size in points.
+
+        :param prop: (optional)
+            The :class:`matplotlib.font_manager.FontProperties` of the text.
+            The size of ``prop`` is ignored.
+
+        """
+        from matplotlib.font_manager import FontProperties
+
+        prop = FontProperties() if prop is None else prop.copy()
+        prop.set_size(size)
+        key = ("layout", text, prop, _get_rc_key())
+        layout = self._lookup(key)
+        if layout is None:
+            from matplotlib.textpath import TextPath
+
+            with _draw_lock:
+                path = TextPath((0, 0), text, size=size, prop=prop)
+            layout = self._store(key, _LabelLayout(path))
+        return layout
+
+    def get_metrics(self, text, prop, ismath, measure):
+        """
+        Get the width, height and descent of a label as a renderer measures
+        it, measuring it if it is not cached.
+
+        :param text:
+            The text of the label.
+
+        :param prop:
+            The :class:`matplotlib.font_manager.FontProperties` of the text.
+
+        :param ismath:
+            Whether the text is mathtext, ``"TeX"`` or neither, as passed to
+            the ``get_text_width_height_descent`` of renderers.
+
+        :param measure:
+            The bound ``get_text_width_height_descent`` of the renderer,
+            which measures the label if it is not cached.
+
+        """
+        renderer = measure.__self__
+        kind = (type(renderer), getattr(renderer, "dpi", None))
+        key = ("metrics", text, prop, ismath, kind, _get_rc_key())
+        metrics = self._lookup(key)
+        if metrics is None:
+            metrics = measure(text, prop, ismath)
+            # The key keeps a copy, since font properties are mutable.
+            key = ("metrics", text, prop.copy(), ismath, kind, key[-1])
+            metrics = self._store(key, metrics)
+        return metrics
+
+    def _lookup(self, key):
+        """Get a cached value and count the hit or miss, or ``None``."""
+        with self._lock:
+            value = self._layouts.get(key)
+            if value is None:
+                self._misses += 1
+            else:
+                self._layouts.move_to_end(key)
+                self._hits += 1
+            return value
+
+    def _store(self, key, value):
+        """Cache a value, evicting the least recently used values."""
+        with self._lock:
+            self._layouts[key] = value
+            self._evict()
+        return value
+
+    def _evict(self):
+        while len(self._layouts) > max(self._maxsize, 0):
+            self._layouts.popitem(last=False)
+
+    def cache_info(self):
+        """
+        Get the statistics of the cache.
+
+        :returns:
+            A named tuple with the ``hits``, ``misses``, ``maxsize`` and
+            ``currsize`` of the cache, like :func:`functools.lru_cache`.
+
+        """
+        with self._lock:
+            return CacheInfo(
+                self._hits, self._misses, self._maxsize, len(self._layouts)
+            )
+
+    def cache_clear(self):
+        """Remove all of the cached labels and reset the statistics."""
+        with self._lock:
+            self._layouts.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+# The cache that is shared by all of the models.
+label_cache = LabelCache()
@@ -0,0 +1,137 @@
+"""A pool of figures for rendering many models in a row."""
+
+__all__ = ["FigurePool"]
+
+# pylint: disable=import-outside-toplevel
+
+import threading
+
+
+def _is_reusable(figure):
+    """
+    Can the axes of a figure be kept for the next model? Only if it has a
+    single axes and nothing was set on the figure or the axes besides their
+    artists.
+
+    """
+    if len(figure.axes) != 1 or any(
+        (
+            figure.texts,
+            figure.artists,
+            figure.lines,
+            figure.patches,
+            figure.images,
+            figure.legends,
+        )
+    ):
+        return False
+
+    ax = figure.axes[0]
+    return not (
+        ax.child_axes
+        or ax.tables
+        or ax.get_legend() is not None
+        or ax.get_xlabel()
+        or ax.get_ylabel()
+        or any(ax.get_title(loc) for loc in ("left", "center", "right"))
+    )
+
+
+class FigurePool:
+    """
+    A bounded pool of figures that models without pyplot can render into.
+    A figure that is given back to the pool is cleared, and resized for the
+    next model that takes it. It keeps its Agg canvas and renderer, and its
+    axes unless they were changed beyond adding artists, e.g. by setting a
+    title. See the ``pool`` parameter of :class:`PGM`.
+
+    :param maxsize: (optional)
+        The largest number of idle figures to keep. Figures that are given
+        back to a full pool are dropped.
+
+    """
+
+    def __init__(self, maxsize=4):
+        self._maxsize = maxsize
+        self._figures = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._figures)
+
+    @property
+    def maxsize(self):
+        """The largest number of idle figures to keep."""
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, value):
+        with self._lock:
+            self._maxsize = value
+            del self._figures[max(value, 0) :]
+
+    def acquire(self, figsize, dpi=None):
+        """
+        Take a figure from the pool, or make a new one if the pool is empty.
+
+        :param figsize:
+            The width and height of the figure in inches.
+
+        :param dpi: (optional)
+            The DPI of the figure. Defaults to the ``figure.dpi`` of
+            matplotlib.
+
+        :returns:
+            A :class:`matplotlib.figure.Figure` with an Agg canvas, and
+            either no axes or a single empty axes from the last model.
+
+        """
+        with self._lock:
+            figure = self._figures.pop() if self._figures else None
+
+        if figure is None:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            figure = Figure(figsize=figsize, dpi=dpi)
+            FigureCanvasAgg(figure)
+            return figure
+
+        import matplotlib as mpl
+
+        figure.set_dpi(mpl.rcParams["figure.dpi"] if dpi is None else dpi)
+        figure.set_size_inches(figsize)
+        return figure
+
+    def release(self, figure):
+        """
+        Clear a figure and give it back to the pool. The figure must not be
+        used after that.
+
+        :param figure:
+            A figure from :func:`FigurePool.acquire`.
+
+        """
+        if _is_reusable(figure):
+            # Removing the artists is much faster than making new axes.
+            ax = figure.axes[0]
+            for artist in [
+                *ax.collections,
+                *ax.patches,
+                *ax.lines,
+                *ax.texts,
+                *ax.artists,
+                *ax.images,
+            ]:
+                artist.remove()
+        else:
+            figure.clear()
+
+        with self._lock:
+            if len(self._figures) < self._maxsize:
+                self._figures.append(figure)
+
+    def clear(self):
+        """Drop all of the idle figures, e.g. to free their memory."""
+        with self._lock:
+            self._figures.clear()
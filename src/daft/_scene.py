@@ -0,0 +1,186 @@
+"""The primitives that a rendered model draws, for snapshot tests."""
+
+__all__: list[str] = []
+
+from operator import attrgetter
+
+import matplotlib as mpl
+import numpy as np
+
+from matplotlib.collections import Collection, LineCollection
+from matplotlib.lines import Line2D
+from matplotlib.patches import Patch
+from matplotlib.path import Path
+from matplotlib.text import Annotation, Text
+
+from ._svg import _get_dashes
+
+# The path codes that carry no vertex of their own.
+_SKIPPED_CODES = (Path.STOP, Path.CLOSEPOLY)
+
+
+def _get_rgba(color, alpha=None):
+    """Get a color as a list of RGBA floats."""
+    return [float(c) for c in mpl.colors.to_rgba(color, alpha)]
+
+
+def _get_vertices(path, transform):
+    """
+    Get the vertices of a path in data coordinates, without the vertices of
+    ``CLOSEPOLY`` codes, and whether the path is closed.
+
+    """
+    path = transform.transform_path(path)
+    vertices = path.vertices
+    closed = False
+    if path.codes is not None:
+        skipped = np.isin(path.codes, _SKIPPED_CODES)
+        closed = bool(np.any(path.codes == Path.CLOSEPOLY))
+        vertices = vertices[~skipped]
+    return vertices.tolist(), closed
+
+
+def _get_item(values, i):
+    """
+    Get the property of the ``i``-th path of a collection, which cycles
+    through its values, or ``None`` if it has none.
+
+    """
+    return values[i % len(values)] if len(values) else None
+
+
+def _get_collection(collection, transform):
+    """Split a collection into one primitive per path."""
+    facecolors = collection.get_facecolor()
+    edgecolors = collection.get_edgecolor()
+    linewidths = collection.get_linewidth()
+    linestyles = collection.get_linestyle()
+
+    # Daft draws no collections with offsets, so these are not applied.
+    for i, path in enumerate(collection.get_paths()):
+        # The paths of removed elements are left empty.
+        if not len(path.vertices):
+            continue
+        vertices, closed = _get_vertices(path, transform)
+        primitive = {
+            "type": "path",
+            "zorder": collection.get_zorder(),
+            "vertices": vertices,
+            "closed": closed,
+        }
+        colors = {
+            "facecolor": _get_item(facecolors, i),
+            "edgecolor": _get_item(edgecolors, i),
+        }
+        if isinstance(collection, LineCollection):
+            # Lines are not filled, and are drawn in their edge color.
+            primitive["type"] = "line"
+            colors = {"color": colors["edgecolor"]}
+        for key, color in colors.items():
+            primitive[key] = _get_rgba("none" if color is None else color)
+
+        dashes = _get_item(linestyles, i)[1]
+        primitive["linewidth"] = float(_get_item(linewidths, i))
+        primitive["dashes"] = (
+            None if dashes is None else list(map(float, dashes))
+        )
+        yield primitive
+
+
+def _get_text(ax, text):
+    """Get the primitive of a text or an annotation."""
+    if isinstance(text, Annotation):
+        xy, xycoords = text.xy, text.xycoords
+        xytext, textcoords = text.get_position(), text.anncoords
+    else:
+        xy, xycoords = text.get_position(), "data"
+        xytext, textcoords = (0, 0), "offset points"
+        if text.get_transform() != ax.transData:
+            # Other coordinates are converted through the display.
+            display = text.get_transform().transform(xy)
+            xy = ax.transData.inverted().transform(display)
+    return {
+        "type": "text",
+        "zorder": text.get_zorder(),
+        "text": text.get_text(),
+        "xy": np.asarray(xy, dtype=np.float64).tolist(),
+        "xycoords": xycoords if isinstance(xycoords, str) else "other",
+        "xytext": np.asarray(xytext, dtype=np.float64).tolist(),
+        "textcoords": textcoords if isinstance(textcoords, str) else "other",
+        "fontsize": float(text.get_fontsize()),
+        "color": _get_rgba(text.get_color(), text.get_alpha()),
+        "ha": text.get_horizontalalignment(),
+        "va": text.get_verticalalignment(),
+        "rotation": float(text.get_rotation()),
+    }
+
+
+def _get_primitives(ax, artist):
+    """Get the primitives drawn by an artist of the axes."""
+    transform = artist.get_transform() - ax.transData
+    if isinstance(artist, Collection):
+        yield from _get_collection(artist, transform)
+    elif isinstance(artist, Line2D):
+        vertices, closed = _get_vertices(artist.get_path(), transform)
+        linewidth = float(artist.get_linewidth())
+        yield {
+            "type": "line",
+            "zorder": artist.get_zorder(),
+            "vertices": vertices,
+            "closed": closed,
+            "color": _get_rgba(artist.get_color(), artist.get_alpha()),
+            "linewidth": linewidth,
+            "dashes": _get_dashes(
+                artist.get_linestyle(), linewidth, mpl.rcParams
+            ),
+        }
+    elif isinstance(artist, Patch):
+        vertices, closed = _get_vertices(artist.get_path(), transform)
+        linewidth = float(artist.get_linewidth())
+        yield {
+            "type": "path",
+            "zorder": artist.get_zorder(),
+            "vertices": vertices,
+            "closed": closed,
+            "facecolor": _get_rgba(artist.get_facecolor()),
+            "edgecolor": _get_rgba(artist.get_edgecolor()),
+            "linewidth": linewidth,
+            "dashes": _get_dashes(
+                artist.get_linestyle(), linewidth, mpl.rcParams
+            ),
+        }
+    elif isinstance(artist, Text):
+        if artist.get_text():
+            yield _get_text(ax, artist)
+
+
+def get_scene(figure, ax):
+    """
+    Get the primitives drawn in the axes of a figure, in the order that
+    matplotlib draws them, as the dictionary of :func:`PGM.to_scene`.
+
+    """
+    # Only the artists that were added to the axes are listed, and not the
+    # background, spines, axis or titles of the axes.
+    added = {
+        id(artist)
+        for artist in (*ax.patches, *ax.collections, *ax.lines, *ax.texts)
+    }
+    artists = sorted(
+        (
+            artist
+            for artist in ax.get_children()
+            if id(artist) in added and artist.get_visible()
+        ),
+        key=attrgetter("zorder"),
+    )
+    return {
+        "figsize": figure.get_size_inches().tolist(),
+        "xlim": list(map(float, ax.get_xlim())),
+        "ylim": list(map(float, ax.get_ylim())),
+        "primitives": [
+            primitive
+            for artist in artists
+            for primitive in _get_primitives(ax, artist)
+        ],
+    }
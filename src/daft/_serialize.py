@@ -0,0 +1,249 @@
+"""A compact binary form of the models."""
+
+__all__: list[str] = []
+
+import json
+import struct
+
+import numpy as np
+
+# The version of the layout of :func:`PGM.to_dict`. Models with a newer
+# version cannot be loaded.
+SCHEMA_VERSION = 1
+
+# The start of every binary model, followed by the length of the header.
+_MAGIC = b"DAFTPGM\x00"
+_HEADER = struct.Struct("<8sI")
+
+# How the columns of :func:`PGM.to_dict` are stored: as arrays of numbers,
+# as bits (``"bool"``), as indices into a list of their distinct values in
+# the header (``"category"``), or as UTF-8 text with the offsets of the
+# strings (``"str"``).
+_COLUMNS = {
+    "nodes": {
+        "name": "str",
+        "content": "str",
+        "x": "<f8",
+        "y": "<f8",
+        "scale": "<f8",
+        "aspect": "<f8",
+        "observed": "bool",
+        "fixed": "bool",
+        "alternate": "bool",
+        "shape": "category",
+        "style": "<i4",
+    },
+    "edges": {
+        "node1": "<i4",
+        "node2": "<i4",
+        "directed": "bool",
+        "label": "str",
+        "xoffset": "<f8",
+        "yoffset": "<f8",
+        "style": "<i4",
+    },
+}
+
+
+# The types that ``"str"`` columns can hold, by their codes.
+_STRING_TYPES = (str, int, float)
+
+
+def check_version(data):
+    """
+    Raise a :class:`ValueError` if the dictionary of a model has a version
+    that this version of daft cannot load.
+
+    """
+    version = data.get("version")
+    if not isinstance(version, int) or not 1 <= version <= SCHEMA_VERSION:
+        raise ValueError(
+            f"Cannot load a model with version {version!r}; this version of "
+            f"daft loads versions 1 to {SCHEMA_VERSION}."
+        )
+
+
+def _align(size):
+    """Round ``size`` up to a multiple of 8 bytes."""
+    return -(-size // 8) * 8
+
+
+def _to_json(value):
+    # Called by ``json.dumps`` for the objects that it cannot encode.
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot encode {type(value).__name__} objects")
+
+
+def _encode_strings(strings):
+    """
+    Encode a list of strings, some of which may be ``None``, as UTF-8.
+    Integers and floats are stored as their text, along with their types.
+    Raises a :class:`TypeError` for any other objects.
+
+    :returns:
+        A dictionary of the arrays ``data`` and ``offsets``, of the bits of
+        the ``null`` values if there are any, and of the indices into
+        ``_STRING_TYPES`` of the ``types`` if any value is not a string.
+
+    """
+    strings = list(strings)
+    arrays = {}
+    if None in strings:
+        arrays["null"] = np.packbits([s is None for s in strings])
+        strings = ["" if s is None else s for s in strings]
+
+    if not all(type(s) is str for s in strings):
+        types = np.zeros(len(strings), dtype=np.uint8)
+        for i, s in enumerate(strings):
+            if isinstance(s, np.generic):
+                s = s.item()
+            if type(s) not in _STRING_TYPES:
+                raise TypeError(
+                    f"Cannot encode {type(s).__name__} objects as text"
+                )
+            types[i] = _STRING_TYPES.index(type(s))
+            strings[i] = str(s)
+        arrays["types"] = types
+
+    text = "".join(strings)
+    data = text.encode()
+    if len(data) == len(text):
+        # ASCII only, so the lengths in bytes are the lengths in characters.
+        lengths = np.fromiter(map(len, strings), np.int64, len(strings))
+    else:
+        lengths = np.fromiter(
+            (len(s.encode()) for s in strings), np.int64, len(strings)
+        )
+
+    offsets = np.zeros(len(strings) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    if offsets[-1] < 2**32:
+        offsets = offsets.astype("<u4")
+    arrays["data"] = np.frombuffer(data, np.uint8)
+    arrays["offsets"] = offsets
+    return arrays
+
+
+def _decode_strings(count, data, offsets, null=None, types=None):
+    """Decode the ``count`` strings encoded by :func:`_encode_strings`."""
+    data = bytes(data)
+    bounds = zip(offsets[:-1].tolist(), offsets[1:].tolist())
+    text = data.decode()
+    if len(text) == len(data):
+        # ASCII only, so the offsets in bytes are offsets in characters.
+        strings = [text[a:b] for a, b in bounds]
+    else:
+        strings = [data[a:b].decode() for a, b in bounds]
+
+    if types is not None:
+        for i in np.flatnonzero(types).tolist():
+            strings[i] = _STRING_TYPES[types[i]](strings[i])
+    if null is not None:
+        for i in np.flatnonzero(np.unpackbits(null, count=count)).tolist():
+            strings[i] = None
+    return strings
+
+
+def encode(data):
+    """
+    Encode the dictionary of :func:`PGM.to_dict` as bytes. The columns of
+    the nodes and edges are stored as arrays after a JSON header that holds
+    everything else.
+    Raises a :class:`TypeError` if a parameter of the model cannot be
+    encoded as JSON.
+
+    """
+    header = {k: v for k, v in data.items() if k not in _COLUMNS}
+    header["sizes"] = {}
+    header["categories"] = {}
+    arrays = {}
+    for table, columns in _COLUMNS.items():
+        header["sizes"][table] = len(data[table]["style"])
+        for column, kind in columns.items():
+            values = data[table][column]
+            key = f"{table}.{column}"
+            if kind == "str":
+                for part, array in _encode_strings(values).items():
+                    arrays[f"{key}.{part}"] = array
+            elif kind == "bool":
+                arrays[key] = np.packbits(np.asarray(values, dtype=bool))
+            elif kind == "category":
+                categories, codes = np.unique(
+                    np.asarray(values, dtype=str), return_inverse=True
+                )
+                header["categories"][key] = categories.tolist()
+                arrays[key] = codes.astype(
+                    np.uint8 if len(categories) <= 256 else "<i4"
+                )
+            else:
+                arrays[key] = np.ascontiguousarray(values, dtype=kind)
+
+    offset = 0
+    header["arrays"] = {}
+    for key, array in arrays.items():
+        header["arrays"][key] = [array.dtype.str, len(array), offset]
+        offset += _align(array.nbytes)
+
+    text = json.dumps(header, default=_to_json, separators=(",", ":"))
+    text = text.encode()
+    text += b" " * (
+        _align(_HEADER.size + len(text)) - _HEADER.size - len(text)
+    )
+
+    start = _HEADER.size + len(text)
+    buffer = bytearray(start + offset)
+    _HEADER.pack_into(buffer, 0, _MAGIC, len(text))
+    buffer[_HEADER.size : start] = text
+    for key, array in arrays.items():
+        begin = start + header["arrays"][key][2]
+        buffer[begin : begin + array.nbytes] = array.tobytes()
+    return bytes(buffer)
+
+
+def decode(buffer):
+    """
+    Decode the bytes of :func:`encode` into the dictionary of
+    :func:`PGM.to_dict`, with NumPy arrays for the columns of numbers.
+    Raises a :class:`ValueError` if the bytes are not a model.
+
+    """
+    buffer = memoryview(buffer)
+    if len(buffer) < _HEADER.size:
+        raise ValueError("Not a daft model.")
+    magic, size = _HEADER.unpack_from(buffer)
+    if magic != _MAGIC:
+        raise ValueError("Not a daft model.")
+    start = _HEADER.size + size
+    data = json.loads(bytes(buffer[_HEADER.size : start]))
+    check_version(data)
+
+    arrays = {
+        key: np.frombuffer(buffer, dtype, length, offset=start + offset)
+        for key, (dtype, length, offset) in data.pop("arrays").items()
+    }
+    sizes = data.pop("sizes")
+    categories = data.pop("categories")
+    for table, columns in _COLUMNS.items():
+        count = sizes[table]
+        data[table] = {}
+        for column, kind in columns.items():
+            key = f"{table}.{column}"
+            if kind == "str":
+                values = _decode_strings(
+                    count,
+                    arrays[f"{key}.data"],
+                    arrays[f"{key}.offsets"],
+                    arrays.get(f"{key}.null"),
+                    arrays.get(f"{key}.types"),
+                )
+            elif kind == "bool":
+                values = np.unpackbits(arrays[key], count=count).view(bool)
+            elif kind == "category":
+                values = np.array(categories[key], dtype=object)[arrays[key]]
+            else:
+                values = arrays[key]
+            data[table][column] = values
+    return data
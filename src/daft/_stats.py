@@ -0,0 +1,94 @@
+"""Timings and counters of renders."""
+
+__all__ = ["RenderStats"]
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+
+class RenderStats:
+    """
+    The timings and counters of a profiled :func:`PGM.render`, and of the
+    :func:`PGM.savefig` calls that save its figure.
+
+    The ``timings`` are in seconds. The ``layout``, ``plates``, ``edges``
+    and ``nodes`` phases of the render follow each other. The ``labels``
+    phase is the part of the ``plates``, ``edges`` and ``nodes`` phases
+    that was spent annotating, and ``savefig`` is the time spent saving.
+
+    The ``artists`` count the artists that the render added to the axes
+    by type, and the ``counters`` count the calls to
+    :func:`_rendering_context.convert` (``convert``), the node boundary
+    points that were computed for edges (``frontier_coords``), and the hits
+    and misses of the ``label_cache`` during the render and the saves
+    (``label_cache_hits`` and ``label_cache_misses``). The cache is shared,
+    so these also count the lookups of other threads in the meantime.
+
+    """
+
+    def __init__(self):
+        self.timings = {}
+        self.artists = Counter()
+        self.counters = Counter()
+
+    def __repr__(self):
+        return (
+            f"RenderStats(timings={self.timings!r}, "
+            f"artists={dict(self.artists)!r}, "
+            f"counters={dict(self.counters)!r})"
+        )
+
+    @contextmanager
+    def time(self, phase):
+        """
+        Add the time spent in a ``with`` block to a phase.
+
+        :param phase:
+            The name of the phase.
+
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = (
+                self.timings.get(phase, 0.0) + time.perf_counter() - start
+            )
+
+    @contextmanager
+    def count_cache(self, name, cache):
+        """
+        Add the hits and misses of a cache in a ``with`` block to the
+        ``<name>_hits`` and ``<name>_misses`` counters.
+
+        :param name:
+            The name of the cache.
+
+        :param cache:
+            The cache, with a ``cache_info()`` like
+            :func:`functools.lru_cache`.
+
+        """
+        before = cache.cache_info()
+        try:
+            yield
+        finally:
+            after = cache.cache_info()
+            self.counters[f"{name}_hits"] += after.hits - before.hits
+            self.counters[f"{name}_misses"] += after.misses - before.misses
+
+    def as_dict(self):
+        """
+        Flatten the stats into a dictionary of numbers, e.g. to export them
+        as metrics.
+
+        :returns:
+            A dictionary with the keys ``"time.<phase>"``,
+            ``"artists.<type>"`` and ``"count.<counter>"``.
+
+        """
+        stats = {f"time.{k}": v for k, v in self.timings.items()}
+        stats.update((f"artists.{k}", v) for k, v in self.artists.items())
+        stats.update((f"count.{k}", v) for k, v in self.counters.items())
+        return stats
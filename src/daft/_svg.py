@@ -0,0 +1,416 @@
+"""A writer for SVG documents that does not go through a matplotlib figure."""
+
+__all__: list[str] = []
+
+from math import atan2, degrees, hypot
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
+
+from ._colors import _get_patch_style, _to_hex, _to_rgba
+from ._labels import label_cache
+
+# pylint: disable=import-outside-toplevel
+
+# The generic font families and the rcParams that list their fonts.
+_GENERIC_FAMILIES = ("serif", "sans-serif", "cursive", "fantasy", "monospace")
+
+# The SVG names of the line cap styles.
+_CAPSTYLES = {"butt": "butt", "round": "round", "projecting": "square"}
+
+# The SVG baselines of the vertical alignments of matplotlib.
+_BASELINES = {
+    "baseline": "alphabetic",
+    "bottom": "text-after-edge",
+    "center": "central",
+    "center_baseline": "central",
+    "top": "text-before-edge",
+}
+_ANCHORS = {"left": "start", "center": "middle", "right": "end"}
+
+
+def _fmt(value):
+    """Format a number for an SVG attribute."""
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _is_math_text(text):
+    """Does ``text`` contain mathtext, i.e. pairs of unescaped dollars?"""
+    dollars = text.count("$") - text.count(r"\$")
+    return dollars > 0 and dollars % 2 == 0
+
+
+def _get_paint(name, color, alpha=None):
+    """Get the ``fill`` or ``stroke`` attributes of a color."""
+    rgba = _to_rgba(color, alpha)
+    if rgba[3] == 0:
+        return f'{name}="none"'
+    paint = f'{name}="{_to_hex(rgba)}"'
+    if rgba[3] < 1:
+        paint += f' {name}-opacity="{_fmt(rgba[3])}"'
+    return paint
+
+
+def _get_dashes(linestyle, linewidth, rc_params):
+    """
+    Get the dash pattern that matplotlib uses for a line style, as a list
+    of lengths in points, or ``None`` for solid lines.
+
+    :param rc_params:
+        The ``rcParams`` with the dash patterns of matplotlib.
+
+    """
+    if isinstance(linestyle, tuple):
+        dashes = linestyle[1]
+    else:
+        name = {"--": "dashed", "-.": "dashdot", ":": "dotted"}.get(
+            linestyle, linestyle
+        )
+        if name not in ("dashed", "dashdot", "dotted"):
+            return None
+        dashes = rc_params[f"lines.{name}_pattern"]
+
+    if not dashes:
+        return None
+    if rc_params["lines.scale_dashes"]:
+        return [dash * linewidth for dash in dashes]
+    return list(dashes)
+
+
+def _get_dasharray(linestyle, linewidth, rc_params):
+    """
+    Get the SVG dash array of a line style, or ``None`` for solid lines.
+
+    """
+    dashes = _get_dashes(linestyle, linewidth, rc_params)
+    if dashes is None:
+        return None
+    return " ".join(_fmt(dash) for dash in dashes)
+
+
+def _get_stroke(
+    color, linewidth, linestyle, rc_params, capstyle=None, alpha=None
+):
+    """Get the stroke attributes of an outline or a line."""
+    stroke = _get_paint("stroke", color, alpha)
+    if not linewidth or stroke == 'stroke="none"':
+        return 'stroke="none"'
+
+    attributes = [stroke, f'stroke-width="{_fmt(linewidth)}"']
+    if capstyle is not None:
+        attributes.append(f'stroke-linecap="{_CAPSTYLES[capstyle]}"')
+    dasharray = _get_dasharray(linestyle, linewidth, rc_params)
+    if dasharray is not None:
+        attributes.append(f'stroke-dasharray="{dasharray}"')
+    return " ".join(attributes)
+
+
+def _get_font_family(rc_params):
+    """Get the CSS font family list from the matplotlib rcParams."""
+    families = []
+    for family in rc_params["font.family"]:
+        if family in _GENERIC_FAMILIES:
+            families += [
+                f"'{font}'"
+                for font in rc_params[f"font.{family}"]
+                if font != family
+            ]
+        families.append(family)
+    return ", ".join(families)
+
+
+def _get_path_data(path):
+    """Get the SVG path data of a :class:`matplotlib.path.Path`."""
+    commands = {
+        path.MOVETO: "M",
+        path.LINETO: "L",
+        path.CURVE3: "Q",
+        path.CURVE4: "C",
+    }
+    data = []
+    for vertices, code in path.iter_segments(simplify=False, curves=True):
+        if code == path.CLOSEPOLY:
+            data.append("Z")
+            continue
+
+        # Flip the y-axis, which points down in SVG.
+        vertices = np.reshape(vertices, (-1, 2)) * [1.0, -1.0]
+        data.append(commands[code] + " ".join(map(_fmt, vertices.flat)))
+    return " ".join(data)
+
+
+class _SVGWriter:
+    """
+    Collect the elements of an SVG document that draws a model. The shapes
+    that are drawn more than once are only defined once and then placed
+    with ``<use>`` elements.
+
+    :param ctx:
+        The :class:`_rendering_context` object. Everything is drawn in its
+        plot coordinates, which are converted to points.
+
+    """
+
+    def __init__(self, ctx):
+        # The figures are sized so that one plot unit is ``shp_fig_scale``
+        # times smaller than an inch.
+        self.scale = 72.0 / ctx.shp_fig_scale
+        self.width, self.height = 72.0 * np.asarray(ctx.figsize, dtype=float)
+        self.rc_params = ctx.rc_params
+        self._defs = {}
+        self._def_elements = []
+        self._elements = []
+
+    def _point(self, x, y):
+        """Convert plot coordinates to points from the top left corner."""
+        return x * self.scale, self.height - y * self.scale
+
+    def _use(self, key, element, x, y, transform=None):
+        """
+        Place the definition with the given key, which is added the first
+        time as ``element`` with its ``id`` in place of ``{id}``.
+
+        """
+        name = self._defs.get(key)
+        if name is None:
+            name = self._defs[key] = f"d{len(self._defs)}"
+            self._def_elements.append(element.replace("{id}", name))
+
+        if transform is None:
+            position = f'x="{_fmt(x)}" y="{_fmt(y)}"'
+        else:
+            position = (
+                f'transform="translate({_fmt(x)} {_fmt(y)}) {transform}"'
+            )
+        self._elements.append(f'<use xlink:href="#{name}" {position}/>')
+
+    def add_outline(self, shape, center, width, height, params):
+        """
+        Draw an unrotated ellipse or rectangle.
+
+        :param shape:
+            ``"ellipse"`` or ``"rectangle"``.
+
+        :param center:
+            The center in plot coordinates.
+
+        :param width:
+            The width in plot coordinates.
+
+        :param height:
+            The height in plot coordinates.
+
+        :param params:
+            The resolved parameters of the patch that matplotlib would draw.
+
+        """
+        facecolor, edgecolor, linewidth, linestyle = _get_patch_style(params)
+        style = " ".join(
+            [
+                _get_paint("fill", facecolor),
+                _get_stroke(edgecolor, linewidth, linestyle, self.rc_params),
+            ]
+        )
+
+        x, y = self._point(*center)
+        if shape == "ellipse":
+            rx = _fmt(0.5 * self.scale * width)
+            ry = _fmt(0.5 * self.scale * height)
+            element = f'<ellipse id="{{id}}" rx="{rx}" ry="{ry}" {style}/>'
+            self._use(("ellipse", rx, ry, style), element, x, y)
+            return
+
+        width = self.scale * width
+        height = self.scale * height
+        element = (
+            f'<rect id="{{id}}" x="{_fmt(-0.5 * width)}" '
+            f'y="{_fmt(-0.5 * height)}" width="{_fmt(width)}" '
+            f'height="{_fmt(height)}" {style}/>'
+        )
+        self._use(("rect", _fmt(width), _fmt(height), style), element, x, y)
+
+    def add_arrow(self, coords, plot_params):
+        """
+        Draw a directed edge as a line and an arrowhead.
+
+        :param coords:
+            The ``x``, ``y``, ``dx`` and ``dy`` of the edge.
+
+        :param plot_params:
+            The resolved plotting parameters of the edge.
+
+        """
+        x, y, dx, dy = coords
+        length = hypot(dx, dy)
+        if length == 0.0:
+            return
+
+        alpha = plot_params.get("alpha")
+        stroke = _get_stroke(
+            plot_params["ec"],
+            plot_params["linewidth"],
+            plot_params["linestyle"],
+            self.rc_params,
+            alpha=alpha,
+        )
+
+        # The line stops at the base of the head.
+        head_length = plot_params["head_length"]
+        tip = self._point(x + dx, y + dy)
+        if length > head_length:
+            start = self._point(x, y)
+            base = self._point(
+                x + dx * (1 - head_length / length),
+                y + dy * (1 - head_length / length),
+            )
+            self._elements.append(
+                f'<path d="M{_fmt(start[0])} {_fmt(start[1])} '
+                f'L{_fmt(base[0])} {_fmt(base[1])}" fill="none" {stroke}/>'
+            )
+
+        # The head is drawn pointing right, with its tip at the origin.
+        head_length = _fmt(-self.scale * head_length)
+        half_width = _fmt(0.5 * self.scale * plot_params["head_width"])
+        style = f'{_get_paint("fill", plot_params["fc"], alpha)} {stroke}'
+        element = (
+            f'<path id="{{id}}" d="M0 0 L{head_length} {half_width} '
+            f'L{head_length} -{half_width} Z" {style}/>'
+        )
+        self._use(
+            ("arrow", head_length, half_width, style),
+            element,
+            *tip,
+            f"rotate({_fmt(-degrees(atan2(dy, dx)))})",
+        )
+
+    def add_line(self, coords, plot_params):
+        """
+        Draw an undirected edge.
+
+        :param coords:
+            The ``x``, ``y``, ``dx`` and ``dy`` of the edge.
+
+        :param plot_params:
+            The resolved plotting parameters of the edge.
+
+        """
+        x, y, dx, dy = coords
+        linestyle = plot_params["linestyle"]
+        if _get_dasharray(linestyle, 1.0, self.rc_params) is None:
+            capstyle = self.rc_params["lines.solid_capstyle"]
+        else:
+            capstyle = self.rc_params["lines.dash_capstyle"]
+
+        stroke = _get_stroke(
+            plot_params["color"],
+            plot_params["linewidth"],
+            linestyle,
+            self.rc_params,
+            capstyle,
+            plot_params.get("alpha"),
+        )
+        start, end = self._point(x, y), self._point(x + dx, y + dy)
+        self._elements.append(
+            f'<path d="M{_fmt(start[0])} {_fmt(start[1])} '
+            f'L{_fmt(end[0])} {_fmt(end[1])}" fill="none" {stroke}/>'
+        )
+
+    def add_text(self, label):
+        """
+        Draw the text of an annotation. Mathtext is turned into a path by
+        matplotlib, and everything else is written as an SVG text element.
+
+        :param label:
+            The arguments of :meth:`matplotlib.axes.Axes.annotate`, with the
+            offset of the text in points.
+
+        """
+        text = str(label["text"])
+        if not text:
+            return
+
+        x, y = self._point(*label["xy"])
+        dx, dy = label.get("xytext", (0.0, 0.0))
+        x, y = x + dx, y - dy
+
+        size = label.get("size", label.get("fontsize"))
+        if size is None:
+            size = self.rc_params["font.size"]
+        elif isinstance(size, str):
+            from matplotlib.font_manager import FontProperties
+
+            size = FontProperties(size=size).get_size_in_points()
+
+        ha = label.get("ha", label.get("horizontalalignment", "left"))
+        va = label.get("va", label.get("verticalalignment", "baseline"))
+        weight = label.get("fontweight", label.get("weight", "normal"))
+        style = label.get("fontstyle", label.get("style", "normal"))
+        color = label.get(
+            "color", label.get("c", self.rc_params["text.color"])
+        )
+        fill = _get_paint("fill", color, label.get("alpha"))
+
+        if _is_math_text(text):
+            self._add_math_text(text, x, y, size, ha, va, weight, style, fill)
+            return
+
+        attributes = [
+            f'x="{_fmt(x)}" y="{_fmt(y)}"',
+            f'font-size="{_fmt(size)}"',
+            f'text-anchor="{_ANCHORS.get(ha, "start")}"',
+            f'dominant-baseline="{_BASELINES.get(va, "alphabetic")}"',
+            fill,
+        ]
+        if weight != "normal":
+            attributes.append(f"font-weight={quoteattr(str(weight))}")
+        if style != "normal":
+            attributes.append(f"font-style={quoteattr(str(style))}")
+        self._elements.append(
+            f'<text {" ".join(attributes)}>{escape(text)}</text>'
+        )
+
+    def _add_math_text(self, text, x, y, size, ha, va, weight, style, fill):
+        """
+        Draw mathtext as a path from the label cache, which is defined once
+        per document.
+
+        """
+        from matplotlib.font_manager import FontProperties
+
+        prop = FontProperties(weight=weight, style=style)
+        layout = label_cache.get(text, size, prop)
+        key = ("text", text, size, weight, style, fill)
+        element = None
+        if key not in self._defs:
+            if layout.svg is None:
+                layout.svg = _get_path_data(layout.path)
+            element = f'<path id="{{id}}" d="{layout.svg}" {fill}/>'
+
+        # Align the extents of the path, in which the y-axis points up.
+        x0, y0, x1, y1 = layout.extents
+        x -= {"left": x0, "right": x1}.get(ha, 0.5 * (x0 + x1))
+        y += {"baseline": 0.0, "bottom": y0, "top": y1}.get(
+            va, 0.5 * (y0 + y1)
+        )
+        self._use(key, element, x, y)
+
+    def to_string(self):
+        """Get the SVG document."""
+        width, height = _fmt(self.width), _fmt(self.height)
+        return "\n".join(
+            [
+                '<?xml version="1.0" encoding="utf-8"?>',
+                '<svg xmlns="http://www.w3.org/2000/svg" '
+                'xmlns:xlink="http://www.w3.org/1999/xlink" version="1.1" '
+                f'width="{width}pt" height="{height}pt" '
+                f'viewBox="0 0 {width} {height}" '
+                f"font-family={quoteattr(_get_font_family(self.rc_params))}>",
+                "<defs>",
+                *self._def_elements,
+                "</defs>",
+                *self._elements,
+                "</svg>",
+                "",
+            ]
+        )
@@ -0,0 +1,51 @@
+"""The annotations that draw the labels of a rendered model."""
+
+__all__: list[str] = []
+
+from matplotlib import text
+
+from ._labels import label_cache
+
+
+class _CachedRenderer:
+    """
+    Wrap a renderer so that the extents of text are taken from the label
+    cache, which keeps them between figures, renders and saves. Everything
+    else is left to the wrapped renderer.
+
+    :param renderer:
+        The renderer to wrap.
+
+    """
+
+    def __init__(self, renderer):
+        self._renderer = renderer
+
+    @classmethod
+    def wrap(cls, renderer):
+        """Wrap a renderer, unless it is ``None`` or already wrapped."""
+        if renderer is None or isinstance(renderer, cls):
+            return renderer
+        return cls(renderer)
+
+    def __getattr__(self, name):
+        return getattr(self._renderer, name)
+
+    def get_text_width_height_descent(self, s, prop, ismath):
+        return label_cache.get_metrics(
+            s, prop, ismath, self._renderer.get_text_width_height_descent
+        )
+
+
+class Annotation(text.Annotation):
+    """
+    An annotation that lays out its text with the extents from the label
+    cache, both when it is drawn and when it is measured.
+
+    """
+
+    def draw(self, renderer):
+        super().draw(_CachedRenderer.wrap(renderer))
+
+    def get_window_extent(self, renderer=None):
+        return super().get_window_extent(_CachedRenderer.wrap(renderer))
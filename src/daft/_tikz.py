@@ -0,0 +1,359 @@
+"""A writer for TikZ pictures that does not go through a matplotlib figure."""
+
+__all__: list[str] = []
+
+from math import hypot
+
+from ._colors import _get_patch_style, _to_rgba
+
+# The TikZ names of the line styles of matplotlib.
+_LINESTYLES = {
+    "--": "dashed",
+    "dashed": "dashed",
+    "-.": "dash dot",
+    "dashdot": "dash dot",
+    ":": "dotted",
+    "dotted": "dotted",
+}
+
+# The TikZ anchors of the alignments of matplotlib.
+_VERTICAL_ANCHORS = {
+    "top": "north",
+    "bottom": "south",
+    "baseline": "base",
+    "center_baseline": "mid",
+}
+_HORIZONTAL_ANCHORS = {"left": "west", "right": "east"}
+
+# The relative font sizes of matplotlib.
+_FONT_SCALINGS = {
+    "xx-small": 0.579,
+    "x-small": 0.694,
+    "small": 0.833,
+    "medium": 1.0,
+    "large": 1.2,
+    "x-large": 1.44,
+    "xx-large": 1.728,
+    "larger": 1.2,
+    "smaller": 0.833,
+}
+
+
+def _fmt(value):
+    """Format a number for a TikZ coordinate or length."""
+    text = f"{value:.3f}".rstrip("0").rstrip(".")
+    return "0" if text == "-0" else text
+
+
+def _get_anchor(ha, va):
+    """Get the anchor of a label node with the given alignment."""
+    anchor = " ".join(
+        anchor
+        for anchor in (
+            _VERTICAL_ANCHORS.get(va, ""),
+            _HORIZONTAL_ANCHORS.get(ha, ""),
+        )
+        if anchor
+    )
+    return anchor or "center"
+
+
+class _TikZWriter:
+    """
+    Collect the commands of a TikZ picture that draws a model. The styles
+    of the nodes are only defined once, and lengths are in centimeters
+    like the plot coordinates of the model.
+
+    :param ctx:
+        The :class:`_rendering_context` object.
+
+    """
+
+    def __init__(self, ctx):
+        self.line_width = ctx.line_width
+        self.font_size = ctx.rc_params["font.size"]
+        self._colors = {}
+        self._styles = {}
+        self._commands = []
+
+    def _get_color(self, name, color, alpha=None):
+        """
+        Get the options that set the color ``name`` (``draw`` or ``fill``),
+        defining the color the first time that it is used.
+
+        """
+        rgba = _to_rgba(color, alpha)
+        if rgba[3] == 0:
+            return []
+
+        rgb = rgba[:3]
+        if rgb == (0.0, 0.0, 0.0):
+            options = [f"{name}=black"]
+        elif rgb == (1.0, 1.0, 1.0):
+            options = [f"{name}=white"]
+        else:
+            if rgb not in self._colors:
+                self._colors[rgb] = f"daftcolor{len(self._colors)}"
+            options = [f"{name}={self._colors[rgb]}"]
+
+        if rgba[3] < 1:
+            options.append(f"{name} opacity={_fmt(rgba[3])}")
+        return options
+
+    def _get_stroke(self, color, linewidth, linestyle, alpha=None):
+        """Get the options of an outline or a line."""
+        options = self._get_color("draw", color, alpha)
+        if not options or not linewidth:
+            return []
+
+        if linewidth != self.line_width:
+            options.append(f"line width={_fmt(linewidth)}pt")
+        if linestyle in _LINESTYLES:
+            options.append(_LINESTYLES[linestyle])
+        return options
+
+    def add_node(self, name, shape, center, outlines, label):
+        """
+        Draw a node and its label.
+
+        :param name:
+            The TikZ name of the node.
+
+        :param shape:
+            ``"ellipse"`` or ``"rectangle"``.
+
+        :param center:
+            The center of the node in plot coordinates.
+
+        :param outlines:
+            The ``(width, height, plot_params)`` of the outlines of the
+            node, as returned by ``Node._get_outlines``. The last one is the
+            node itself and the others are drawn behind it.
+
+        :param label:
+            The arguments of the annotation with the label of the node.
+
+        """
+        x, y = center
+        for i, (width, height, params) in enumerate(outlines):
+            facecolor, edgecolor, linewidth, linestyle = _get_patch_style(
+                params
+            )
+            options = [shape]
+            options += self._get_color("fill", facecolor)
+            options += self._get_stroke(edgecolor, linewidth, linestyle)
+            options += [
+                f"minimum width={_fmt(width)}cm",
+                f"minimum height={_fmt(height)}cm",
+            ]
+
+            style = ", ".join(options)
+            if style not in self._styles:
+                self._styles[style] = f"daft{len(self._styles)}"
+
+            named = f" ({name})" if i == len(outlines) - 1 else ""
+            self._commands.append(
+                rf"\node[{self._styles[style]}]{named} at "
+                f"({_fmt(x)}, {_fmt(y)}) {{}};"
+            )
+
+        self.add_label(label, f"({name})")
+
+    def add_edge(self, names, coords, plot_params, directed):
+        """
+        Draw an edge between two named nodes, which TikZ cuts at the
+        borders of the nodes.
+
+        :param names:
+            The TikZ names of the nodes.
+
+        :param coords:
+            The ``x``, ``y``, ``dx`` and ``dy`` of the edge.
+
+        :param plot_params:
+            The resolved plotting parameters of the edge.
+
+        :param directed:
+            Should the edge end in an arrowhead?
+
+        """
+        if directed:
+            if coords[2] == 0.0 and coords[3] == 0.0:
+                return
+
+            options = self._get_stroke(
+                plot_params["ec"],
+                plot_params["linewidth"],
+                plot_params["linestyle"],
+                plot_params.get("alpha"),
+            )
+            if not options:
+                # TikZ only draws the arrowheads of stroked paths, so the
+                # head of an arrow without a line is filled on its own.
+                self._add_arrowhead(coords, plot_params)
+                return
+
+            # The arrowhead is filled with the color of the line by default.
+            head = [
+                f"length={_fmt(plot_params['head_length'])}cm",
+                f"width={_fmt(plot_params['head_width'])}cm",
+            ]
+            fill = self._get_color(
+                "fill", plot_params["fc"], plot_params.get("alpha")
+            )
+            if fill[:1] != [
+                option.replace("draw", "fill") for option in options[:1]
+            ]:
+                head.append(fill[0] if fill else "open")
+            options.insert(0, f"-{{Triangle[{', '.join(head)}]}}")
+        else:
+            options = self._get_stroke(
+                plot_params["color"],
+                plot_params["linewidth"],
+                plot_params["linestyle"],
+                plot_params.get("alpha"),
+            )
+            if not options:
+                # The line is transparent or has no width.
+                return
+
+        # TikZ draws in black by default.
+        options = [option for option in options if option != "draw=black"]
+        options = f"[{', '.join(options)}]" if options else ""
+        self._commands.append(rf"\draw{options} ({names[0]}) -- ({names[1]});")
+
+    def _add_arrowhead(self, coords, plot_params):
+        """
+        Fill the head of an arrow, as matplotlib draws it, unless its fill
+        is transparent.
+
+        :param coords:
+            The ``x``, ``y``, ``dx`` and ``dy`` of the edge.
+
+        :param plot_params:
+            The resolved plotting parameters of the edge.
+
+        """
+        options = self._get_color(
+            "fill", plot_params["fc"], plot_params.get("alpha")
+        )
+        if not options:
+            return
+
+        x, y, dx, dy = coords
+        length = hypot(dx, dy)
+        ux, uy = dx / length, dy / length
+        tip = (x + dx, y + dy)
+        base = (
+            tip[0] - plot_params["head_length"] * ux,
+            tip[1] - plot_params["head_length"] * uy,
+        )
+        half_width = 0.5 * plot_params["head_width"]
+        points = [
+            tip,
+            (base[0] - half_width * uy, base[1] + half_width * ux),
+            (base[0] + half_width * uy, base[1] - half_width * ux),
+        ]
+        path = " -- ".join(f"({_fmt(px)}, {_fmt(py)})" for px, py in points)
+        self._commands.append(rf"\fill[{', '.join(options)}] {path} -- cycle;")
+
+    def add_plate(self, rect, params):
+        """
+        Draw the rectangle of a plate, unless it is empty.
+
+        :param rect:
+            The ``x``, ``y``, ``width`` and ``height`` of the rectangle in
+            plot coordinates.
+
+        :param params:
+            The resolved parameters of the rectangle, as returned by
+            ``Plate._get_rect_params``.
+
+        """
+        x, y, width, height = rect
+        if width == 0.0 or height == 0.0:
+            return
+
+        facecolor, edgecolor, linewidth, linestyle = _get_patch_style(params)
+        options = self._get_color("fill", facecolor)
+        options += self._get_stroke(edgecolor, linewidth, linestyle)
+        self._commands.append(
+            rf"\path[{', '.join(options)}] ({_fmt(x)}, {_fmt(y)}) "
+            f"rectangle ({_fmt(x + width)}, {_fmt(y + height)});"
+        )
+
+    def add_label(self, label, position=None):
+        """
+        Draw the text of an annotation as a TikZ node. The text is written
+        as it is, so it should be valid LaTeX.
+
+        :param label:
+            The arguments of :meth:`matplotlib.axes.Axes.annotate`, with the
+            offset of the text in points.
+
+        :param position: (optional)
+            The TikZ position of the annotated point, e.g. a node name.
+            By default the ``xy`` of the annotation.
+
+        """
+        if label is None or not str(label["text"]):
+            return
+
+        if position is None:
+            x, y = label["xy"]
+            position = f"({_fmt(x)}, {_fmt(y)})"
+
+        options = ["inner sep=0pt"]
+        ha = label.get("ha", label.get("horizontalalignment", "left"))
+        va = label.get("va", label.get("verticalalignment", "baseline"))
+        anchor = _get_anchor(ha, va)
+        if anchor != "center":
+            options.append(f"anchor={anchor}")
+
+        dx, dy = label.get("xytext", (0.0, 0.0))
+        if dx:
+            options.append(f"xshift={_fmt(dx)}pt")
+        if dy:
+            options.append(f"yshift={_fmt(dy)}pt")
+
+        size = label.get("size", label.get("fontsize"))
+        if size is not None and size != self.font_size:
+            if size in _FONT_SCALINGS:
+                size = _FONT_SCALINGS[size] * self.font_size
+            else:
+                size = float(size)
+            options.append(
+                rf"font=\fontsize{{{_fmt(size)}}}{{{_fmt(1.2 * size)}}}"
+                r"\selectfont"
+            )
+
+        color = label.get("color", label.get("c"))
+        if color is not None:
+            options += self._get_color("text", color, label.get("alpha"))
+
+        self._commands.append(
+            rf"\node[{', '.join(options)}] at {position} {{{label['text']}}};"
+        )
+
+    def to_string(self):
+        """Get the TikZ picture."""
+        colors = [
+            rf"\definecolor{{{name}}}{{rgb}}{{{', '.join(map(_fmt, rgb))}}}"
+            for rgb, name in self._colors.items()
+        ]
+        styles = [
+            f"  {name}/.style={{{style}, inner sep=0pt, outer sep=0pt}},"
+            for style, name in self._styles.items()
+        ]
+        return "\n".join(
+            [
+                *colors,
+                r"\begin{tikzpicture}[",
+                f"  line width={_fmt(self.line_width)}pt,",
+                *styles,
+                "]",
+                *self._commands,
+                r"\end{tikzpicture}",
+                "",
+            ]
+        )
@@ -2,9 +2,46 @@
 
 __all__: list[str] = []
 
-import matplotlib.pyplot as plt
+# pylint: disable=import-outside-toplevel
+
+import gc
+import sys
+import threading
+from contextlib import contextmanager
+
 import numpy as np
 
+# The defaults of the ``rcParams`` that daft reads when it draws a model
+# without a figure, which are used until matplotlib is imported.
+_DEFAULT_RC_PARAMS = {
+    "font.size": 10.0,
+    "font.family": ["sans-serif"],
+    "font.sans-serif": [
+        "DejaVu Sans",
+        "Bitstream Vera Sans",
+        "Computer Modern Sans Serif",
+        "Lucida Grande",
+        "Verdana",
+        "Geneva",
+        "Lucid",
+        "Arial",
+        "Helvetica",
+        "Avant Garde",
+        "sans-serif",
+    ],
+    "text.color": "black",
+    "lines.dashed_pattern": [3.7, 1.6],
+    "lines.dashdot_pattern": [6.4, 1.6, 1.0, 1.6],
+    "lines.dotted_pattern": [1.0, 1.65],
+    "lines.scale_dashes": True,
+    "lines.solid_capstyle": "projecting",
+    "lines.dash_capstyle": "butt",
+}
+
+# Matplotlib shares its fonts and its mathtext parser between all figures,
+# and they are not thread-safe, so figures are drawn one at a time.
+_draw_lock = threading.RLock()
+
 
 class _rendering_context:
     """
@@ -54,6 +91,15 @@ class _rendering_context:
     :param dpi: (optional)
         The DPI value to use for rendering.
 
+    :param pyplot: (optional)
+        Create the figure with :func:`matplotlib.pyplot.figure`, or else as
+        a plain figure with an Agg canvas and with a snapshot of the
+        ``rcParams``.
+
+    :param pool: (optional)
+        A :class:`FigurePool` to take the figure from when ``pyplot`` is
+        ``False``.
+
     """
 
     def __init__(self, **kwargs):
@@ -96,10 +142,36 @@ class _rendering_context:
 
         self.dpi = kwargs.get("dpi", None)
 
+        self.pyplot = kwargs.get("pyplot", True)
+        self._pool = kwargs.get("pool", None)
+        if self.pyplot:
+            if self._pool is not None:
+                raise ValueError(
+                    "A figure pool can only be used without pyplot."
+                )
+            self._rc_params = None
+        else:
+            import matplotlib as mpl
+
+            self._rc_params = mpl.rcParams.copy()
+
+        # The :class:`RenderStats` of a profiled render in progress.
+        self._stats = None
+
         # Initialize the figure to ``None`` to handle caching later.
         self._figure = None
         self._ax = None
 
+    def __getstate__(self):
+        # Figures are not copied along with the context.
+        state = self.__dict__.copy()
+        state["_figure"] = None
+        state["_ax"] = None
+        # Nor is the pool, which belongs to this process.
+        state["_pool"] = None
+        state["_stats"] = None
+        return state
+
     def reset_shape(self, shape, adj_origin=False):
         """Reset the shape and figure size."""
         # shape is scaled by grid_unit
@@ -116,6 +188,25 @@ class _rendering_context:
             self.shape -= self.origin
             self.figsize = self.grid_unit * self.shape / self.shp_fig_scale
 
+    @property
+    def rc_params(self):
+        """
+        The ``rcParams`` that daft reads while it draws: the snapshot if
+        there is one, or else the global ``rcParams`` of matplotlib. Models
+        that are drawn without a figure before matplotlib is imported use
+        the defaults of matplotlib, since a ``matplotlibrc`` file is only
+        read when it is imported.
+
+        """
+        if self._rc_params is not None:
+            return self._rc_params
+        if "matplotlib" not in sys.modules:
+            return _DEFAULT_RC_PARAMS
+
+        import matplotlib as mpl
+
+        return mpl.rcParams
+
     def reset_figure(self):
         """Reset the figure."""
         self.close()
@@ -123,7 +214,12 @@ class _rendering_context:
     def close(self):
         """Close the figure if it is set up."""
         if self._figure is not None:
-            plt.close(self._figure)
+            if self._pool is not None:
+                self._pool.release(self._figure)
+            elif self.pyplot:
+                import matplotlib.pyplot as plt
+
+                plt.close(self._figure)
             self._figure = None
             self._ax = None
 
@@ -131,10 +227,25 @@ class _rendering_context:
         """Return the current figure else create a new one."""
         if self._figure is not None:
             return self._figure
+
         args = {"figsize": self.figsize}
         if self.dpi is not None:
             args["dpi"] = self.dpi
-        self._figure = plt.figure(**args)
+
+        if self.pyplot:
+            import matplotlib.pyplot as plt
+
+            self._figure = plt.figure(**args)
+        elif self._pool is not None:
+            self._figure = self._pool.acquire(**args)
+        else:
+            # The figure is not registered with pyplot, so it is freed once
+            # it is no longer used.
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+
+            self._figure = Figure(**args)
+            FigureCanvasAgg(self._figure)
         return self._figure
 
     def ax(self):
@@ -142,10 +253,15 @@ class _rendering_context:
         if self._ax is not None:
             return self._ax
 
-        # Add a new axis object if it doesn't exist.
-        self._ax = self.figure().add_axes(
-            (0, 0, 1, 1), frameon=False, xticks=[], yticks=[]
-        )
+        # Add a new axis object if it doesn't exist. A figure from a pool
+        # can still have the empty axes of the last model.
+        figure = self.figure()
+        if figure.axes:
+            self._ax = figure.axes[0]
+        else:
+            self._ax = figure.add_axes(
+                (0, 0, 1, 1), frameon=False, xticks=[], yticks=[]
+            )
 
         # Set the bounds.
         l0 = self.convert(*self.origin)
@@ -164,9 +280,27 @@ class _rendering_context:
             raise ValueError(
                 "You must provide two coordinates to `convert()`."
             )
+        if self._stats is not None:
+            self._stats.counters["convert"] += 1
         return self.grid_unit * (np.atleast_1d(xy) - self.origin)
 
 
+@contextmanager
+def _paused_gc():
+    """
+    Pause the garbage collector while many objects are made at once, which
+    would otherwise set off collections that scan all of them.
+
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
 def _pop_multiple(_dict, default, *args):
     """
     A helper function for dealing with the way that matplotlib annoyingly
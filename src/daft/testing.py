@@ -0,0 +1,421 @@
+"""
+Build large models of a given size, for benchmarks and stress tests. The
+models only depend on their arguments, so the same call builds the same
+model on any machine with the same version of NumPy.
+
+Compare the scenes of :func:`PGM.to_scene` in tests, which is much faster
+than comparing images and does not depend on the installed fonts.
+
+"""
+
+__all__ = [
+    "grid_positions",
+    "hmm",
+    "hierarchical",
+    "factor_graph",
+    "random_dag",
+    "observed_and_fixed",
+    "assert_scenes_equal",
+    "assert_scene_matches",
+]
+
+import json
+import math
+import os
+
+import numpy as np
+
+from ._core import PGM
+
+
+def grid_positions(n):
+    """
+    Lay out ``n`` nodes on a square grid, row by row.
+
+    :param n:
+        The number of nodes.
+
+    :returns:
+        The ``width`` of the grid, and the ``x`` and ``y`` arrays of the
+        positions of the nodes.
+
+    """
+    width = max(1, math.ceil(math.sqrt(n)))
+    index = np.arange(n)
+    return width, index % width, index // width
+
+
+def hmm(n, **kwargs):
+    """
+    An unrolled hidden Markov model: a chain of hidden states, each with an
+    observed emission below it. The time steps wrap around into rows, so
+    that large models stay roughly square.
+
+    :param n:
+        The number of nodes; rounded down to an even number, with at least
+        one time step.
+
+    :param **kwargs:
+        Passed on to :class:`PGM`.
+
+    :returns:
+        The :class:`PGM`.
+
+    """
+    steps = max(1, n // 2)
+    width = max(1, math.ceil(math.sqrt(2 * steps)))
+    t = np.arange(steps)
+    x, y = t % width, -3 * (t // width)
+
+    pgm = PGM(**kwargs)
+    pgm.add_nodes_from(
+        [f"z{i}" for i in t],
+        [rf"$z_{{{i}}}$" for i in t],
+        x,
+        y + 1,
+    )
+    pgm.add_nodes_from(
+        [f"x{i}" for i in t],
+        [rf"$x_{{{i}}}$" for i in t],
+        x,
+        y,
+        observed=True,
+    )
+    pgm.add_edges_from([(f"z{i - 1}", f"z{i}") for i in t[1:]])
+    pgm.add_edges_from([(f"z{i}", f"x{i}") for i in t])
+    return pgm
+
+
+def hierarchical(n, depth=2, **kwargs):
+    """
+    A hierarchical model: a root parameter with ``depth`` levels of groups
+    below it, and observations at the bottom. Each group is drawn in a plate
+    that is nested in the plate of its parent group. The top level groups
+    are stacked vertically.
+
+    :param n:
+        The approximate number of nodes. Every group has the same number of
+        children, so the model has ``1 + b + ... + b**depth`` nodes for the
+        branching factor ``b`` that comes closest to ``n``.
+
+    :param depth: (optional)
+        The number of levels below the root.
+
+    :param **kwargs:
+        Passed on to :class:`PGM`.
+
+    :returns:
+        The :class:`PGM`.
+
+    """
+    if depth < 1:
+        raise ValueError("The depth must be at least 1.")
+    branching = max(1, round(n ** (1 / depth)))
+    pgm = PGM(**kwargs)
+    nodes, edges = [], []
+
+    def add_group(name, level, x, y):
+        # Add the group with its leftmost leaf at ``(x, y)`` and return the
+        # x-coordinate of its node.
+        if level == depth:
+            nodes.append((name, x, y, True))
+            return x
+
+        # The plate is added before the plates inside of it, which are drawn
+        # on top of it. Nested plates are a little smaller.
+        leaves = branching ** (depth - level)
+        pad = 0.45 - 0.1 * (level - 1) / depth
+        pgm.add_plate(
+            [x - pad, y - pad, leaves - 1 + 2 * pad, depth - level + 2 * pad],
+            label=name,
+        )
+
+        children = [f"{name}_{j}" for j in range(branching)]
+        centers = [
+            add_group(child, level + 1, x + j * leaves // branching, y)
+            for j, child in enumerate(children)
+        ]
+        center = (centers[0] + centers[-1]) / 2
+        nodes.append((name, center, y + depth - level, False))
+        edges.extend((name, child) for child in children)
+        return center
+
+    groups = [f"g{j}" for j in range(branching)]
+    for j, group in enumerate(groups):
+        add_group(group, 1, 0, -(depth + 1) * j)
+    nodes.append(
+        ("root", -1.5, (depth - 1 - (depth + 1) * (branching - 1)) / 2, False)
+    )
+    edges.extend(("root", group) for group in groups)
+
+    names, x, y, observed = zip(*nodes)
+    pgm.add_nodes_from(names, names, x, y, scale=0.8, observed=observed)
+    pgm.add_edges_from(edges)
+    return pgm
+
+
+def factor_graph(n, degree=3, seed=0, **kwargs):
+    """
+    A dense factor graph: variables and factors alternate on a square grid,
+    and each factor is connected to ``degree`` variables picked at random.
+
+    :param n:
+        The number of nodes; half of them, rounded up, are variables.
+
+    :param degree: (optional)
+        The number of variables of each factor. At most the number of
+        variables.
+
+    :param seed: (optional)
+        The seed of the random connections.
+
+    :param **kwargs:
+        Passed on to :class:`PGM`.
+
+    :returns:
+        The :class:`PGM`.
+
+    """
+    rng = np.random.default_rng(seed)
+    _, x, y = grid_positions(n)
+    is_factor = (x + y) % 2 == 1
+    variables = [f"v{i}" for i in range(np.count_nonzero(~is_factor))]
+    factors = [f"f{i}" for i in range(np.count_nonzero(is_factor))]
+    degree = min(degree, len(variables))
+
+    pgm = PGM(**kwargs)
+    pgm.add_nodes_from(
+        variables,
+        [rf"$v_{{{i}}}$" for i in range(len(variables))],
+        x[~is_factor],
+        y[~is_factor],
+    )
+    pgm.add_nodes_from(
+        factors,
+        "",
+        x[is_factor],
+        y[is_factor],
+        scale=0.3,
+        fixed=True,
+        shape="rectangle",
+    )
+    pgm.add_edges_from(
+        [
+            (factor, variables[i])
+            for factor in factors
+            for i in rng.choice(len(variables), degree, replace=False)
+        ],
+        directed=False,
+    )
+    return pgm
+
+
+def random_dag(n, parents=2.0, seed=0, **kwargs):
+    """
+    A random directed acyclic graph. The nodes are scattered over a square
+    grid with some jitter, and each node takes its parents from the nodes
+    before it.
+
+    :param n:
+        The number of nodes.
+
+    :param parents: (optional)
+        The mean number of parents of a node. The number of parents is
+        Poisson distributed.
+
+    :param seed: (optional)
+        The seed of the coordinates and the edges.
+
+    :param **kwargs:
+        Passed on to :class:`PGM`.
+
+    :returns:
+        The :class:`PGM`.
+
+    """
+    rng = np.random.default_rng(seed)
+    _, x, y = grid_positions(n)
+    order = rng.permutation(n)
+    x = x[order] + rng.uniform(-0.25, 0.25, n)
+    y = y[order] + rng.uniform(-0.25, 0.25, n)
+    names = [f"x{i}" for i in range(n)]
+
+    edges = []
+    for i, k in enumerate(rng.poisson(parents, n)):
+        k = min(k, i)
+        edges.extend(
+            (names[j], names[i]) for j in rng.choice(i, k, replace=False)
+        )
+
+    pgm = PGM(**kwargs)
+    pgm.add_nodes_from(names, [rf"$x_{{{i}}}$" for i in range(n)], x, y)
+    pgm.add_edges_from(edges)
+    return pgm
+
+
+def observed_and_fixed(
+    n, observed=0.3, fixed=0.3, alternate=0.1, seed=0, **kwargs
+):
+    """
+    A grid of nodes with random styles, where each node points to its right
+    and lower neighbours.
+
+    :param n:
+        The number of nodes.
+
+    :param observed: (optional)
+        The fraction of observed nodes.
+
+    :param fixed: (optional)
+        The fraction of fixed nodes.
+
+    :param alternate: (optional)
+        The fraction of nodes in the alternate style. The other nodes are
+        plain.
+
+    :param seed: (optional)
+        The seed of the styles.
+
+    :param **kwargs:
+        Passed on to :class:`PGM`.
+
+    :returns:
+        The :class:`PGM`.
+
+    """
+    rng = np.random.default_rng(seed)
+    width, x, y = grid_positions(n)
+    style = rng.choice(
+        4, n, p=[1 - observed - fixed - alternate, observed, fixed, alternate]
+    )
+    names = [f"x{i}" for i in range(n)]
+
+    pgm = PGM(**kwargs)
+    pgm.add_nodes_from(
+        names,
+        [rf"$x_{{{i}}}$" for i in range(n)],
+        x,
+        -y,
+        observed=style == 1,
+        fixed=style == 2,
+        alternate=style == 3,
+    )
+    edges = [
+        (names[i], names[i + 1]) for i in range(n - 1) if x[i] < width - 1
+    ]
+    edges += [(names[i], names[i + width]) for i in range(n - width)]
+    pgm.add_edges_from(edges)
+    return pgm
+
+
+def _compare(actual, expected, where, atol, rtol):
+    """Raise an :class:`AssertionError` at the first difference."""
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict) or actual.keys() != expected.keys():
+            raise AssertionError(
+                f"{where} is {actual!r}, but a dictionary with the keys "
+                f"{sorted(expected)} was expected."
+            )
+        for key, value in expected.items():
+            _compare(actual[key], value, f"{where}[{key!r}]", atol, rtol)
+    elif isinstance(expected, (list, tuple)):
+        if not isinstance(actual, (list, tuple)):
+            raise AssertionError(
+                f"{where} is {actual!r}, but a list was expected."
+            )
+        if len(actual) != len(expected):
+            raise AssertionError(
+                f"{where} has {len(actual)} items, but {len(expected)} were "
+                "expected."
+            )
+        for i, (a, e) in enumerate(zip(actual, expected)):
+            _compare(a, e, f"{where}[{i}]", atol, rtol)
+    elif _is_number(expected) and _is_number(actual):
+        if not abs(actual - expected) <= atol + rtol * abs(expected):
+            raise AssertionError(
+                f"{where} is {actual!r}, but {expected!r} was expected "
+                f"(atol={atol}, rtol={rtol})."
+            )
+    elif actual != expected or type(actual) is not type(expected):
+        raise AssertionError(
+            f"{where} is {actual!r}, but {expected!r} was expected."
+        )
+
+
+def _is_number(value):
+    """Is ``value`` a number, and not a boolean?"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def assert_scenes_equal(actual, expected, atol=1e-6, rtol=1e-6):
+    """
+    Compare two scenes of :func:`PGM.to_scene`, or scenes loaded from JSON.
+    Numbers are compared with a tolerance and everything else exactly.
+    Raises an :class:`AssertionError` that names the first difference,
+    e.g. ``scene['primitives'][3]['vertices'][0][1]``.
+
+    :param actual:
+        The scene to check.
+
+    :param expected:
+        The expected scene.
+
+    :param atol: (optional)
+        The absolute tolerance of numbers, in plot coordinates or points.
+
+    :param rtol: (optional)
+        The tolerance of numbers relative to the expected value.
+
+    """
+    _compare(actual, expected, "scene", atol, rtol)
+
+
+def _dump_scene(scene):
+    """Get the JSON of a scene, with one primitive per line."""
+    primitives = ",\n  ".join(
+        json.dumps(primitive, sort_keys=True)
+        for primitive in scene["primitives"]
+    )
+    text = json.dumps(
+        {k: v for k, v in scene.items() if k != "primitives"}, sort_keys=True
+    )
+    return f'{text[:-1]}, "primitives": [\n  {primitives}\n]}}\n'
+
+
+def assert_scene_matches(pgm, path, atol=1e-6, rtol=1e-6):
+    """
+    Compare the scene of a model with a snapshot saved as JSON, as with
+    :func:`assert_scenes_equal`. If the snapshot does not exist yet, the
+    scene is saved to it and an :class:`AssertionError` is raised, so that
+    new snapshots are checked before they are relied on. Set the
+    ``DAFT_UPDATE_SCENES`` environment variable to ``1`` to save every
+    scene as its snapshot instead of comparing it.
+
+    :param pgm:
+        The :class:`PGM`, which is rendered first if it has no figure yet.
+
+    :param path:
+        The path of the snapshot.
+
+    :param atol: (optional)
+        The absolute tolerance of numbers, in plot coordinates or points.
+
+    :param rtol: (optional)
+        The tolerance of numbers relative to the expected value.
+
+    """
+    scene = pgm.to_scene()
+    update = os.environ.get("DAFT_UPDATE_SCENES", "") not in ("", "0")
+    if update or not os.path.exists(path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(_dump_scene(scene))
+        if not update:
+            raise AssertionError(
+                f"The snapshot {os.fspath(path)} did not exist; the scene "
+                "was saved to it."
+            )
+        return
+
+    with open(path, encoding="utf-8") as f:
+        expected = json.load(f)
+    assert_scenes_equal(scene, expected, atol=atol, rtol=rtol)
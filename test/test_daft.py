@@ -1,4 +1,16 @@
+import io
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
 import daft
+import daft._cli
+import daft.testing
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
 import pytest
 
 
@@ -18,6 +30,99 @@ def test_manual_size():
         pgm.render()
 
 
+def test_auto_size_is_stable():
+    with daft.PGM() as pgm:
+        pgm.add_node("node1", x=0.0, y=0.0, fixed=True)
+        pgm.add_node("node2", x=1.0, y=2.0, observed=True)
+        pgm.add_plate([0.5, -0.5, 1, 1], shift=-0.1)
+        pgm.render()
+        shape, origin = pgm._ctx.shape, pgm._ctx.origin
+        pgm.render()
+        assert pgm._ctx.shape == pytest.approx(shape)
+        assert pgm._ctx.origin == pytest.approx(origin)
+        assert pgm._nodes["node1"].offset == [0.0, 0.0]
+
+
+def test_render_nodes_batched():
+    with daft.PGM() as pgm:
+        pgm.add_node("node1", x=0.0, y=0.0, observed=True)
+        pgm.add_node("node2", x=1.0, y=0.0, plot_params={"ec": "r"})
+        pgm.add_node("node3", x=2.0, y=0.0, plot_params={"hatch": "//"})
+        pgm.add_node("node4", x=3.0, y=0.0, shape="rectangle")
+        pgm.add_node("node5", x=4.0, y=0.0)
+        pgm.add_node("node6", x=5.0, y=0.0, plot_params={"zorder": 3})
+        ax = pgm.render()
+        assert len(ax.collections) == 2
+        assert len(ax.collections[0].get_paths()) == 3
+        assert len(ax.collections[1].get_paths()) == 2
+        assert len(ax.patches) == 2
+        assert len(ax.texts) == 6
+
+
+def test_render_edges_batched():
+    with daft.PGM() as pgm:
+        for i in range(4):
+            pgm.add_node(f"node{i}", x=float(i), y=float(i % 2))
+        pgm.add_edge("node0", "node1")
+        pgm.add_edge("node1", "node2", plot_params={"ec": "r"})
+        pgm.add_edge("node2", "node3", directed=False)
+        pgm.add_edge("node0", "node3", directed=False, label="edge")
+        ax = pgm.render()
+        arrows, lines = ax.collections[:2]
+        assert len(arrows.get_paths()) == 2
+        assert len(lines.get_segments()) == 2
+        assert len(ax.lines) == 0
+        assert len(ax.texts) == 5
+
+
+def test_render_incremental():
+    with daft.PGM(shape=[4, 2], origin=[0, 0]) as pgm:
+        pgm.add_nodes_from(["node1", "node2", "node3"], x=[1, 2, 3], y=1)
+        pgm.add_edge("node1", "node2")
+        pgm.add_edge("node2", "node3", label="edge")
+        pgm.add_plate([0.5, 0.5, 1, 1])
+        ax = pgm.render()
+        collection = ax.collections[1]
+
+        # Moving a node redraws the node and its edges, but not the plate.
+        pgm._nodes["node3"].x = 3.5
+        assert pgm.render(incremental=True) is ax
+        assert ax.collections[1] is collection
+        assert len(collection.get_paths()[2].vertices) == 0
+        assert len(ax.patches) == 3
+        assert len(ax.texts) == 4
+
+        # Nothing changed, so nothing is redrawn.
+        children = ax.get_children()
+        pgm.render(incremental=True)
+        assert ax.get_children() == children
+
+        pgm.remove_edge("node2", "node3")
+        pgm.render(incremental=True)
+        assert len(ax.patches) == 2
+        assert len(ax.texts) == 3
+
+        # A new size needs a new figure.
+        pgm.shape = None
+        assert pgm.render(incremental=True) is not ax
+
+
+def test_arrow_verts():
+    from matplotlib.patches import FancyArrow
+
+    coords = [[0.0, 0.0, 1.0, 2.0], [1.0, -1.0, -3.0, 0.5]]
+    verts = daft._core._get_arrow_verts(coords, 0.1, 0.25)
+    for xy, v in zip(coords, verts):
+        arrow = FancyArrow(
+            *xy,
+            width=0,
+            length_includes_head=True,
+            head_width=0.1,
+            head_length=0.25,
+        )
+        assert v == pytest.approx(arrow.get_xy()[:7])
+
+
 def test_add_node():
     with daft.PGM() as pgm:
         pgm.add_node(node="node1", content="content1")
@@ -32,6 +137,50 @@ def test_add_node_class():
         assert "node2" in pgm._nodes
 
 
+def test_node_views():
+    with daft.PGM() as pgm:
+        node = daft.Node("node1", "content1", 1, 2, observed=True)
+        pgm.add_node(node)
+        pgm.add_node("node2", x=3, y=4, fixed=True, aspect=2.0)
+        assert pgm._nodes["node1"] == node
+        assert pgm._nodes["node1"] != pgm._nodes["node2"]
+        assert list(pgm._nodes) == ["node1", "node2"]
+
+        node.x = 5.0
+        assert pgm._nodes["node1"].x == 5.0
+        assert pgm._nodes["node1"].observed
+        assert pgm._nodes["node2"].fixed
+        assert not pgm._nodes["node2"].observed
+        assert pgm._nodes["node2"].scale == pytest.approx(1 / 6)
+        assert pgm._nodes["node2"].aspect == 2.0
+        assert pgm._nodes["node1"].aspect is None
+
+
+def test_node_styles_shared():
+    with daft.PGM() as pgm:
+        for i in range(10):
+            pgm.add_node(f"node{i}", x=i, plot_params={"ec": "r"})
+        assert len(pgm._nodes._styles) == 1
+
+        # Reading the style neither copies it nor redraws the node.
+        pgm.render()
+        assert {tuple(n.offset) for n in pgm._nodes.values()} == {(0, 0)}
+        assert dict(pgm._nodes["node1"].plot_params) == {"ec": "r"}
+        assert pgm._nodes["node1"].label_params is None
+        assert len(pgm._nodes._styles) == 1
+        assert not pgm._nodes._dirty.any()
+
+        pgm._nodes["node1"].plot_params["fc"] = "b"
+        assert pgm._nodes["node1"].plot_params == {"ec": "r", "fc": "b"}
+        assert pgm._nodes["node2"].plot_params == {"ec": "r"}
+        assert pgm._nodes._dirty.tolist().count(True) == 1
+
+        pgm._nodes["node2"].offset[1] = 5.0
+        assert pgm._nodes["node2"].offset == [0.0, 5.0]
+        assert pgm._nodes["node3"].offset == [0.0, 0.0]
+        assert len(pgm._nodes._styles) == 3
+
+
 def test_overlap_nodes():
     with daft.PGM() as pgm:
         pgm.add_node("node1", x=0, y=0)
@@ -41,6 +190,38 @@ def test_overlap_nodes():
             pgm.render()
 
 
+def test_overlap_nodes_all_reported():
+    with daft.PGM() as pgm:
+        pgm.add_node("node1", x=0, y=0)
+        pgm.add_node("node2", x=0, y=0)
+        pgm.add_node("node3", x=1, y=1, shape="rectangle")
+        pgm.add_node("node4", x=1, y=1)
+        pgm.add_node("node5", x=2, y=1)
+        pgm.add_edge("node1", "node2")
+        pgm.add_edge("node1", "node5")
+        pgm.add_edge("node3", "node4", directed=False)
+        with pytest.raises(daft.SameLocationError) as excinfo:
+            pgm.render()
+        assert excinfo.value.edges == [pgm._edges[0], pgm._edges[2]]
+
+
+def test_frontier_coords():
+    with daft.PGM(aspect=2.0) as pgm:
+        pgm.add_node("node1", x=0, y=0)
+        pgm.add_node("node2", x=2, y=1, shape="rectangle", aspect=1.0)
+        pgm.add_edge("node1", "node2")
+        pgm.add_edge("node2", "node1")
+        coords = daft._core._get_edge_coords(pgm._ctx, pgm._edges)
+        for edge, xy in zip(pgm._edges, coords):
+            x1, y1 = pgm._ctx.convert(edge.node1.x, edge.node1.y)
+            x2, y2 = pgm._ctx.convert(edge.node2.x, edge.node2.y)
+            x3, y3 = edge.node1.get_frontier_coord((x2, y2), pgm._ctx, edge)
+            x4, y4 = edge.node2.get_frontier_coord((x1, y1), pgm._ctx, edge)
+            assert xy == pytest.approx([x3, y3, x4 - x3, y4 - y3])
+        assert coords[0, :2] == pytest.approx([2**-0.5, 0.5 * 2**-0.5])
+        assert coords[1, :2] == pytest.approx([3.5, 1.75])
+
+
 def test_add_edge():
     with daft.PGM() as pgm:
         pgm.add_node("node1")
@@ -52,6 +233,107 @@ def test_add_edge():
         assert edge.node2 == pgm._nodes["node2"]
 
 
+def test_add_nodes_from():
+    with daft.PGM() as pgm:
+        pgm.add_node("node0", x=-1.0)
+        pgm.add_nodes_from(
+            ["node0", "node1", "node2"],
+            [r"$a$", r"$b$", r"$c$"],
+            x=np.arange(3),
+            y=1.0,
+            observed=[False, True, False],
+            fixed=[False, False, True],
+            shape="rectangle",
+        )
+        assert list(pgm._nodes) == ["node0", "node1", "node2"]
+        assert pgm._nodes["node0"].x == 0.0
+        assert pgm._nodes["node1"].content == r"$b$"
+        assert pgm._nodes["node1"].observed
+        assert pgm._nodes["node2"].scale == pytest.approx(1 / 6)
+        assert pgm._nodes["node2"].shape == "rectangle"
+        assert pgm._nodes["node2"].y == 1.0
+
+        with pytest.raises(ValueError):
+            pgm.add_nodes_from(["node3"], observed=True, fixed=True)
+        assert "node3" not in pgm._nodes
+
+        # Scalar content is shared by all of the nodes, as in add_node.
+        pgm.add_nodes_from(["node3", "node4"], 1, x=[3, 4])
+        assert pgm._nodes["node4"].content == 1
+        pgm.add_nodes_from(["node3", "node4"], np.float64(0.5), x=[3, 4])
+        assert pgm._nodes["node3"].content == 0.5
+        pgm.remove_node("node3")
+        pgm.remove_node("node4")
+
+        # Unknown shapes are drawn as ellipses, with one warning per call.
+        with pytest.warns(UserWarning, match="'circle', 'oval'") as record:
+            pgm.add_nodes_from(
+                ["node3", "node4", "node5"],
+                x=[3, 4, 5],
+                shape=["circle", "oval", "circle"],
+            )
+        assert len(record) == 1
+        assert pgm._nodes["node4"].shape == "ellipse"
+        with pytest.warns(UserWarning, match="'circle'"):
+            pgm.add_node("node6", shape="circle")
+
+
+def test_add_edges_from():
+    with daft.PGM() as pgm:
+        pgm.add_nodes_from(["node1", "node2", "node3"], x=[0, 1, 2])
+        edges = pgm.add_edges_from(
+            [("node1", "node2"), ("node2", "node3")], directed=[True, False]
+        )
+        assert pgm._edges == edges
+        assert edges[0].node1 == pgm._nodes["node1"]
+        assert edges[1].node2 == pgm._nodes["node3"]
+        assert edges[0].directed and not edges[1].directed
+
+        with pytest.raises(KeyError):
+            pgm.add_edges_from([("node1", "node4"), ("node1", "node2")])
+        assert len(pgm._edges) == 2
+
+
+def test_adjacency():
+    with daft.PGM() as pgm:
+        pgm.add_nodes_from(["node1", "node2", "node3"], x=[0, 1, 2])
+        edge1 = pgm.add_edge("node1", "node2")
+        edge2 = pgm.add_edge("node3", "node2", directed=False)
+        edge3 = pgm.add_edge("node2", "node3")
+        assert pgm.out_edges("node2") == [edge3]
+        assert pgm.in_edges("node2") == [edge1, edge2]
+        assert pgm.neighbors("node2") == ["node3", "node1"]
+        assert pgm.neighbors("node1") == ["node2"]
+
+        # The edges are a read-only view in the order of addition.
+        assert pgm._edges == [edge1, edge2, edge3]
+        assert pgm._edges[-1] is edge3
+        with pytest.raises(AttributeError):
+            pgm._edges.append(edge1)
+
+        # Undirected edges are removed in either order, directed ones not.
+        pgm.remove_edge("node2", "node3")
+        assert pgm._edges == [edge1]
+        with pytest.raises(KeyError):
+            pgm.remove_edge("node2", "node1")
+
+        pgm.add_edge("node3", "node1")
+        pgm.remove_node("node1")
+        assert "node1" not in pgm._nodes
+        assert len(pgm._nodes) == 2
+        assert pgm._edges == []
+        assert pgm.neighbors("node2") == []
+        with pytest.raises(KeyError):
+            pgm.in_edges("node1")
+
+        # The other nodes keep their rows and a new node gets a new one.
+        pgm.add_node("node1", x=5.0, y=0.0)
+        assert pgm._nodes["node3"].x == 2.0
+        assert pgm._nodes["node1"].x == 5.0
+        pgm.render()
+        assert len(pgm.ax.texts) == 3
+
+
 def test_add_plate():
     with daft.PGM() as pgm:
         pgm.add_plate([0, 0, 1, 1])
@@ -71,3 +353,573 @@ def test_pop_multiple():
     _dict = {"ec": "none", "edgecolor": "none"}
     with pytest.raises(TypeError):
         daft._pop_multiple(_dict, "none", "ec", "edgecolor")
+
+
+def test_to_svg(tmp_path):
+    from xml.etree import ElementTree
+
+    with daft.PGM() as pgm:
+        pgm.add_nodes_from(["node1", "node2", "node3"], x=[0, 1, 2])
+        pgm.add_node("node4", r"$\alpha$", x=3, y=0)
+        pgm.add_edges_from([("node1", "node2"), ("node2", "node3")])
+        pgm.add_edge("node3", "node4", directed=False, label="edge")
+        pgm.add_plate([-0.5, -0.5, 2, 1], label="plate")
+        svg = pgm.to_svg(tmp_path / "model.svg")
+        assert pgm._ctx._figure is None
+        assert (tmp_path / "model.svg").read_text(encoding="utf-8") == svg
+
+    ns = {"svg": "http://www.w3.org/2000/svg"}
+    root = ElementTree.fromstring(svg)
+    defs = root.find("svg:defs", ns)
+
+    # One plate, one arrowhead, one node and one mathtext label.
+    assert len(defs) == 4
+    assert len(defs.findall("svg:path", ns)) == 2
+    assert len(root.findall("svg:use", ns)) == 8
+    assert [t.text for t in root.findall("svg:text", ns)] == ["plate", "edge"]
+
+
+def test_to_tikz():
+    with daft.PGM() as pgm:
+        pgm.add_nodes_from(["node1", "node2"], [r"$\alpha$", "b"], x=[0, 1])
+        pgm.add_node("node3", x=2, y=0, plot_params={"fc": "r"})
+        pgm.add_edge("node1", "node2", label="edge")
+        pgm.add_edge("node2", "node3", directed=False)
+        pgm.add_plate([-0.5, -0.5, 2, 1], label="plate")
+        tikz = pgm.to_tikz()
+        assert pgm._ctx._figure is None
+
+    lines = tikz.splitlines()
+    assert lines[0] == r"\definecolor{daftcolor0}{rgb}{1, 0, 0}"
+    assert len([line for line in lines if "/.style=" in line]) == 2
+    assert r"\node[inner sep=0pt] at (n0) {$\alpha$};" in lines
+    assert r"\draw (n1) -- (n2);" in lines
+    assert any(line.startswith(r"\draw[-{Triangle[") for line in lines)
+    assert any(line.endswith("{plate};") for line in lines)
+    assert any(line.endswith("{edge};") for line in lines)
+
+
+def test_to_tikz_transparent_edges():
+    # Transparent lines are hidden as in render, but arrowheads are filled.
+    with daft.PGM() as pgm:
+        pgm.add_nodes_from(["node1", "node2", "node3"], x=[0, 1, 2])
+        pgm.add_edge("node1", "node2", plot_params={"ec": "none"})
+        pgm.add_edge(
+            "node2", "node3", directed=False, plot_params={"color": "none"}
+        )
+        lines = pgm.to_tikz().splitlines()
+
+    assert not any(line.startswith(r"\draw") for line in lines)
+    head = r"\fill[fill=black] (2.2, 0.7) -- (1.95, 0.75) -- (1.95, 0.65)"
+    assert f"{head} -- cycle;" in lines
+
+
+def test_label_cache():
+    cache = daft.LabelCache(maxsize=2)
+    alpha = cache.get(r"$\alpha$", 10)
+    assert cache.get(r"$\alpha$", 10) is alpha
+    assert cache.get(r"$\alpha$", 12) is not alpha
+    assert cache.cache_info() == (1, 2, 2, 2)
+
+    # The least recently used layout is evicted first.
+    cache.get(r"$\alpha$", 10)
+    cache.get(r"$\beta$", 10)
+    assert cache.get(r"$\alpha$", 10) is alpha
+    assert cache.cache_info().currsize == 2
+
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, 2, 0)
+
+
+def test_to_svg_label_cache():
+    daft.label_cache.cache_clear()
+    with daft.PGM() as pgm:
+        pgm.add_nodes_from(["node1", "node2"], r"$\alpha$", x=[0, 1])
+        pgm.to_svg()
+        pgm.to_svg()
+    assert daft.label_cache.cache_info()[:2] == (3, 1)
+
+
+def test_savefig_label_cache():
+    daft.label_cache.cache_clear()
+    infos = []
+    for _ in range(2):
+        with daft.PGM() as pgm:
+            pgm.add_nodes_from(["node1", "node2"], r"$\alpha$", x=[0, 1])
+            pgm.to_bytes(bbox_inches="tight")
+        infos.append(daft.label_cache.cache_info())
+
+    # The second model measures its labels from the cache.
+    assert infos[0].misses == infos[1].misses == 1
+    assert infos[1].hits > infos[0].hits
+
+
+@pytest.mark.parametrize("fmt", ["png", "pdf", "svg"])
+def test_draw_label_cache(fmt):
+    daft.label_cache.cache_clear()
+    infos = []
+    for _ in range(2):
+        with daft.PGM() as pgm:
+            pgm.add_nodes_from(["node1", "node2"], r"$\alpha$", x=[0, 1])
+            pgm.add_edge("node1", "node2", label="edge")
+            pgm.to_bytes(format=fmt, bbox_inches=None)
+        infos.append(daft.label_cache.cache_info())
+
+    # The labels are laid out from the cache when they are drawn.
+    assert infos[0].misses == infos[1].misses == 2
+    assert infos[1].hits > infos[0].hits
+
+
+def _build_model():
+    pgm = daft.PGM()
+    pgm.add_node("node1", r"$x$", x=0.0, y=0.0)
+    pgm.add_node("node2", "y", x=1.0, y=0.0)
+    pgm.add_edge("node1", "node2")
+    return pgm
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_render_many(tmp_path, workers):
+    broken = _build_model()
+    broken.add_node("node3", x=0.0, y=0.0)
+    broken.add_edge("node1", "node3")
+
+    outputs = [tmp_path / name for name in ("a.png", "b.png", "c.svg")]
+    results = daft.render_many(
+        [_build_model, broken, _build_model()], outputs, workers=workers
+    )
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], daft.RenderError)
+    assert "SameLocationError" in results[1].traceback
+    assert outputs[0].exists() and not outputs[1].exists()
+    assert outputs[2].read_text().startswith("<?xml")
+
+
+def test_content_hash():
+    pgm = _build_model()
+    assert pgm.content_hash() == _build_model().content_hash()
+
+    pgm.render()
+    assert pgm.content_hash() == _build_model().content_hash()
+
+    pgm._nodes["node1"].x = 0.5
+    assert pgm.content_hash() != _build_model().content_hash()
+
+    with mpl.rc_context({"font.size": 20}):
+        assert _build_model().content_hash() != pgm.content_hash()
+
+    # Matplotlib draws with the global rcParams, not with the snapshot.
+    pgm = daft.PGM(pyplot=False)
+    pgm.add_node("node1", r"$x$", x=0.0, y=0.0)
+    content_hash = pgm.content_hash()
+    with mpl.rc_context({"mathtext.fontset": "stix"}):
+        assert pgm.content_hash() != content_hash
+    assert pgm.content_hash() == content_hash
+
+
+def test_savefig_cache(tmp_path):
+    cache = daft.RenderCache(tmp_path / "cache")
+    _build_model().savefig(tmp_path / "a.png", cache=cache)
+    pgm = _build_model()
+    pgm.savefig(tmp_path / "b.png", cache=cache)
+    assert pgm._ctx._figure is None
+    assert (tmp_path / "a.png").read_bytes() == (
+        tmp_path / "b.png"
+    ).read_bytes()
+
+    info = cache.cache_info()
+    assert (info.hits, info.misses, info.count) == (1, 1, 1)
+
+    _build_model().savefig(tmp_path / "c.svg", cache=cache)
+    assert cache.cache_info().count == 2
+    cache.maxsize = cache.cache_info().currsize - 1
+    assert cache.cache_info().count == 1
+
+    cache.cache_clear()
+    assert cache.cache_info() == (0, 0, cache.maxsize, 0, 0)
+
+
+def test_import_without_matplotlib():
+    # Building a model and drawing it without a figure must not pay for
+    # importing matplotlib, nor for the process pool of render_many.
+    code = "\n".join(
+        [
+            "import daft",
+            "pgm = daft.PGM()",
+            "pgm.add_node('node1', r'$x$', 0, 0)",
+            "pgm.add_nodes_from(['node2', 'node3'], x=[1, 2])",
+            "pgm.add_edge('node1', 'node2')",
+            "pgm.add_plate([0, 0, 1, 1], label='plate')",
+            "pgm.add_text(0, 0, 'text')",
+            "pgm.__getstate__()",
+            "daft.PGM.loads(daft.PGM.from_dict(pgm.to_dict()).dumps())",
+            # Only mathtext labels need matplotlib to be drawn as SVG, and
+            # TikZ passes them through as LaTeX.
+            "plain = daft.PGM()",
+            "plain.add_node('a', 'a', 0, 0, plot_params={'fc': 'tab:blue'})",
+            "plain.add_node('b', 'b', 1, 0, observed=True)",
+            "plain.add_edge('a', 'b', label='edge')",
+            "plain.add_edge('a', 'b', directed=False, plot_params={'ls': ':'})",
+            "plain.add_plate([0, 0, 1, 1], label='plate')",
+            "plain.to_svg()",
+            "plain.to_tikz()",
+        ]
+    )
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stderr
+    imported = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    assert "daft._core" in imported
+    for heavy in ("matplotlib", "concurrent.futures", "multiprocessing"):
+        assert not [m for m in imported if f"{m}.".startswith(f"{heavy}.")]
+
+
+def _render_png(pyplot):
+    pgm = daft.PGM(pyplot=pyplot)
+    pgm.add_node("node1", r"$x$", x=0.0, y=0.0)
+    pgm.add_node("node2", "y", x=1.0, y=0.0, observed=True)
+    pgm.add_edge("node1", "node2")
+    pgm.add_plate([-0.5, -0.5, 2.0, 1.0], label="plate")
+    pgm.render()
+    output = io.BytesIO()
+    pgm.savefig(output, format="png")
+    return output.getvalue()
+
+
+def test_render_without_pyplot():
+    expected = _render_png(True)
+    plt.close("all")
+
+    with ThreadPoolExecutor(2) as executor:
+        outputs = list(executor.map(_render_png, [False] * 4))
+    assert outputs == [expected] * 4
+    assert plt.get_fignums() == []
+
+    # Daft reads its defaults from the snapshot made with the model.
+    pgm = daft.PGM(pyplot=False)
+    with mpl.rc_context({"font.size": 20}):
+        pgm.add_node("node1", "x", x=0.0, y=0.0)
+        pgm.render()
+    assert pgm.ax.texts[0].get_fontsize() == mpl.rcParams["font.size"]
+
+
+def test_figure_pool():
+    def render(x, pool=None):
+        with daft.PGM(pyplot=pool is None, pool=pool) as pgm:
+            pgm.add_node("node1", r"$x$", x=0.0, y=0.0)
+            pgm.add_node("node2", "y", x=x, y=0.0)
+            pgm.add_edge("node1", "node2")
+            pgm.render()
+            output = io.BytesIO()
+            pgm.savefig(output, format="png")
+            figure = pgm.figure
+            if x == 2.0:
+                # The figure is cleared instead of reusing the axes.
+                pgm.ax.set_title("title")
+        assert pgm._ctx._figure is None
+        return output.getvalue(), figure
+
+    pool = daft.FigurePool(maxsize=1)
+    outputs, figures = zip(*(render(x, pool) for x in (1.0, 2.0, 3.0, 1.0)))
+    assert len(pool) == 1 and len(set(map(id, figures))) == 1
+
+    # A reused figure draws the same as a new one.
+    assert list(outputs) == [render(x)[0] for x in (1.0, 2.0, 3.0, 1.0)]
+
+    pool.clear()
+    assert len(pool) == 0
+    with pytest.raises(ValueError):
+        daft.PGM(pool=pool)
+
+
+def test_to_bytes_and_array():
+    pgm = _build_model()
+    data = pgm.to_bytes()
+    assert data.startswith(b"\x89PNG")
+    output = io.BytesIO()
+    pgm.savefig(output, format="png")
+    assert data == output.getvalue()
+    assert pgm.to_bytes("svg").startswith(b"<?xml")
+
+    pixels = pgm.to_array()
+    width, height = pgm.figure.get_size_inches() * pgm.figure.dpi
+    assert pixels.shape == (round(height), round(width), 4)
+    assert pixels.dtype == np.uint8 and not pixels.flags.owndata
+    assert (pixels[..., 3] == 255).all() and (pixels[..., :3] < 255).any()
+    plt.close("all")
+
+
+def test_savefig_many(tmp_path):
+    pgm = _build_model()
+    pgm.savefig_many(
+        {
+            tmp_path / "thumb.png": {"dpi": 72},
+            tmp_path / "full.png": {"dpi": 300},
+            tmp_path / "model.pdf": None,
+            tmp_path / "model.svg": None,
+        },
+        pad_inches=0.2,
+    )
+    for name, dpi in (("thumb.png", 72), ("full.png", 300)):
+        output = io.BytesIO()
+        pgm.savefig(output, format="png", dpi=dpi, pad_inches=0.2)
+        assert (tmp_path / name).read_bytes() == output.getvalue()
+    assert (tmp_path / "model.pdf").read_bytes().startswith(b"%PDF")
+    assert (tmp_path / "model.svg").read_text().startswith("<?xml")
+    plt.close("all")
+
+
+@pytest.mark.parametrize("dpi", [None, 72, 300])
+def test_savefig_tight_bbox(dpi):
+    pgm = _build_model()
+    pgm.add_plate([-0.5, -0.5, 2.0, 1.0], label="plate")
+    pgm.render()
+
+    # The box is measured without drawing the figure, so it is only drawn
+    # once to write the file.
+    draws = []
+    pgm.figure.canvas.mpl_connect("draw_event", draws.append)
+    output = io.BytesIO()
+    pgm.savefig(output, format="png", dpi=dpi)
+    assert len(draws) == 1
+
+    expected = io.BytesIO()
+    pgm.figure.savefig(expected, format="png", dpi=dpi, bbox_inches="tight")
+    assert output.getvalue() == expected.getvalue()
+    plt.close("all")
+
+
+def test_render_profile():
+    pgm = daft.PGM()
+    pgm.add_node("a", r"$a$", 0, 0)
+    pgm.add_node("b", r"$b$", 1, 0)
+    pgm.add_edge("a", "b", label="e")
+    pgm.add_plate([-0.5, -0.5, 2.0, 1.0], label="plate")
+
+    calls = []
+    pgm.render(profile=calls.append)
+    stats = pgm.last_render_stats
+    assert calls == [stats]
+    assert {"layout", "plates", "edges", "nodes", "labels"} <= set(
+        stats.timings
+    )
+    assert stats.artists["Annotation"] == 4
+    assert stats.counters["convert"] > 0
+    assert stats.counters["frontier_coords"] == 2
+
+    # A render only adds the labels, which are laid out when they are drawn.
+    assert stats.counters["label_cache_hits"] == 0
+    assert stats.counters["label_cache_misses"] == 0
+
+    # Saving the figure adds its time and reports the stats again.
+    daft.label_cache.cache_clear()
+    pgm.savefig(io.BytesIO(), format="png")
+    assert len(calls) == 2
+    assert "time.savefig" in stats.as_dict()
+    assert stats.counters["label_cache_misses"] == 4
+    assert stats.counters["label_cache_hits"] > 0
+
+    pgm.render()
+    assert pgm.last_render_stats is None
+    plt.close("all")
+
+
+@pytest.mark.parametrize(
+    "generator",
+    [
+        daft.testing.hmm,
+        daft.testing.hierarchical,
+        daft.testing.factor_graph,
+        daft.testing.random_dag,
+        daft.testing.observed_and_fixed,
+    ],
+)
+def test_testing_models(generator):
+    pgm = generator(100, pyplot=False)
+    assert 90 <= len(pgm._nodes) <= 120
+    assert generator(100).content_hash() == pgm.content_hash()
+    pgm.render()
+    pgm.figure.canvas.draw()
+
+
+def test_testing_seed():
+    pgm = daft.testing.random_dag(50, seed=1)
+    assert (
+        pgm.content_hash()
+        == daft.testing.random_dag(50, seed=1).content_hash()
+    )
+    assert (
+        pgm.content_hash()
+        != daft.testing.random_dag(50, seed=2).content_hash()
+    )
+
+
+def test_grid_positions():
+    width, x, y = daft.testing.grid_positions(5)
+    assert width == 3
+    assert x.tolist() == [0, 1, 2, 0, 1]
+    assert y.tolist() == [0, 0, 0, 1, 1]
+
+
+def test_serialization():
+    pgm = daft.PGM(node_ec=(1.0, 0.0, 0.0), label_params={"color": "b"})
+    pgm.add_node("a", r"$a$", 0, 0, observed=True, plot_params={"fc": "r"})
+    pgm.add_node("b", "b", 1, 0, fixed=True, shape="rectangle", aspect=2)
+    pgm.add_node("c", "\u00e7", 1, 1, alternate=True, offset=(1, 2))
+    pgm.add_node("d", "d", 2, 1, fontsize=7)
+    pgm.add_edge("a", "b", label="ab", plot_params={"ls": "--"})
+    pgm.add_edge("b", "c", directed=False, xoffset=0.3)
+    pgm.add_edge("c", "d")
+    pgm.remove_node("b")
+    pgm.add_plate([-0.5, -0.5, 2, 1], label="N", rect_params={"ec": "g"})
+    pgm.add_text(0.5, 1.5, "text", fontsize=9)
+
+    data = pgm.to_dict()
+    assert data["nodes"]["name"] == ["a", "c", "d"]
+    assert data["edges"]["node1"] == [1]
+    assert data["nodes"]["aspect"] == [None, None, None]
+
+    for copy in [
+        daft.PGM.from_dict(data),
+        daft.PGM.loads(pgm.dumps()),
+    ]:
+        assert copy.to_dict() == data
+        assert copy.content_hash() == pgm.content_hash()
+
+    # Parameters are overridden, and newer versions are refused.
+    assert not daft.PGM.from_dict(data, pyplot=False)._ctx.pyplot
+    with pytest.raises(ValueError):
+        daft.PGM.from_dict(dict(data, version=data["version"] + 1))
+    with pytest.raises(ValueError):
+        daft.PGM.loads(b"not a model")
+
+
+def test_serialization_numeric_content():
+    pgm = daft.PGM()
+    pgm.add_node("a", 1, 0, 0)
+    pgm.add_node("b", 2.5, 1, 0)
+    pgm.add_node("c", np.int64(3), 2, 0)
+    pgm.add_node("d", "$d$", 3, 0)
+    pgm.add_edge("a", "b", label=0)
+
+    copy = daft.PGM.loads(pgm.dumps())
+    assert copy.to_dict()["nodes"]["content"] == [1, 2.5, 3, "$d$"]
+    assert copy.to_dict()["edges"]["label"] == [0]
+
+    pgm.add_node("e", object(), 4, 0)
+    with pytest.raises(TypeError, match="object"):
+        pgm.dumps()
+
+
+def test_serialization_large():
+    pgm = daft.testing.random_dag(1000)
+    copy = daft.PGM.loads(pgm.dumps())
+    assert copy.content_hash() == pgm.content_hash()
+    for name in ["x0", "x500", "x999"]:
+        assert copy.neighbors(name) == pgm.neighbors(name)
+
+
+def test_cli(tmp_path, monkeypatch, capsys):
+    spec = tmp_path / "model.json"
+    spec.write_text(json.dumps(_build_model().to_dict()))
+    (tmp_path / "other.daft").write_bytes(daft.testing.hmm(4).dumps())
+    out = tmp_path / "out"
+    args = ["render", str(tmp_path), "-o", str(out), "-f", "svg,png", "-j1"]
+
+    assert daft._cli.main(args) == 0
+    assert sorted(p.name for p in out.iterdir()) == [
+        "model.png",
+        "model.svg",
+        "other.png",
+        "other.svg",
+    ]
+    assert (out / "model.svg").read_text().startswith("<?xml")
+
+    # Outputs that are newer than their spec are skipped.
+    capsys.readouterr()
+    assert daft._cli.main(args) == 0
+    assert capsys.readouterr().out == ""
+
+    # Watch mode renders the specs that change until it is interrupted.
+    def sleep(seconds):
+        if sleep.calls == 1:
+            raise KeyboardInterrupt
+        sleep.calls += 1
+        mtime = spec.stat().st_mtime_ns + 10**9
+        os.utime(spec, ns=(mtime, mtime))
+
+    sleep.calls = 0
+    monkeypatch.setattr(daft._cli.time, "sleep", sleep)
+    assert daft._cli.main([*args, "--watch"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        f"{out / 'model.svg'}, {out / 'model.png'}"
+    ]
+
+    assert daft._cli.main(["render", str(tmp_path / "missing.json")]) == 1
+
+
+def test_scene(tmp_path, monkeypatch):
+    with daft.PGM(pyplot=False) as pgm:
+        pgm.add_node("a", r"$a$", 0, 0, observed=True)
+        pgm.add_node("b", "b", 1, 0, fixed=True, shape="rectangle")
+        pgm.add_node("c", "c", 1, 1, plot_params={"ec": "r"})
+        pgm.add_edge("a", "b", label="ab")
+        pgm.add_edge("b", "c", directed=False, plot_params={"ls": "--"})
+        pgm.add_plate([-0.5, -0.5, 2, 1], label="N")
+        scene = pgm.to_scene()
+        assert [p["type"] for p in scene["primitives"]].count("text") == 5
+        assert json.loads(json.dumps(scene)) == scene
+
+        baseline = os.path.join(
+            os.path.dirname(__file__), "baseline_scenes", "test_scene.json"
+        )
+        daft.testing.assert_scene_matches(pgm, baseline)
+
+        # A missing snapshot is saved, and fails until it is checked in.
+        snapshot = tmp_path / "scene.json"
+        with pytest.raises(AssertionError, match="did not exist"):
+            daft.testing.assert_scene_matches(pgm, snapshot)
+        daft.testing.assert_scene_matches(pgm, snapshot)
+
+        pgm.add_node("d", "d", 2, 1)
+        pgm.render()
+        with pytest.raises(AssertionError, match="figsize"):
+            daft.testing.assert_scene_matches(pgm, snapshot)
+        monkeypatch.setenv("DAFT_UPDATE_SCENES", "1")
+        daft.testing.assert_scene_matches(pgm, snapshot)
+        monkeypatch.delenv("DAFT_UPDATE_SCENES")
+        daft.testing.assert_scene_matches(pgm, snapshot)
+
+    # Numbers are compared with a tolerance.
+    moved = json.loads(json.dumps(scene))
+    moved["primitives"][0]["vertices"][0][0] += 1e-9
+    daft.testing.assert_scenes_equal(moved, scene)
+    moved["primitives"][0]["vertices"][0][0] += 1e-3
+    with pytest.raises(AssertionError, match=r"\[0\]\['vertices'\]\[0\]\[0\]"):
+        daft.testing.assert_scenes_equal(moved, scene)
+    daft.testing.assert_scenes_equal(moved, scene, atol=1e-2)
+
+
+def test_fixed_label_offset():
+    # The label of a fixed node sits at the same height whether or not the
+    # layout is automatic, and does not move when the model is re-rendered.
+    offsets = []
+    for kwargs in [{}, {"shape": [2, 2], "origin": [-1, -1]}]:
+        with daft.PGM(pyplot=False, **kwargs) as pgm:
+            pgm.add_node("a", "a", 0, 0, fixed=True, offset=(0, 1))
+            for _ in range(2):
+                pgm.render()
+                (text,) = [
+                    p
+                    for p in pgm.to_scene()["primitives"]
+                    if p["type"] == "text"
+                ]
+                offsets.append(text["xytext"])
+    assert offsets == [[0.0, 6.5]] * 4